@@ -0,0 +1,127 @@
+"""Benchmark make_image for every page against fake data sources.
+
+Usage:
+    python benchmarks/bench_pages.py                      # every page
+    python benchmarks/bench_pages.py pages.tidePage:TidePage
+    python benchmarks/bench_pages.py --renders 288 --p95-ms 150 --peak-mib 16
+
+Each page is rendered at ``--renders`` simulated timestamps ``--step``
+minutes apart (so a tide page re-anchors and its now-line walks across the
+chart), with the data sources from ``offline.py``. Reports the first
+(cold) render, p50/p95 of the rest, Python blocks left allocated per
+render and peak traced memory, and exits non-zero when a page's p95 or
+peak exceeds the budget.
+
+Timings come from an untraced pass; allocations from a second pass under
+tracemalloc. tracemalloc sees the Python heap only (not PIL's pixel
+buffers), so the process max RSS is printed alongside for reference.
+"""
+import argparse
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preview import discover_pages, load_page_class, render_at  # noqa: E402
+from offline import offline_pages  # noqa: E402
+
+START = datetime(2026, 6, 10, 5, 0)
+DEFAULT_RENDERS = 96
+DEFAULT_STEP_MINUTES = 15
+DEFAULT_P95_MS = 250.0
+DEFAULT_PEAK_MIB = 32.0
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_page(page_cls, timestamps: list[datetime]) -> dict:
+    with tempfile.TemporaryDirectory() as cache_dir, offline_pages(cache_dir):
+        page = page_cls()
+        t = time.perf_counter()
+        render_at(page, timestamps[0])
+        first_ms = (time.perf_counter() - t) * 1000
+
+        times_ms = []
+        for now in timestamps[1:]:
+            t = time.perf_counter()
+            render_at(page, now)
+            times_ms.append((time.perf_counter() - t) * 1000)
+
+    # Fresh page and cache dir so the traced pass replays the same renders.
+    with tempfile.TemporaryDirectory() as cache_dir, offline_pages(cache_dir):
+        page = page_cls()
+        render_at(page, timestamps[0])
+        tracemalloc.start()
+        blocks = 0
+        peak = 0
+        try:
+            for now in timestamps[1:]:
+                before = tracemalloc.take_snapshot()
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                render_at(page, now)
+                _, render_peak = tracemalloc.get_traced_memory()
+                peak = max(peak, render_peak - base)
+                diff = tracemalloc.take_snapshot().compare_to(before, "filename")
+                blocks += sum(max(d.count_diff, 0) for d in diff)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "first_ms": first_ms,
+        "p50_ms": statistics.median(times_ms),
+        "p95_ms": _percentile(times_ms, 95),
+        "blocks": blocks / len(times_ms),
+        "peak_mib": peak / 2**20,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", help="module:ClassName specs (default: every page)")
+    parser.add_argument("--renders", type=int, default=DEFAULT_RENDERS)
+    parser.add_argument("--step", type=float, default=DEFAULT_STEP_MINUTES, help="minutes between renders")
+    parser.add_argument("--p95-ms", type=float, default=DEFAULT_P95_MS, help="p95 render time budget")
+    parser.add_argument("--peak-mib", type=float, default=DEFAULT_PEAK_MIB, help="peak traced memory budget")
+    args = parser.parse_args(argv)
+
+    page_classes = [load_page_class(s) for s in args.pages] or discover_pages()
+    timestamps = [START + timedelta(minutes=args.step * i) for i in range(max(args.renders, 2))]
+
+    print(
+        f"{'page':<22}{'first ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'allocs':>10}{'peak MiB':>10}"
+    )
+    over = []
+    for page_cls in page_classes:
+        r = bench_page(page_cls, timestamps)
+        print(
+            f"{page_cls.__name__:<22}{r['first_ms']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['blocks']:>10.0f}{r['peak_mib']:>10.2f}"
+        )
+        if r["p95_ms"] > args.p95_ms:
+            over.append(f"{page_cls.__name__} p95 {r['p95_ms']:.1f} ms > {args.p95_ms:.1f} ms")
+        if r["peak_mib"] > args.peak_mib:
+            over.append(f"{page_cls.__name__} peak {r['peak_mib']:.2f} MiB > {args.peak_mib:.2f} MiB")
+
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mib = rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+    print(f"(allocs: Python blocks left allocated per render; process max RSS {rss_mib:.0f} MiB)")
+
+    for line in over:
+        print(f"OVER BUDGET: {line}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
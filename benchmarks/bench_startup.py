@@ -0,0 +1,112 @@
+"""Benchmark cold start: fresh interpreter to the first frame on the panel.
+
+Usage:
+    python benchmarks/bench_startup.py                     # live data sources
+    python benchmarks/bench_startup.py --offline --runs 10
+    python benchmarks/bench_startup.py --offline --importtime 15
+
+Each run starts a new Python process that does what ``main.main`` does up to
+the first ``display.show()``: import ``main``, build the pages and the
+controller, and render the start page, against a null display so no
+hardware is needed. Reports the median of ``--runs`` for the import of
+``main``, the first frame (page import, fonts, data, render, quantize) and
+the whole process from exec to first frame.
+
+``--offline`` serves the pages from ``offline.py`` so the numbers don't
+include the network; it has to import every page module to patch it, so
+compare offline runs with each other. ``--importtime`` reruns once under ``python -X
+importtime`` and lists the slowest modules imported before the first frame.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RUNS = 5
+
+# Runs in the child. Timings are from the child's first statement; the
+# parent adds interpreter startup by timing the whole process.
+_CHILD = """
+import time
+t0 = time.perf_counter()
+import contextlib, json, sys, tempfile
+offline = sys.argv[1] == "1"
+import main
+from page_controller import PageController
+t_import = time.perf_counter()
+
+class NullDisplay:
+    def set_image(self, image):
+        pass
+
+    def show(self):
+        pass
+
+with contextlib.ExitStack() as stack:
+    if offline:
+        from offline import offline_pages
+        stack.enter_context(offline_pages(stack.enter_context(tempfile.TemporaryDirectory())))
+    controller = PageController(main.build_pages(), start_key=main.START_KEY, postprocess=main.POSTPROCESS)
+    controller.current_page.load_page()
+    controller.render_once(NullDisplay())
+    t_frame = time.perf_counter()
+print(json.dumps({"import_ms": (t_import - t0) * 1000, "frame_ms": (t_frame - t_import) * 1000}))
+"""
+
+
+def run_once(offline: bool, python_flags: tuple[str, ...] = ()) -> tuple[dict, str]:
+    """One cold start; returns its timings and the child's stderr."""
+    t = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, *python_flags, "-c", _CHILD, "1" if offline else "0"],
+        cwd=ROOT,  # fonts and caches resolve relative to the repo
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - t) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup run failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall_ms
+    return result, proc.stderr
+
+
+def slowest_imports(stderr: str, top: int) -> list[tuple[int, str]]:
+    """``(cumulative_us, module)`` from ``-X importtime`` output, slowest first."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--offline", action="store_true", help="use offline.py data sources")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="list the N slowest imports")
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.offline)[0] for _ in range(max(args.runs, 1))]
+    print(f"{'stage':<22}{'median ms':>10}{'min ms':>10}{'max ms':>10}")
+    for key, label in (("import_ms", "import main"), ("frame_ms", "first frame"), ("process_ms", "exec to first frame")):
+        values = [r[key] for r in runs]
+        print(f"{label:<22}{statistics.median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    if args.importtime:
+        _, stderr = run_once(args.offline, ("-X", "importtime"))
+        print(f"\n{'cumulative ms':>13}  module")
+        for us, name in slowest_imports(stderr, args.importtime):
+            print(f"{us / 1000:>13.1f}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
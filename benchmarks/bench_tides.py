@@ -0,0 +1,92 @@
+"""Benchmark tide curve sampling: original linear scan vs. single-pass walk vs. NumPy.
+
+Usage:
+    python benchmarks/bench_tides.py
+
+The "linear" column reproduces the pre-bisect implementation (a full scan of
+the extremes per sample) as the baseline.
+"""
+import math
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tides  # noqa: E402
+from tides import Extreme, sample_curve  # noqa: E402
+
+# (label, window length in days, samples across it)
+CASES = [
+    ("48h / 240", 2, 240),
+    ("2 weeks / 2000", 14, 2000),
+    ("8 weeks / 8000", 56, 8000),
+]
+
+
+def _linear_interpolate_height(extremes, t):
+    if not extremes or t < extremes[0].time or t > extremes[-1].time:
+        return None
+    for a, b in zip(extremes, extremes[1:]):
+        if a.time <= t <= b.time:
+            span = (b.time - a.time).total_seconds()
+            if span == 0:
+                return a.value
+            frac = (t - a.time).total_seconds() / span
+            mid = (a.value + b.value) / 2.0
+            amp = (a.value - b.value) / 2.0
+            return mid + amp * math.cos(math.pi * frac)
+    return extremes[-1].value
+
+
+def _linear_sample_curve(extremes, start, end, n):
+    span = (end - start).total_seconds()
+    points = []
+    for k in range(n + 1):
+        t = start + timedelta(seconds=span * k / n)
+        h = _linear_interpolate_height(extremes, t)
+        if h is not None:
+            points.append((t, h))
+    return points
+
+
+def _extremes(start, days):
+    # ~4 extremes a day, padded a day either side like TidePage's fetch window
+    vals = [8.5, 1.0, 9.0, -0.5]
+    t = start - timedelta(days=1)
+    out = []
+    for i in range(int((days + 2) * 24 / 6.2)):
+        out.append(Extreme(t, vals[i % 4], "H" if i % 2 == 0 else "L"))
+        t += timedelta(hours=6.2)
+    return out
+
+
+def _best_ms(fn, repeat=5):
+    number = 1
+    while timeit.timeit(fn, number=number) < 0.2:
+        number *= 2
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1000
+
+
+def main() -> None:
+    start = datetime(2026, 6, 1)
+    paths = [
+        ("linear", lambda ex, s, e, n: _linear_sample_curve(ex, s, e, n)),
+        ("walk", lambda ex, s, e, n: sample_curve(ex, s, e, n)),
+    ]
+    if tides.np is not None:
+        paths.append(("numpy", lambda ex, s, e, n: sample_curve(ex, s, e, n, vectorized=True)))
+    else:
+        print("numpy not installed: skipping the vectorized path")
+
+    print(f"{'case':<16}" + "".join(f"{name:>12}" for name, _ in paths) + "   (ms per curve)")
+    for label, days, n in CASES:
+        ex = _extremes(start, days)
+        end = start + timedelta(days=days)
+        row = [_best_ms(lambda fn=fn: fn(ex, start, end, n)) for _, fn in paths]
+        print(f"{label:<16}" + "".join(f"{ms:>12.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Shared, cached data feeds with stale-while-revalidate semantics.
+
+A :class:`DataSource` wraps a fetch function (weather, ferries, the sensor)
+and keeps its last good value. Like HTTP's ``Cache-Control``, each source has
+a ``ttl`` during which the value is fresh, a ``stale_while_revalidate``
+window after it in which the old value is served at once while a refetch
+runs in the background, and a ``stale_if_error`` window in which the old
+value still stands in for a fetch that failed or missed its deadline. Only
+past those does a render wait on the network, and then at most ``timeout``.
+
+Sources are registered by name, so two pages that show the same feed share
+one fetch and one cached copy. Sources created with ``persist=True`` also
+keep their last good value in ``STORE_PATH`` (JSON), so a restart renders
+from it instead of showing "??" while the first fetch is in flight.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+# Last good value of every persist=True source, by name.
+STORE_PATH = os.path.join(os.path.dirname(__file__), "datasource_cache.json")
+MAX_WORKERS = 4
+
+_registry: dict[str, "DataSource"] = {}
+_registry_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+_stored: Optional[dict[str, dict]] = None  # STORE_PATH contents, loaded on first use
+_store_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _registry_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="datasource")
+        return _pool
+
+
+def _load_stored(name: str) -> Optional[dict]:
+    global _stored
+    with _store_lock:
+        if _stored is None:
+            try:
+                with open(STORE_PATH) as f:
+                    _stored = json.load(f)
+            except (OSError, ValueError):
+                _stored = {}  # no store, or unreadable — start empty
+        return _stored.get(name)
+
+
+def _save_stored(name: str, value: Any, fetched_at: float) -> None:
+    _load_stored(name)
+    with _store_lock:
+        _stored[name] = {"value": value, "fetched_at": fetched_at}
+        try:
+            tmp = f"{STORE_PATH}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(_stored, f)
+            os.replace(tmp, STORE_PATH)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Data source store write failed: {e}")
+
+
+class DataSource:
+    """One feed's last good value, refreshed in the background when stale.
+
+    ``fetch`` takes no arguments and raises on failure. Ages are wall-clock
+    seconds so a persisted value's age carries across restarts.
+    ``stale_if_error=None`` serves the last good value however old it is.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Any],
+        ttl: float,
+        stale_while_revalidate: float = 0,
+        stale_if_error: Optional[float] = None,
+        persist: bool = False,
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._fetched_at: Optional[float] = None  # time.time() of the last success
+        self._future: Optional[Future] = None
+        self._loaded = not persist
+        self.fetches = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def _ensure_loaded(self) -> None:
+        # Caller holds _lock.
+        if self._loaded:
+            return
+        self._loaded = True
+        entry = _load_stored(self.name)
+        if entry is not None:
+            try:
+                self._value, self._fetched_at = entry["value"], float(entry["fetched_at"])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+    def age(self) -> Optional[float]:
+        """Seconds since the value was fetched, or ``None`` if there is none."""
+        with self._lock:
+            self._ensure_loaded()
+            return None if self._fetched_at is None else time.time() - self._fetched_at
+
+    def peek(self) -> Any:
+        """The cached value (``None`` if there is none), without fetching."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._value
+
+    def poll(self) -> Optional[Future]:
+        """Start a background refetch if the value is past its ``ttl``.
+
+        Never starts a second fetch while one is in flight. Returns the
+        in-flight fetch, if any.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._future is not None and not self._future.done():
+                return self._future
+            if self._fetched_at is not None and time.time() - self._fetched_at < self.ttl:
+                return None
+            self._future = _executor().submit(self._run)
+            return self._future
+
+    def _run(self) -> None:
+        try:
+            value = self.fetch()
+        except Exception as e:
+            print(f"{self.name} fetch failed: {e}")
+            with self._lock:
+                self.fetches += 1
+                self.failures += 1
+                self.last_error = str(e)
+            raise
+        fetched_at = time.time()
+        with self._lock:
+            self.fetches += 1
+            self.last_error = None
+            self._value, self._fetched_at = value, fetched_at
+        if self.persist:
+            _save_stored(self.name, value, fetched_at)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """The value to render, waiting on a fetch only when there's no usable one.
+
+        Within ``ttl + stale_while_revalidate`` this returns immediately
+        (refetching in the background past ``ttl``). Otherwise it waits up
+        to ``timeout`` for the refetch, then falls back to the last good
+        value within ``stale_if_error``. Raises the fetch's error (or
+        ``TimeoutError``) when there is nothing to show.
+        """
+        future = self.poll()
+        with self._lock:
+            age = None if self._fetched_at is None else time.time() - self._fetched_at
+            if age is not None and age < self.ttl + self.stale_while_revalidate:
+                return self._value
+        if future is not None:
+            wait([future], timeout=timeout)
+        with self._lock:
+            age = None if self._fetched_at is None else time.time() - self._fetched_at
+            if age is not None and (
+                age < self.ttl or self.stale_if_error is None or age < self.ttl + self.stale_if_error
+            ):
+                return self._value
+        if future is not None and future.done() and future.exception() is not None:
+            raise future.exception()
+        raise TimeoutError(f"{self.name} timed out")
+
+    def status(self) -> dict:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "age_seconds": None if self._fetched_at is None else round(time.time() - self._fetched_at),
+                "fetching": self._future is not None and not self._future.done(),
+                "fetches": self.fetches,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+
+
+def register(name: str, fetch: Callable[[], Any], ttl: float, **options) -> DataSource:
+    """The shared source called ``name``, created on first registration.
+
+    Later registrations of the same name get the existing source (and its
+    cached value); their ``fetch`` and options are ignored.
+    """
+    with _registry_lock:
+        source = _registry.get(name)
+        if source is None:
+            source = _registry[name] = DataSource(name, fetch, ttl, **options)
+        return source
+
+
+def get_source(name: str) -> DataSource:
+    with _registry_lock:
+        return _registry[name]
+
+
+def status() -> dict[str, dict]:
+    """Per-source age, fetch counts and last error, for the status endpoint."""
+    with _registry_lock:
+        sources = list(_registry.values())
+    return {source.name: source.status() for source in sources}
@@ -2,10 +2,249 @@
 # Run with: pipenv run python ferries.py
 # API key stored in .env as WSDOT_API_ACCESS_CODE
 
-import requests
+import bisect
 import os
-from datetime import datetime
-from typing import Optional, List
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Optional, List, Tuple
+
+import http_client
+from tracing import traced
+
+SCHEDULE_BASE_URL = "http://www.wsdot.wa.gov/Ferries/API/Schedule/rest"
+TERMINALS_BASE_URL = "https://wsdot.wa.gov/Ferries/API/Terminals/rest"
+
+# WSDOT terminal IDs
+KINGSTON = 12
+EDMONDS = 8
+
+# WSDOT date format: "/Date(928174800000-0700)/"
+_WSDOT_DATE = re.compile(r'/Date\((-?\d+)([+-]\d{4})?\)/')
+
+# How often (at most) to ask WSDOT whether today's cached schedules changed.
+CACHE_FLUSH_CHECK_SECONDS = 3600
+# Wait-time guidance is refetched (for every terminal at once) after this.
+WAIT_TIMES_TTL_SECONDS = 300
+
+Route = Tuple[int, int]  # (departing terminal ID, arriving terminal ID)
+
+
+def parse_wsdot_date(value: str) -> Optional[datetime]:
+    """Local naive datetime for a WSDOT "/Date(ms±zzzz)/" string, or None."""
+    match = _WSDOT_DATE.search(value)
+    if not match:
+        return None
+    return datetime.fromtimestamp(int(match.group(1)) / 1000)
+
+
+def next_sailings(departures: List[datetime], now: datetime, n: int = 3) -> List[datetime]:
+    """The next ``n`` departures strictly after ``now`` (``departures`` sorted)."""
+    i = bisect.bisect_right(departures, now)
+    return departures[i:i + n]
+
+
+def format_sailing(t: datetime) -> str:
+    return t.strftime("%I:%M %p").lstrip('0')
+
+
+def summarize_wait_notes(route_info: dict) -> Optional[str]:
+    """Short guidance line from one WSDOT ``WaitTimes`` entry, if it has any."""
+    if 'WaitTimeNotes' in route_info and route_info['WaitTimeNotes']:
+        notes = route_info['WaitTimeNotes']
+        # Extract the key information from the notes
+        if 'Peak traffic' in notes and '60 minute' in notes:
+            return "Peak: 60 min early, Off-peak: 20 min early"
+        elif '20 minute' in notes:
+            return "Arrive 20 min early recommended"
+        else:
+            # Return a shortened version of the notes
+            return notes[:50] + "..." if len(notes) > 50 else notes
+    # If no notes, check for last updated time
+    if 'WaitTimeLastUpdated' in route_info:
+        return "General wait guidance available"
+    return None
+
+
+@dataclass
+class _DaySchedule:
+    day: date
+    departures: List[datetime]  # sorted, de-duplicated
+    departing_name: str
+    arriving_name: str
+
+
+class FerryClient:
+    """WSDOT schedules and wait guidance for several routes at once.
+
+    Routes are (departing, arriving) terminal ID pairs. Each route's schedule
+    is fetched once a day, and all routes share one cacheflushdate check and
+    one all-terminal wait-times payload, so adding a route costs one request
+    a day rather than two per refresh. Queries like :meth:`next_sailings` are
+    answered from the cache.
+
+    The base URLs are parameters so tests can point the client at a local
+    stub of the WSDOT REST endpoints.
+    """
+
+    def __init__(
+        self,
+        routes: Iterable[Route],
+        api_access_code: Optional[str] = None,
+        schedule_base_url: str = SCHEDULE_BASE_URL,
+        terminals_base_url: str = TERMINALS_BASE_URL,
+    ):
+        self.routes: List[Route] = list(routes)
+        self.api_access_code = api_access_code
+        self.schedule_base_url = schedule_base_url
+        self.terminals_base_url = terminals_base_url
+        self._schedules: dict[Route, _DaySchedule] = {}
+        self._flush_date: Optional[str] = None
+        self._flush_checked_at = float("-inf")
+        self._wait_times: dict[int, List[dict]] = {}  # terminal ID -> WaitTimes
+        self._wait_fetched_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _access_code(self) -> str:
+        # If no API access code provided, try to get it from environment variables
+        code = self.api_access_code or os.getenv('WSDOT_API_ACCESS_CODE')
+        if code is None:
+            raise ValueError(
+                "API access code is required. Either pass it as a parameter or set "
+                "WSDOT_API_ACCESS_CODE environment variable. Register for free at: "
+                "https://wsdot.wa.gov/traffic/api/"
+            )
+        return code
+
+    def _get_json(self, url: str):
+        params = {"apiaccesscode": self._access_code()}
+        response = http_client.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    @traced()
+    def refresh(self, now: Optional[datetime] = None) -> None:
+        """Bring every route's schedule and the wait times up to date.
+
+        Stale schedules (a new day, or WSDOT flushed its data) are fetched
+        concurrently; wait times for every terminal come from one request.
+        """
+        import requests  # here, not at the top: see http_client on deferring it
+
+        now = now or datetime.now()
+        with self._lock:
+            flush_due = time.monotonic() - self._flush_checked_at >= CACHE_FLUSH_CHECK_SECONDS
+            stale = [r for r in self.routes if r not in self._schedules or self._schedules[r].day != now.date()]
+            waits_due = time.monotonic() - self._wait_fetched_at >= WAIT_TIMES_TTL_SECONDS
+        if flush_due:
+            try:
+                flush_date = self._get_json(f"{self.schedule_base_url}/cacheflushdate")
+            except requests.RequestException as e:
+                print(f"Ferry cacheflushdate check failed: {e}")
+                flush_date = self._flush_date  # keep serving cached schedules
+            with self._lock:
+                if self._flush_date is not None and flush_date != self._flush_date:
+                    stale = list(self.routes)
+                self._flush_date = flush_date
+                self._flush_checked_at = time.monotonic()
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                schedules = list(pool.map(lambda r: self._fetch_schedule(r, now.date()), stale))
+            with self._lock:
+                self._schedules.update(zip(stale, schedules))
+
+        if waits_due:
+            wait_data = self._get_json(f"{self.terminals_base_url}/terminalwaittimes")
+            # Response structure: [{ "TerminalID": 12, "WaitTimes": [{ "RouteName": "...", "WaitTimeNotes": "..." }] }]
+            with self._lock:
+                self._wait_times = {
+                    t['TerminalID']: t.get('WaitTimes') or [] for t in wait_data
+                }
+                self._wait_fetched_at = time.monotonic()
+
+    @traced()
+    def _fetch_schedule(self, route: Route, day: date) -> _DaySchedule:
+        departing_id, arriving_id = route
+        schedule_data = self._get_json(
+            f"{self.schedule_base_url}/scheduletoday/{departing_id}/{arriving_id}/false"
+        )
+        # Response structure: { "TerminalCombos": [{ "DepartingTerminalName": "...",
+        #   "ArrivingTerminalName": "...", "Times": [{ "DepartingTime": "/Date(...)/" }] }] }
+        combos = schedule_data['TerminalCombos']
+        departures = {
+            dt
+            for terminal_combo in combos
+            for sailing_time in terminal_combo['Times']
+            if (dt := parse_wsdot_date(sailing_time['DepartingTime'])) is not None
+        }
+        first = combos[0] if combos else {}
+        return _DaySchedule(
+            day,
+            sorted(departures),
+            first.get('DepartingTerminalName', str(departing_id)),
+            first.get('ArrivingTerminalName', str(arriving_id)),
+        )
+
+    def _schedule(self, route: Route, now: datetime) -> _DaySchedule:
+        with self._lock:
+            schedule = self._schedules.get(route)
+        if schedule is None or schedule.day != now.date():
+            self.refresh(now)
+            with self._lock:
+                schedule = self._schedules[route]
+        return schedule
+
+    def departures_today(self, route: Route, now: Optional[datetime] = None) -> List[datetime]:
+        """Today's sorted departures for ``route``."""
+        return self._schedule(route, now or datetime.now()).departures
+
+    def next_sailings(self, route: Route, now: Optional[datetime] = None, n: int = 3) -> List[datetime]:
+        """The next ``n`` departures on ``route`` after ``now``; no network call
+        once today's schedule is cached."""
+        now = now or datetime.now()
+        return next_sailings(self.departures_today(route, now), now, n)
+
+    def route_name(self, route: Route) -> str:
+        """E.g. "Kingston → Edmonds" (terminal IDs until the schedule loads)."""
+        with self._lock:
+            schedule = self._schedules.get(route)
+        if schedule is None:
+            return f"{route[0]} → {route[1]}"
+        return f"{schedule.departing_name} → {schedule.arriving_name}"
+
+    def wait_guidance(self, route: Route) -> str:
+        """Wait-time guidance at the departing terminal for ``route``."""
+        with self._lock:
+            fresh = time.monotonic() - self._wait_fetched_at < WAIT_TIMES_TTL_SECONDS
+        if not fresh:
+            self.refresh()
+        self._schedule(route, datetime.now())  # arriving terminal's name
+        with self._lock:
+            wait_times = self._wait_times.get(route[0])
+            arriving_name = self._schedules[route].arriving_name
+        if wait_times is None:
+            return "Wait time information not available"
+        for route_info in wait_times:
+            if 'RouteName' in route_info and arriving_name in route_info['RouteName']:
+                guidance = summarize_wait_notes(route_info)
+                if guidance is not None:
+                    return guidance
+        return f"No wait time info for {arriving_name} route"
+
+
+# Backs the single-route helpers below; one per access code.
+_clients: dict[Optional[str], FerryClient] = {}
+
+
+def _kingston_client(api_access_code: Optional[str]) -> FerryClient:
+    client = _clients.get(api_access_code)
+    if client is None:
+        client = _clients[api_access_code] = FerryClient([(KINGSTON, EDMONDS)], api_access_code)
+    return client
 
 
 def get_kingston_edmonds_sailing_times(api_access_code: Optional[str] = None) -> str:
@@ -33,92 +272,23 @@ def get_kingston_edmonds_sailing_times(api_access_code: Optional[str] = None) ->
         requests.RequestException: If API request fails
     """
     
-    # API base URL for WSDOT Ferry Schedule
-    base_url = "http://www.wsdot.wa.gov/Ferries/API/Schedule/rest"
-    
-    # Terminal IDs (these are the actual WSDOT terminal IDs)
-    # Kingston terminal ID: 12
-    # Edmonds terminal ID: 8
-    kingston_terminal_id = 12
-    edmonds_terminal_id = 8
-    
-    # Get today's date in the required format
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    # If no API access code provided, try to get it from environment variables
-    if api_access_code is None:
-        api_access_code = os.getenv('WSDOT_API_ACCESS_CODE')
-        if api_access_code is None:
-            raise ValueError(
-                "API access code is required. Either pass it as a parameter or set "
-                "WSDOT_API_ACCESS_CODE environment variable. Register for free at: "
-                "https://wsdot.wa.gov/traffic/api/"
-            )
+    import requests
+
+    client = _kingston_client(api_access_code)
+    client._access_code()  # fail fast if there's no API access code
     
     try:
-        # First, try to get today's schedule for Kingston to Edmonds
-        schedule_url = f"{base_url}/scheduletoday/{kingston_terminal_id}/{edmonds_terminal_id}/false"
-        params = {"apiaccesscode": api_access_code}
-        
-        response = requests.get(schedule_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        # Parse the response (WSDOT API returns JSON)
-        schedule_data = response.json()
-        
-        # Extract sailing times from the documented response structure
-        sailing_times = []
-        
-        # Response structure: { "TerminalCombos": [{ "Times": [{ "DepartingTime": "/Date(...)/" }] }] }
-        for terminal_combo in schedule_data['TerminalCombos']:
-            for sailing_time in terminal_combo['Times']:
-                departure_time = sailing_time['DepartingTime']
-                
-                # Parse WSDOT date format: "/Date(928174800000-0700)/"
-                # Extract timestamp from the format
-                import re
-                match = re.search(r'/Date\((\d+)([+-]\d{4})?\)/', departure_time)
-                if match:
-                    timestamp_ms = int(match.group(1))
-                    # Convert from milliseconds to seconds
-                    timestamp = timestamp_ms / 1000
-                    dt = datetime.fromtimestamp(timestamp)
-                    formatted_time = dt.strftime("%I:%M %p").lstrip('0')
-                    sailing_times.append(formatted_time)
-        
-        if not sailing_times:
-            return "No sailing times available for Kingston to Edmonds today"
-        
-        # Remove duplicates and sort
-        unique_times = list(dict.fromkeys(sailing_times))  # Preserves order while removing duplicates
-        
-        # Filter to only future times and get next 3
         current_time = datetime.now()
-        future_times = []
-        
-        for time_str in unique_times:
-            # Parse the time string back to datetime for comparison
-            try:
-                # Convert "6:20 AM" format to datetime for today
-                time_obj = datetime.strptime(time_str, "%I:%M %p").replace(
-                    year=current_time.year,
-                    month=current_time.month,
-                    day=current_time.day
-                )
-                if time_obj > current_time:
-                    future_times.append(time_str)
-                    if len(future_times) >= 3:
-                        break
-            except ValueError:
-                # If parsing fails, include the time anyway
-                future_times.append(time_str)
-                if len(future_times) >= 3:
-                    break
+        departures = client.departures_today((KINGSTON, EDMONDS), current_time)
+        if not departures:
+            return "No sailing times available for Kingston to Edmonds today"
         
+        # Next 3 departures after now: a bisect into the cached day schedule
+        future_times = next_sailings(departures, current_time, 3)
         if not future_times:
             return "No more sailings today from Kingston to Edmonds"
         
-        return ", ".join(future_times)
+        return ", ".join(format_sailing(t) for t in future_times)
     
     except requests.RequestException as e:
         raise requests.RequestException(f"Failed to fetch ferry schedule: {str(e)}")
@@ -148,63 +318,16 @@ def get_kingston_wait_time(api_access_code: Optional[str] = None) -> str:
         requests.RequestException: If API request fails
     """
     
-    # API base URL for WSDOT Terminal Wait Times
-    base_url = "https://wsdot.wa.gov/Ferries/API/Terminals/rest"
-    
-    # Kingston terminal ID: 12
-    kingston_terminal_id = 12
-    
-    # If no API access code provided, try to get it from environment variables
-    if api_access_code is None:
-        api_access_code = os.getenv('WSDOT_API_ACCESS_CODE')
-        if api_access_code is None:
-            raise ValueError(
-                "API access code is required. Either pass it as a parameter or set "
-                "WSDOT_API_ACCESS_CODE environment variable. Register for free at: "
-                "https://wsdot.wa.gov/traffic/api/"
-            )
+    import requests
+
+    client = _kingston_client(api_access_code)
+    client._access_code()  # fail fast if there's no API access code
     
     try:
-        # Get wait times for Kingston terminal
-        wait_time_url = f"{base_url}/terminalwaittimes/{kingston_terminal_id}"
-        params = {"apiaccesscode": api_access_code}
-        
-        response = requests.get(wait_time_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        # Parse the response (WSDOT API returns JSON)
-        wait_data = response.json()
-        
-        # Extract wait time information based on documented API structure
-        # Response structure: { "TerminalName": "Kingston", "WaitTimes": [{ "RouteName": "...", "WaitTimeNotes": "..." }] }
-        if not isinstance(wait_data, dict) or 'WaitTimes' not in wait_data:
-            return "Wait time information not available"
-        
-        wait_times = wait_data['WaitTimes']
-        
-        # Look for Kingston to Edmonds route (Route ID 6)
-        for route_info in wait_times:
-            if 'RouteName' in route_info and 'Edmonds' in route_info['RouteName']:
-                if 'WaitTimeNotes' in route_info and route_info['WaitTimeNotes']:
-                    notes = route_info['WaitTimeNotes']
-                    # Extract the key information from the notes
-                    if 'Peak traffic' in notes and '60 minute' in notes:
-                        return "Peak: 60 min early, Off-peak: 20 min early"
-                    elif '20 minute' in notes:
-                        return "Arrive 20 min early recommended"
-                    else:
-                        # Return a shortened version of the notes
-                        return notes[:50] + "..." if len(notes) > 50 else notes
-                
-                # If no notes, check for last updated time
-                if 'WaitTimeLastUpdated' in route_info:
-                    return "General wait guidance available"
-        
-        return "No wait time info for Edmonds route"
-    
+        return client.wait_guidance((KINGSTON, EDMONDS))
     except requests.RequestException as e:
         raise requests.RequestException(f"Failed to fetch wait times: {str(e)}")
-    except (KeyError, ValueError) as e:
+    except (KeyError, ValueError, TypeError) as e:
         raise ValueError(f"Failed to parse wait time data: {str(e)}")
 
 
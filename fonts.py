@@ -0,0 +1,42 @@
+"""Process-wide registry of loaded TrueType faces.
+
+``ImageFont.truetype`` re-reads and parses the font file on every call, and
+pages render every few minutes, so each (path, size) face is loaded once here
+and shared by every page.
+"""
+from functools import lru_cache
+from types import ModuleType
+
+from PIL import ImageFont
+
+FONT_PATH = "JosefinSans-Bold.ttf"
+
+
+def get_font(size: int, path: str = FONT_PATH) -> ImageFont.FreeTypeFont:
+    """Cached face for ``path`` at ``size`` px."""
+    return _load(path, size)
+
+
+@lru_cache(maxsize=None)
+def _load(path: str, size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(path, size)
+
+
+def font_sizes(*modules: ModuleType) -> set[int]:
+    """Every integer ``*_FONT_SIZE`` constant defined in ``modules``."""
+    return {
+        value
+        for module in modules
+        for name, value in vars(module).items()
+        if name.endswith("_FONT_SIZE") and isinstance(value, int)
+    }
+
+
+def prewarm(*modules: ModuleType, path: str = FONT_PATH) -> None:
+    """Load the faces for every ``*_FONT_SIZE`` in ``modules`` up front.
+
+    Called as each page module is loaded (see ``LazyPage``), so its first
+    render doesn't pay for parsing the TTF.
+    """
+    for size in sorted(font_sizes(*modules)):
+        get_font(size, path)
@@ -0,0 +1,101 @@
+"""Shared pooled HTTP client used by every fetcher.
+
+One ``requests.Session`` per host keeps TCP/TLS connections alive between
+refreshes, retries transient failures with exponential backoff, and applies a
+default timeout (bare ``requests`` calls have none). Per-host latency is
+recorded for diagnostics; see :func:`latency_stats`.
+
+``requests`` is imported on the first request rather than with this module:
+it is slow to import on a Pi, and a page served from its on-disk caches
+(e.g. tides from harmonic constants) can draw its first frame without it.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_TIMEOUT = 15  # seconds, for connect and for each read
+RETRIES = 3
+BACKOFF_FACTOR = 0.5  # sleeps 0.5s, 1s, 2s... between attempts
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_SIZE = 4
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_seconds = seconds
+
+
+_sessions: dict[str, "requests.Session"] = {}
+_stats: dict[str, HostStats] = {}
+_lock = threading.Lock()
+
+
+def session_for(host: str) -> "requests.Session":
+    """The pooled session for ``host``, created on first use."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUSES,
+                raise_on_status=False,  # hand the last response to raise_for_status
+            )
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=POOL_SIZE)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def request(method: str, url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> "requests.Response":
+    """``requests.request`` over the host's pooled session, timed per host."""
+    host = urlsplit(url).netloc
+    start = time.monotonic()
+    ok = False
+    try:
+        response = session_for(host).request(method, url, timeout=timeout, **kwargs)
+        ok = response.status_code < 400
+        return response
+    finally:
+        elapsed = time.monotonic() - start
+        with _lock:
+            _stats.setdefault(host, HostStats()).record(elapsed, ok)
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> "requests.Response":
+    return request("POST", url, **kwargs)
+
+
+def latency_stats() -> dict[str, dict]:
+    """Snapshot of per-host request counts, errors and latency (seconds)."""
+    with _lock:
+        return {
+            host: {**asdict(s), "mean_seconds": s.total_seconds / s.requests if s.requests else 0.0}
+            for host, s in _stats.items()
+        }
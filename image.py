@@ -1,5 +1,8 @@
+from typing import Sequence
+
 from PIL import Image, ImageDraw, ImageFont
-import colorcet as cc
+
+from colormaps import COOLWARM
 
 # get an image
 def make_image(text: str, bg_color=(0, 0, 0, 255), text_color=(255, 255, 255, 255)):
@@ -19,7 +22,9 @@ def make_image(text: str, bg_color=(0, 0, 0, 255), text_color=(255, 255, 255, 25
     image.paste(weather_img, (10, 70), mask=weather_img)
 
 
-def get_color_from_gradient(value: int, range_min: int, range_max: int, gradient: list) -> tuple[int, int, int, int]:
+def get_color_from_gradient(value: int, range_min: int, range_max: int, gradient: Sequence[str] = COOLWARM) -> str:
     normalized_temp = (value - range_min) / (range_max - range_min)
-    color = cc.coolwarm[int(normalized_temp * 255)]
-    return color
+    # Clamp: out-of-range values would otherwise index past the end (or wrap
+    # around from the cold end, for values below range_min).
+    index = min(len(gradient) - 1, max(0, int(normalized_temp * (len(gradient) - 1))))
+    return gradient[index]
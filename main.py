@@ -3,30 +3,100 @@
 All hardware imports (inky, gpiod, gpiodevice) live here so the off-device
 tooling (preview.py, the test suite, page_controller) stays importable on a
 laptop without the Raspberry Pi packages.
+
+Startup is kept short (it reruns after every auto-deploy): hardware and page
+modules are imported where they are first used, pages are registered as
+:class:`LazyPage` so only the start page loads before the first frame, and
+the detected display type is cached so restarts skip the EEPROM probe.
 """
+import functools
+import importlib
+import inspect
+import json
+import os
+import signal
 import threading
+from datetime import timedelta
 
-import gpiod
-import gpiodevice
-from gpiod.line import Bias, Direction, Edge
-from inky.auto import auto
-
+import palette
+import tracing
 from page_controller import PageController
-from pages.tidePage import TidePage
-from pages.weatherTravelPage import WeatherTravelPage
+from pages.lazyPage import LazyPage
 
 # Inky Impression buttons A, B, C, D -> BCM GPIO pins (active-low).
 BUTTONS = [5, 6, 16, 24]
 LABELS = ["A", "B", "C", "D"]
+# Contact bounce on press/release is filtered by the kernel, so one press is
+# one edge event.
+BUTTON_DEBOUNCE = timedelta(milliseconds=50)
 
-# Page bound to each button. A and B select their page directly; D cycles
-# through all pages (one button steps through everything). C is reserved.
-PAGES = {
-    "A": TidePage(),
-    "B": WeatherTravelPage(),
+# Page bound to each button. A, B and C select their page directly; D cycles
+# through all pages (one button steps through everything).
+PAGE_SPECS = {
+    "A": "pages.tidePage:TidePage",
+    "B": "pages.weatherTravelPage:WeatherTravelPage",
+    "C": "pages.tideDashboardPage:TideDashboardPage",
 }
 START_KEY = "A"
 CYCLE_LABEL = "D"
+# Frames are quantized to the panel palette as they are prerendered, so
+# set_image has nothing left to convert.
+POSTPROCESS = functools.partial(palette.quantize, dither=True)
+
+# Detected display driver and its constructor arguments; delete it after
+# swapping the panel for a different model.
+DISPLAY_CACHE_PATH = os.path.join(os.path.dirname(__file__), "display_cache.json")
+
+
+def detect_display():
+    """The Inky driver for the attached panel, from the cache when possible.
+
+    ``inky.auto`` imports every driver and reads the HAT's EEPROM over I2C;
+    once it has identified the panel, later starts construct the same driver
+    class directly.
+    """
+    try:
+        with open(DISPLAY_CACHE_PATH) as f:
+            cached = json.load(f)
+        cls = getattr(importlib.import_module(cached["module"]), cached["class"])
+        kwargs = {k: tuple(v) if isinstance(v, list) else v for k, v in cached["kwargs"].items()}
+        return cls(**kwargs)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Cached display type unusable, probing again: {e}")
+
+    from inky.auto import auto
+
+    display = auto()
+    params = inspect.signature(type(display)).parameters
+    kwargs = {}
+    if "resolution" in params:
+        kwargs["resolution"] = list(display.resolution)
+    if "colour" in params and getattr(display, "colour", None) is not None:
+        kwargs["colour"] = display.colour
+    try:
+        with open(DISPLAY_CACHE_PATH, "w") as f:
+            json.dump(
+                {"module": type(display).__module__, "class": type(display).__name__, "kwargs": kwargs}, f
+            )
+    except OSError as e:
+        print(f"Display cache write failed: {e}")
+    return display
+
+
+def build_pages() -> dict:
+    """Pages rendered locally, or pulled from ``INKY_RENDER_SERVER`` if set.
+
+    As a thin client (e.g. ``INKY_RENDER_SERVER=http://frames.local:8080``)
+    each button shows the same page class, rendered by ``render_server.py``.
+    """
+    server = os.getenv("INKY_RENDER_SERVER")
+    if server:
+        from pages.remotePage import RemotePage
+
+        return {label: RemotePage(server, spec.split(":")[1]) for label, spec in PAGE_SPECS.items()}
+    return {label: LazyPage(spec) for label, spec in PAGE_SPECS.items()}
 
 
 def _watch_buttons(controller: PageController) -> None:
@@ -34,8 +104,15 @@ def _watch_buttons(controller: PageController) -> None:
 
     Follows Pimoroni's official Inky button example (gpiod + gpiodevice).
     """
+    import gpiod
+    import gpiodevice
+    from gpiod.line import Bias, Direction, Edge
+
     input_settings = gpiod.LineSettings(
-        direction=Direction.INPUT, bias=Bias.PULL_UP, edge_detection=Edge.FALLING
+        direction=Direction.INPUT,
+        bias=Bias.PULL_UP,
+        edge_detection=Edge.FALLING,
+        debounce_period=BUTTON_DEBOUNCE,
     )
     chip = gpiodevice.find_chip_by_platform()
     offsets = [chip.line_offset_from_id(pin) for pin in BUTTONS]
@@ -51,10 +128,40 @@ def _watch_buttons(controller: PageController) -> None:
                 controller.request(label)
 
 
+def _start_span_dumper() -> threading.Event:
+    """Print the span histograms each time the returned event is set.
+
+    For the SIGUSR1 handler. Python runs handlers on the main thread, in
+    between its bytecodes. Calling ``tracing.dump()`` there could deadlock
+    on the lock the interrupted render holds in ``tracing.record``, and a
+    ``print`` there could interrupt another ``print``. So the handler only
+    sets the event, and this daemon thread does the work.
+    """
+    requested = threading.Event()
+
+    def loop():
+        while True:
+            requested.wait()
+            requested.clear()
+            print(tracing.dump())
+
+    threading.Thread(target=loop, name="span-dump", daemon=True).start()
+    return requested
+
+
 def main() -> None:
-    display = auto()
+    display = detect_display()
     print(display.resolution)
-    controller = PageController(PAGES, start_key=START_KEY)
+    # `kill -USR1 <pid>` prints the span histograms to the journal.
+    dump_requested = _start_span_dumper()
+    signal.signal(signal.SIGUSR1, lambda signum, frame: dump_requested.set())
+    controller = PageController(build_pages(), start_key=START_KEY, postprocess=POSTPROCESS)
+    # Optional read-only status/metrics endpoint (GET /status, /frame.png).
+    status_port = os.getenv("INKY_STATUS_PORT")
+    if status_port:
+        from status_server import StatusServer
+
+        StatusServer(controller, int(status_port)).start()
     watcher = threading.Thread(target=_watch_buttons, args=(controller,), daemon=True)
     watcher.start()
     controller.run(display)
@@ -0,0 +1,10 @@
+"""NumPy, where it's installed.
+
+It comes with inky on the Pi but is optional off-device, so modules with a
+vectorized path import ``np`` from here and fall back to pure Python when
+it is ``None``.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
@@ -0,0 +1,119 @@
+"""Offline stand-ins for the pages' data sources and on-disk caches.
+
+Used by ``preview.py --offline``, the benchmarks and the page tests, so
+they all render against the same synthetic tides, weather and ferry data
+without touching the network or the sensor. :func:`isolated_caches` also
+keeps live previews from writing the device's own cache files.
+"""
+import os
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+from unittest import mock
+
+import tides
+from datasource import DataSource
+from tide_harmonics import Constituent, HarmonicModel
+
+# A plausible mixed semidiurnal tide for the Puget Sound area.
+FAKE_MODEL = HarmonicModel(
+    [
+        Constituent("M2", 3.3, 40.0, 28.9841042),
+        Constituent("S2", 0.8, 65.0, 30.0),
+        Constituent("K1", 2.6, 260.0, 15.0410686),
+        Constituent("O1", 1.5, 240.0, 13.9430356),
+    ],
+    datum_offset=5.8,
+)
+
+FAKE_WEATHER = {
+    "temp": 61.3,
+    "weather": "Expect a day of partly cloudy with rain in the afternoon",
+    "temp_max": 64.0,
+    "temp_min": 48.2,
+    "feels_like": 59.9,
+    "icon": None,  # skip the icon download
+}
+
+def fake_ferry(days: int = 7) -> list[dict]:
+    """Kingston → Edmonds sailings every 50 minutes, 5 AM to midnight, for
+    ``days`` either side of today (so time-lapse previews always have some)."""
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    departures = [
+        today + timedelta(days=d, hours=5, minutes=50 * i)
+        for d in range(-days, days + 1)
+        for i in range(23)
+    ]
+    return [
+        {
+            "route": "Kingston → Edmonds",
+            "departures": [t.isoformat() for t in departures],
+            "guidance": "No wait expected",
+        }
+    ]
+
+FAKE_INSIDE_TEMP = 68.4
+
+
+def extremes_around(anchor: datetime) -> list[tides.Extreme]:
+    # 10 days of synthetic extremes bracketing any 48h window around ``anchor``
+    base = anchor - timedelta(days=2)
+    vals = [8.5, 1.0, 9.0, 0.5]
+    out = []
+    t = base
+    for i in range(40):
+        out.append(tides.Extreme(t, vals[i % 4], "H" if i % 2 == 0 else "L"))
+        t += timedelta(hours=6)
+    return out
+
+
+@contextmanager
+def isolated_caches(cache_dir: str):
+    """Keep the pages' cache files in ``cache_dir`` for the duration of the block.
+
+    Covers TidePage's window cache and tide store, the harmonic constants
+    and the persisted data sources, so simulated renders never write the
+    copies next to the code.
+    """
+    import datasource
+    import pages.tidePage as tidePage
+    import tide_harmonics
+
+    with ExitStack() as stack:
+        patch = lambda *a: stack.enter_context(mock.patch.object(*a))
+        patch(tidePage, "CACHE_PATH", os.path.join(cache_dir, "tide_cache.json"))
+        patch(tidePage, "STORE_PATH", os.path.join(cache_dir, "tide_store.json"))
+        patch(tide_harmonics, "CACHE_PATH", os.path.join(cache_dir, "tide_harmonics.json"))
+        patch(datasource, "STORE_PATH", os.path.join(cache_dir, "datasource_cache.json"))
+        patch(datasource, "_stored", None)
+        yield
+
+
+@contextmanager
+def offline_pages(cache_dir: str):
+    """Point every page at fake data sources for the duration of the block.
+
+    TidePage and TideDashboardPage predict from ``FAKE_MODEL`` (the real
+    harmonic path, no download), so every dashboard station gets the same
+    tide. Cache files go to ``cache_dir`` (see :func:`isolated_caches`).
+    WeatherTravelPage's sources are replaced by unshared, unpersisted
+    sources that return the fixed values above on every render.
+    """
+    import pages.tideDashboardPage as tideDashboardPage
+    import pages.tidePage as tidePage
+    import pages.weatherTravelPage as weatherTravelPage
+
+    with ExitStack() as stack:
+        patch = lambda *a: stack.enter_context(mock.patch.object(*a))
+        stack.enter_context(isolated_caches(cache_dir))
+        patch(tidePage, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+        patch(tideDashboardPage, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+        patch(
+            weatherTravelPage.WeatherTravelPage,
+            "SOURCES",
+            {
+                "ferry": DataSource("ferry", fake_ferry, ttl=0),
+                "weather": DataSource("weather", lambda: dict(FAKE_WEATHER), ttl=0),
+                "inside_temp": DataSource("inside_temp", lambda: FAKE_INSIDE_TEMP, ttl=0),
+            },
+        )
+        yield
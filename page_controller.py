@@ -4,10 +4,217 @@ This module is deliberately free of any GPIO / hardware imports so it can be
 unit-tested off-device. The on-device entrypoint (``main.py``) owns the button
 wiring and simply calls :meth:`PageController.request` from a button handler.
 """
+import hashlib
 import threading
-from typing import Dict, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from PIL.Image import Image
 
 from pages.basePage import BasePage
+from tracing import span
+
+
+# A burst of presses is treated as one request once no press has arrived for
+# SETTLE_SECONDS, waiting at most MAX_SETTLE_SECONDS in all.
+SETTLE_SECONDS = 0.3
+MAX_SETTLE_SECONDS = 2.0
+
+# Re-render this long after a reported change, so the render lands clearly on
+# the far side of it (e.g. a departed sailing is no longer "next").
+CHANGE_SLACK = 1.0
+
+
+def refresh_delay(page: BasePage, now: Optional[datetime] = None) -> float:
+    """Seconds until ``page`` should be re-rendered.
+
+    Just after the page's :meth:`~pages.basePage.BasePage.next_change`,
+    clamped to ``min_refresh_rate``..``refresh_rate``; the full
+    ``refresh_rate`` when the page reports none (or fails to).
+    """
+    now = now or datetime.now()
+    try:
+        change = page.next_change(now)
+    except Exception as e:
+        print(f"next_change for {type(page).__name__} failed: {e}")
+        change = None
+    if change is None:
+        return page.refresh_rate
+    delay = (change - now).total_seconds() + CHANGE_SLACK
+    return min(max(delay, page.min_refresh_rate), page.refresh_rate)
+
+
+def frame_digest(display, image) -> Optional[bytes]:
+    """Fingerprint of what the panel would show for ``image``.
+
+    Prefers the driver's palette-quantized buffer (``display.buf``, filled by
+    Inky's ``set_image``) so frames that differ only in colours the panel
+    can't tell apart hash equal. Falls back to the raw image bytes, and to
+    ``None`` (never equal) when neither is available.
+    """
+    buf = getattr(display, "buf", None)
+    try:
+        data = buf.tobytes() if buf is not None else image.tobytes()
+    except AttributeError:
+        return None
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+@dataclass
+class PageStats:
+    renders: int = 0
+    failures: int = 0
+    hits: int = 0  # frame() served from the cache
+    misses: int = 0  # frame() had to render inline
+    last_render_ms: float = 0.0
+    last_render_at: Optional[float] = None  # time.time() of the last good render
+    last_error: Optional[str] = None
+
+
+class Prerenderer:
+    """Renders every registered page ahead of time, each on its own schedule.
+
+    A daemon worker re-renders a page when its content next changes (see
+    :func:`refresh_delay`) and keeps the newest frame per page in memory, so showing a page
+    only means handing an already-rendered image to the display. Renders are
+    serialized by one lock: a page's ``make_image`` is never entered from two
+    threads at once.
+
+    ``postprocess`` (e.g. :func:`palette.quantize`) is applied to each frame
+    as it is rendered, so cached frames are already in their final form.
+    """
+
+    def __init__(
+        self,
+        pages: Dict[str, BasePage],
+        on_frame: Optional[Callable[[str, Image], None]] = None,
+        postprocess: Optional[Callable[[Image], Image]] = None,
+    ):
+        self.pages = pages
+        self.on_frame = on_frame
+        self.postprocess = postprocess
+        # Rendered first on each pass (the page currently on screen).
+        self.priority_key: Optional[str] = None
+        self._frames: Dict[str, Image] = {}
+        self._due: Dict[str, float] = {}  # key -> time.monotonic() of next render
+        self._render_lock = threading.Lock()
+        self._kick = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Guarded by _stats_lock, which is never held across a render, so
+        # readers (the status server) never wait on one.
+        self._stats: Dict[str, PageStats] = {key: PageStats() for key in pages}
+        self._stats_lock = threading.Lock()
+        # Cache-miss renders for frame_async, off the caller's thread.
+        self._on_demand = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame")
+
+    def frame(self, key: str) -> Image:
+        """Newest frame for ``key``, rendered synchronously on a cache miss.
+
+        A hit never takes the render lock, so it doesn't wait behind the
+        worker rendering some other page.
+        """
+        image = self._frames.get(key)
+        if image is not None:
+            with self._stats_lock:
+                self._stats[key].hits += 1
+            return image
+        with self._render_lock:
+            image = self._frames.get(key)
+            if image is None:
+                with self._stats_lock:
+                    self._stats[key].misses += 1
+                image = self._render(key)
+        return image
+
+    def frame_async(self, key: str) -> Future:
+        """:meth:`frame` as a future, so the caller can stop waiting for it.
+
+        A cached frame comes back already resolved. A miss renders on a
+        helper thread; if the caller gives up on it, the render still
+        finishes and its frame is cached for next time.
+        """
+        image = self._frames.get(key)
+        if image is not None:
+            with self._stats_lock:
+                self._stats[key].hits += 1
+            future: Future = Future()
+            future.set_result(image)
+            return future
+        return self._on_demand.submit(self.frame, key)
+
+    def stats(self) -> Dict[str, dict]:
+        """Snapshot of per-page render counts, timings and cache hits."""
+        with self._stats_lock:
+            return {key: asdict(s) for key, s in self._stats.items()}
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached frame and wake the worker to render fresh data."""
+        self._frames.pop(key, None)
+        self._due[key] = 0.0
+        self._kick.set()
+
+    def prioritize(self, key: str) -> None:
+        """Render ``key`` first from the worker's next pass, starting it now."""
+        self.priority_key = key
+        self._kick.set()
+
+    def render_due(self) -> float:
+        """Render every page whose refresh is due; return seconds to the next.
+
+        A failing page is logged and retried after its ``refresh_rate``; its
+        previous frame (if any) stays cached.
+        """
+        keys = sorted(self.pages, key=lambda k: k != self.priority_key)
+        for key in keys:
+            with self._render_lock:
+                if time.monotonic() < self._due.get(key, 0.0):
+                    continue
+                try:
+                    image = self._render(key)
+                except Exception as e:
+                    print(f"Prerender of page {key} failed: {e}")
+                    with self._stats_lock:
+                        self._stats[key].failures += 1
+                        self._stats[key].last_error = str(e)
+                    self._due[key] = time.monotonic() + self.pages[key].refresh_rate
+                    continue
+            if self.on_frame is not None:
+                self.on_frame(key, image)
+        return max(0.0, min(self._due.values()) - time.monotonic())
+
+    def start(self) -> None:
+        """Start the background worker (idempotent)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="prerender", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            self._kick.wait(timeout=self.render_due())
+            self._kick.clear()
+
+    def _render(self, key: str) -> Image:
+        # Caller holds _render_lock.
+        page = self.pages[key]
+        start = time.monotonic()
+        with span("make_image", page=type(page).__name__):
+            image = page.make_image()
+        if self.postprocess is not None:
+            with span("postprocess", page=type(page).__name__):
+                image = self.postprocess(image)
+        with self._stats_lock:
+            stats = self._stats[key]
+            stats.renders += 1
+            stats.last_render_ms = (time.monotonic() - start) * 1000
+            stats.last_render_at = time.time()
+            stats.last_error = None
+        self._due[key] = time.monotonic() + refresh_delay(page)
+        self._frames[key] = image
+        return image
 
 
 class PageController:
@@ -17,9 +224,24 @@ class PageController:
     :meth:`request`, which wakes the render loop so the switch (or a forced
     refresh of the current page) happens immediately rather than after the
     page's ``refresh_rate``.
+
+    While :meth:`run` is looping, a :class:`Prerenderer` keeps a fresh frame
+    for every page, so a switch only costs the panel's own refresh time.
+    Frames identical to the one already on the panel skip ``display.show()``
+    (a ~30 s full refresh on an Inky Impression); ``refreshes`` and
+    ``skipped_refreshes`` count both outcomes.
+
+    Requests are latest-wins: a burst of presses settles into one request
+    (see ``SETTLE_SECONDS``), and a render whose page has been navigated away
+    from is abandoned before it reaches the panel (``preempted``).
     """
 
-    def __init__(self, pages: Dict[str, BasePage], start_key: str):
+    def __init__(
+        self,
+        pages: Dict[str, BasePage],
+        start_key: str,
+        postprocess: Optional[Callable[[Image], Image]] = None,
+    ):
         if start_key not in pages:
             raise ValueError(f"start_key {start_key!r} is not a registered page")
         self.pages = pages
@@ -27,7 +249,17 @@ class PageController:
         self.current_page = pages[start_key]
         self._wake = threading.Event()
         self._requested_key: Optional[str] = None
+        self._request_seq = 0  # bumped on every request, to detect a burst settling
         self._lock = threading.Lock()
+        self._prerenderer = Prerenderer(pages, on_frame=self._on_frame, postprocess=postprocess)
+        self._prerenderer.priority_key = start_key
+        self._shown_digest: Optional[bytes] = None
+        # The frame on the panel, for observers such as the status server.
+        self.shown_image: Optional[Image] = None
+        self.shown_at: Optional[float] = None  # time.time() of the last show()
+        self.refreshes = 0
+        self.skipped_refreshes = 0
+        self.preempted = 0
 
     def request(self, label: str) -> None:
         """Ask the loop to show the page bound to ``label``.
@@ -39,8 +271,27 @@ class PageController:
             return
         with self._lock:
             self._requested_key = label
+            self._request_seq += 1
         self._wake.set()
 
+    def _has_request(self) -> bool:
+        with self._lock:
+            return self._requested_key is not None
+
+    def _settle(self) -> None:
+        """Wait out a burst of presses so only its last one is acted on."""
+        deadline = time.monotonic() + MAX_SETTLE_SECONDS
+        with self._lock:
+            if self._requested_key is None:
+                return  # woken by a fresh frame, not a press
+            seq = self._request_seq
+        while time.monotonic() < deadline:
+            time.sleep(SETTLE_SECONDS)
+            with self._lock:
+                if self._request_seq == seq:
+                    return
+                seq = self._request_seq
+
     def cycle(self) -> None:
         """Advance to the next registered page in order, wrapping around.
 
@@ -65,18 +316,104 @@ class PageController:
             self.current_key = requested
             self.current_page = self.pages[requested]
             self.current_page.load_page()
-        # Same key -> fall through; the loop re-renders the current page.
+            self._prerenderer.prioritize(requested)
+        else:
+            # Same key -> drop the prerendered frame so the loop re-renders
+            # the current page from fresh data.
+            self._prerenderer.invalidate(requested)
+
+    def _on_frame(self, key: str, image: Image) -> None:
+        # A new background frame for the page on screen -> show it.
+        if key == self.current_key:
+            self._wake.set()
+
+    def _await_frame(self, key: str) -> Optional[Image]:
+        """The frame for ``key``, or ``None`` if a request arrives first.
+
+        On a preempting request the wake flag is left set, so :meth:`run`
+        applies it straight away. The abandoned render keeps going in the
+        background (Python threads can't be interrupted) and its frame is
+        cached.
+        """
+        future = self._prerenderer.frame_async(key)
+        if not future.done():
+            future.add_done_callback(lambda f: self._wake.set())
+        while not future.done():
+            self._wake.wait()
+            self._wake.clear()
+            if self._has_request():
+                self._wake.set()
+                return None
+        return future.result()
 
     def render_once(self, display) -> None:
-        """Render the active page to the display a single time."""
-        display.set_image(self.current_page.make_image())
-        display.show()
+        """Show the active page's newest frame, unless the panel already has it."""
+        with span("render_once", page=self.current_key) as sp:
+            with span("frame"):
+                image = self._await_frame(self.current_key)
+            if image is None:
+                self.preempted += 1
+                sp["shown"] = 0
+                return
+            # Inky's set_image quantizes to the panel palette, unless the
+            # frame is already 'P' mode (see palette.quantize).
+            with span("set_image"):
+                display.set_image(image)
+            digest = frame_digest(display, image)
+            if digest is not None and digest == self._shown_digest:
+                self.skipped_refreshes += 1
+                sp["shown"] = 0
+                return
+            if self._has_request():
+                # Navigated away (or asked for a fresh render) meanwhile; the
+                # ~30 s refresh would only be replaced straight after.
+                self.preempted += 1
+                sp["shown"] = 0
+                return
+            with span("show"):
+                display.show()
+            self._shown_digest = digest
+            self.shown_image = image
+            self.shown_at = time.time()
+            self.refreshes += 1
+            sp["shown"] = 1
+
+    def status(self) -> dict:
+        """What the loop is showing and how each page is doing.
+
+        Reads counters and the prerenderer's stats snapshot only; it never
+        takes the render lock, so it is cheap to call from another thread.
+        """
+        render_stats = self._prerenderer.stats()
+        pages = {}
+        for key, page in self.pages.items():
+            try:
+                data = page.status()
+            except Exception as e:
+                data = {"error": str(e)}
+            pages[key] = {"page": type(page).__name__, **render_stats.get(key, {}), **data}
+        return {
+            "current": self.current_key,
+            "refreshes": self.refreshes,
+            "skipped_refreshes": self.skipped_refreshes,
+            "preempted": self.preempted,
+            "shown_at": self.shown_at,
+            "pages": pages,
+        }
 
     def run(self, display) -> None:
-        """Render forever, waking early when a button is pressed."""
+        """Render forever, waking on a button press or a fresh frame.
+
+        The first frame is rendered inline; after that the prerender worker
+        keeps every page's frame current and wakes the loop whenever the
+        active page has a new one.
+        """
         self.current_page.load_page()
+        self.render_once(display)
+        self._prerenderer.start()
         while True:
-            self.render_once(display)
-            self._wake.wait(timeout=self.current_page.refresh_rate)
+            self._wake.wait()
             self._wake.clear()
+            self._settle()
             self._apply_request()
+            self.render_once(display)
@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
 from PIL.Image import Image
 
 
 class BasePage(ABC):
-    # Seconds between automatic re-renders while this page is shown.
+    # Seconds between automatic re-renders while this page is shown; the
+    # longest gap when the page reports its next change (see next_change).
     # Subclasses override to taste.
     refresh_rate: int = 900
+    # Shortest gap between re-renders, however soon the next change is.
+    min_refresh_rate: int = 60
     page_active = False
 
     @abstractmethod
@@ -18,3 +24,17 @@ class BasePage(ABC):
 
     def unload_page(self):
         self.page_active = False
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        """When the rendered content next changes visibly, if the page knows.
+
+        The prerenderer re-renders just after it (clamped to
+        ``min_refresh_rate``..``refresh_rate``) rather than on a fixed
+        ``refresh_rate``. ``None`` means no known change: wait the full
+        ``refresh_rate``.
+        """
+        return None
+
+    def status(self) -> dict:
+        """JSON-able details for the status endpoint (e.g. data staleness)."""
+        return {}
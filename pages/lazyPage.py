@@ -0,0 +1,62 @@
+import importlib
+import threading
+from datetime import datetime
+from typing import Optional
+
+from PIL.Image import Image
+
+import fonts
+from pages.basePage import BasePage
+
+
+class LazyPage(BasePage):
+    """Stands in for a page whose module is imported on first use.
+
+    ``main.py`` registers every page this way, so startup only imports (and
+    prewarms the fonts of) the page shown first; the others load when the
+    prerender worker or a button press first needs them.
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec  # "module:ClassName"
+        self._page: BasePage | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def page(self) -> BasePage:
+        with self._lock:
+            if self._page is None:
+                module_name, class_name = self.spec.split(":")
+                module = importlib.import_module(module_name)
+                fonts.prewarm(module)
+                self._page = getattr(module, class_name)()
+            return self._page
+
+    @property
+    def refresh_rate(self) -> int:
+        # Not loaded yet (e.g. its import failed): retry on the default cadence.
+        return self._page.refresh_rate if self._page is not None else BasePage.refresh_rate
+
+    @property
+    def min_refresh_rate(self) -> int:
+        return self._page.min_refresh_rate if self._page is not None else BasePage.min_refresh_rate
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        return self._page.next_change(now) if self._page is not None else None
+
+    def load_page(self):
+        self.page_active = True
+        self.page.load_page()
+
+    def unload_page(self):
+        self.page_active = False
+        if self._page is not None:
+            self._page.unload_page()
+
+    def make_image(self, **kwargs) -> Image:
+        return self.page.make_image(**kwargs)
+
+    def status(self) -> dict:
+        if self._page is None:
+            return {"loaded": False}
+        return self._page.status()
@@ -0,0 +1,69 @@
+from io import BytesIO
+from urllib.parse import quote
+
+from PIL import Image, ImageDraw
+
+import http_client
+from fonts import get_font
+from pages.basePage import BasePage
+
+# Seconds between polls. A poll for an unchanged frame is a bodiless 304, so
+# this can be much shorter than the rendered page's own refresh_rate.
+POLL_SECONDS = 60
+
+WIDTH = 600
+HEIGHT = 448
+FALLBACK_FONT_SIZE = 34
+
+
+class RemotePage(BasePage):
+    """A page rendered by ``render_server.py`` and pulled over HTTP.
+
+    The display keeps its PageController and buttons; only ``make_image``
+    changes, from rendering locally to a conditional GET. An unchanged frame
+    (304) hands back the same image object, so the controller's digest check
+    skips the panel refresh. If the server is unreachable the last frame is
+    kept; before the first one arrives a locally drawn notice stands in, and
+    the next poll tries again.
+    """
+
+    refresh_rate = POLL_SECONDS
+
+    def __init__(self, server_url: str, name: str):
+        self.url = f"{server_url.rstrip('/')}/pages/{quote(name)}.png"
+        self.name = name
+        self._etag: str | None = None
+        self._image: Image.Image | None = None
+
+    def load_page(self):
+        self.page_active = True
+
+    def status(self) -> dict:
+        return {"remote": self.url, "etag": self._etag}
+
+    def make_image(self) -> Image.Image:
+        headers = {"If-None-Match": self._etag} if self._etag and self._image is not None else {}
+        try:
+            response = http_client.get(self.url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                return self._image
+            response.raise_for_status()
+            image = Image.open(BytesIO(response.content))
+            image.load()
+        except Exception as e:
+            if self._image is None:
+                print(f"Remote page {self.name} unavailable: {e}")
+                return self._render_fallback("Render server unavailable")
+            print(f"Remote page {self.name} unavailable, keeping last frame: {e}")
+            return self._image
+        self._etag = response.headers.get("ETag")
+        self._image = image
+        return image
+
+    def _render_fallback(self, message: str) -> Image.Image:
+        image = Image.new("RGBA", [WIDTH, HEIGHT], (255, 255, 255, 255))
+        d = ImageDraw.Draw(image)
+        fnt = get_font(FALLBACK_FONT_SIZE)
+        w = d.textlength(message, font=fnt)
+        d.text(((WIDTH - w) / 2, HEIGHT / 2 - FALLBACK_FONT_SIZE), message, font=fnt, fill=(0, 0, 0, 255))
+        return image
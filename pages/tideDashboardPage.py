@@ -0,0 +1,241 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from PIL import Image, ImageDraw
+
+from fonts import get_font
+from pages import tidePage
+from pages.basePage import BasePage
+from pages.tidePage import (
+    ANCHOR_STEP,
+    BLACK,
+    BLUE,
+    CHART_LEFT,
+    CHART_RIGHT,
+    DATE_FONT_SIZE,
+    FUTURE_HOURS,
+    HEIGHT,
+    MARGIN_X,
+    NIGHT_FILL,
+    NOW_DASH,
+    NOW_GAP,
+    PAST_HOURS,
+    RED,
+    REFRESH_RATE,
+    SCALE_MAX_FT,
+    SCALE_MIN_FT,
+    STATION_LAT,
+    STATION_LON,
+    WHITE,
+    WIDTH,
+    format_compact_time,
+    height_to_y,
+    next_chart_change,
+    night_spans,
+    time_to_x,
+)
+from tide_harmonics import HarmonicModel, load_harmonic_model
+from tide_store import shared_store
+from tides import Extreme, fetch_tide_extremes, sample_curve
+
+# (NOAA station ID, label), drawn top to bottom. All within ~50 km, so one
+# set of sunset/sunrise times (Mystery Bay's) shades every panel.
+STATIONS = [
+    ("9444900", "Port Townsend"),
+    ("9447130", "Seattle"),
+    ("9444971", "Mystery Bay"),
+]
+
+TITLE = "Tides"
+TITLE_FONT_SIZE = 30
+NAME_FONT_SIZE = 20
+NEXT_FONT_SIZE = 18
+
+HEADER_RULE_Y = 48
+PANELS_TOP = 54
+PANEL_GAP = 6
+PANEL_LABEL_H = 26  # station name row above each curve
+PANEL_PAD_BOTTOM = 4
+CURVE_SAMPLES = 120
+# Each panel is scaled to its own station's range over the window, padded so
+# the markers stay inside it (Seattle's highs run past TidePage's 10 ft top).
+SCALE_PAD_FT = 0.5
+CURVE_WIDTH = 2
+MARKER_RADIUS = 2
+
+
+def panel_scale(curve: list[tuple[datetime, float]]) -> tuple[float, float]:
+    """``(low, high)`` feet for a panel showing ``curve``."""
+    values = [v for _, v in curve]
+    if not values:
+        return SCALE_MIN_FT, SCALE_MAX_FT
+    low, high = min(values) - SCALE_PAD_FT, max(values) + SCALE_PAD_FT
+    return low, max(high, low + 1.0)
+
+
+def panel_bounds(index: int) -> tuple[float, float]:
+    """``(top, bottom)`` of the chart area of the ``index``-th station panel."""
+    height = (HEIGHT - PANELS_TOP - PANEL_GAP * (len(STATIONS) - 1)) / len(STATIONS)
+    top = PANELS_TOP + index * (height + PANEL_GAP)
+    return top + PANEL_LABEL_H, top + height - PANEL_PAD_BOTTOM
+
+
+class TideDashboardPage(BasePage):
+    """Small-multiple 48-hour tide curves for several stations at once.
+
+    Every station is predicted concurrently, from the same harmonic-constants
+    cache and tide store as :class:`~pages.tidePage.TidePage`. The panels
+    share one time window, so the night shading and now-line are computed
+    once and drawn across all of them.
+    """
+
+    refresh_rate = REFRESH_RATE
+
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(max_workers=len(STATIONS), thread_name_prefix="tide-station")
+        self._models: dict[str, HarmonicModel] = {}
+        self._store = shared_store(tidePage.STORE_PATH)  # looked up late so tests can redirect it
+        # Last good extremes per station, kept through a failed refresh.
+        self._extremes: dict[str, list[Extreme]] = {}
+        self._anchor: datetime | None = None
+
+    def load_page(self):
+        self.page_active = True
+
+    def status(self) -> dict:
+        return {
+            "stations": {
+                station_id: {
+                    "source": "harmonics" if station_id in self._models else "datagetter",
+                    "extremes": len(self._extremes.get(station_id, [])),
+                }
+                for station_id, _ in STATIONS
+            }
+        }
+
+    def next_change(self, now: datetime) -> datetime | None:
+        if self._anchor is None or not self._extremes:
+            return None
+        extremes = [ex for station in self._extremes.values() for ex in station]
+        return next_chart_change(
+            now,
+            self._anchor - timedelta(hours=PAST_HOURS),
+            self._anchor + timedelta(hours=FUTURE_HOURS),
+            extremes,
+        )
+
+    def _predict(self, station_id: str, now: datetime) -> list[Extreme]:
+        """Extremes for the days ``now`` ± 2, as ``TidePage._predict`` does."""
+        begin = now - timedelta(days=2)
+        end = now + timedelta(days=2)
+        model = self._models.get(station_id)
+        if model is None:
+            try:
+                model = self._models[station_id] = load_harmonic_model(station_id)
+            except Exception as e:
+                print(f"Tide harmonics for {station_id} unavailable, using NOAA predictions: {e}")
+        if model is not None:
+            return model.extremes(
+                datetime.combine(begin.date(), time()),
+                datetime.combine(end.date(), time.max),
+            )
+        return self._store.extremes(station_id, begin.date(), end.date(), fetch=fetch_tide_extremes)
+
+    def _refresh(self, now: datetime) -> bool:
+        """Predict every station at once; ``True`` if any of them refreshed."""
+        futures = {
+            station_id: self._pool.submit(self._predict, station_id, now) for station_id, _ in STATIONS
+        }
+        refreshed = False
+        for station_id, future in futures.items():
+            try:
+                extremes = future.result()
+            except Exception as e:
+                print(f"Tide fetch for {station_id} failed: {e}")
+                continue
+            if extremes:
+                self._extremes[station_id] = extremes
+                refreshed = True
+        return refreshed
+
+    def make_image(self, now: datetime | None = None) -> Image.Image:
+        now = now or datetime.now()
+        # As in TidePage, the window only moves with fresh data (through an
+        # outage the curves hold still and only the now-line advances), and
+        # its anchor is floored to ANCHOR_STEP so renders within the hour
+        # share one window.
+        if self._refresh(now) or self._anchor is None:
+            self._anchor = now - (now - datetime.min) % ANCHOR_STEP
+        window_start = self._anchor - timedelta(hours=PAST_HOURS)
+        window_end = self._anchor + timedelta(hours=FUTURE_HOURS)
+
+        image = Image.new("RGBA", [WIDTH, HEIGHT], WHITE)
+        d = ImageDraw.Draw(image)
+        for start, end in night_spans(window_start, window_end, STATION_LAT, STATION_LON):
+            x0 = time_to_x(start, window_start, window_end)
+            x1 = time_to_x(end, window_start, window_end)
+            d.rectangle([x0, PANELS_TOP, x1, HEIGHT], fill=NIGHT_FILL)
+
+        self._draw_header(d, now)
+        for index, (station_id, name) in enumerate(STATIONS):
+            self._draw_panel(d, index, name, self._extremes.get(station_id), now, window_start, window_end)
+
+        x_now = max(CHART_LEFT, min(time_to_x(now, window_start, window_end), CHART_RIGHT))
+        y = PANELS_TOP
+        while y < HEIGHT:
+            d.line((x_now, y, x_now, min(y + NOW_DASH, HEIGHT)), fill=RED, width=2)
+            y += NOW_DASH + NOW_GAP
+        return image
+
+    def _draw_header(self, d: ImageDraw.ImageDraw, now: datetime) -> None:
+        d.text((MARGIN_X, 8), TITLE, font=get_font(TITLE_FONT_SIZE), fill=BLACK)
+        date_fnt = get_font(DATE_FONT_SIZE)
+        date_str = now.strftime("%a %b %-d")
+        w = d.textlength(date_str, font=date_fnt)
+        d.text((WIDTH - MARGIN_X - w, 18), date_str, font=date_fnt, fill=BLACK)
+        d.line((0, HEADER_RULE_Y, WIDTH, HEADER_RULE_Y), fill=BLACK, width=2)
+
+    def _draw_panel(
+        self,
+        d: ImageDraw.ImageDraw,
+        index: int,
+        name: str,
+        extremes: list[Extreme] | None,
+        now: datetime,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> None:
+        top, bottom = panel_bounds(index)
+        d.text((MARGIN_X, top - PANEL_LABEL_H), name, font=get_font(NAME_FONT_SIZE), fill=BLACK)
+        if index > 0:
+            rule_y = top - PANEL_LABEL_H - PANEL_GAP / 2
+            d.line((CHART_LEFT, rule_y, CHART_RIGHT, rule_y), fill=BLACK, width=1)
+        if not extremes:
+            self._draw_right(d, top - PANEL_LABEL_H, "unavailable")
+            return
+
+        curve = sample_curve(extremes, window_start, window_end, CURVE_SAMPLES)
+        low, high = panel_scale(curve)
+
+        def to_y(value: float) -> float:
+            return max(top, min(height_to_y(value, top, bottom, low, high), bottom))
+
+        pts = [(time_to_x(t, window_start, window_end), to_y(v)) for t, v in curve]
+        if len(pts) >= 2:
+            d.line(pts, fill=BLUE, width=CURVE_WIDTH, joint="curve")
+        for ex in extremes:
+            if window_start <= ex.time <= window_end:
+                x = time_to_x(ex.time, window_start, window_end)
+                y = to_y(ex.value)
+                d.ellipse([x - MARKER_RADIUS, y - MARKER_RADIUS, x + MARKER_RADIUS, y + MARKER_RADIUS], fill=BLACK)
+
+        upcoming = next((ex for ex in extremes if ex.time > now), None)
+        if upcoming is not None:
+            kind = "High" if upcoming.kind == "H" else "Low"
+            self._draw_right(
+                d, top - PANEL_LABEL_H, f"{kind} {upcoming.value:.1f} ft {format_compact_time(upcoming.time)}"
+            )
+
+    def _draw_right(self, d: ImageDraw.ImageDraw, y: float, text: str) -> None:
+        fnt = get_font(NEXT_FONT_SIZE)
+        w = d.textlength(text, font=fnt)
+        d.text((WIDTH - MARGIN_X - w, y + 2), text, font=fnt, fill=BLACK)
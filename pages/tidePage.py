@@ -1,10 +1,14 @@
 import json
 import os
-from datetime import datetime, timedelta
-from PIL import Image, ImageDraw, ImageFont
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from PIL import Image, ImageDraw
 
+from fonts import get_font
 from pages.basePage import BasePage
-from tides import Extreme, fetch_tide_extremes, sample_curve, sun_times
+from tide_harmonics import HarmonicModel, load_harmonic_model
+from tide_store import shared_store
+from tides import Extreme, fetch_tide_extremes, sample_curve, sun_times_range
 
 STATION_ID = "9444971"
 STATION_NAME = "Mystery Bay"
@@ -18,6 +22,9 @@ SCALE_MAX_FT = 10.0
 PAST_HOURS = 12
 FUTURE_HOURS = 36
 REFRESH_RATE = 900
+# The window is anchored to the hour, not the minute, so the renders within
+# an hour share one static layer (see TidePage._base_layer).
+ANCHOR_STEP = timedelta(hours=1)
 
 WIDTH = 600
 HEIGHT = 448
@@ -54,45 +61,132 @@ NIGHT_BOTTOM = HEIGHT
 TITLE_UNDERLINE_RIGHT = 220  # short editorial underline ends here (px from left)
 NOW_DASH = 7                 # dash length on the "now" line (px)
 NOW_GAP = 5                  # gap between "now" dashes (px)
-
-_FONT_PATH = "JosefinSans-Bold.ttf"
+# Re-render once the chart has slid this far past the now-line: 3 px of the
+# 48-hour window is 15 minutes.
+NOW_LINE_STEP_PX = 3
 
 # Last good tide state is cached here so a frozen graph survives process
 # restarts (e.g. auto-deploy) during an API outage. Untracked, so a deploy's
 # `git reset --hard` leaves it intact. Resolved relative to the repo root so
 # it does not depend on the process's working directory.
 CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tide_cache.json")
+# Day-by-day store of datagetter extremes, so a refresh only fetches the days
+# it doesn't hold yet (see tide_store.py).
+STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tide_store.json")
 
 
-def time_to_x(t: datetime, start: datetime, end: datetime) -> float:
+def time_to_x(
+    t: datetime, start: datetime, end: datetime, left: float = CHART_LEFT, right: float = CHART_RIGHT
+) -> float:
     frac = (t - start).total_seconds() / (end - start).total_seconds()
-    return CHART_LEFT + frac * (CHART_RIGHT - CHART_LEFT)
-
-
-def height_to_y(value: float) -> float:
-    frac = (value - SCALE_MIN_FT) / (SCALE_MAX_FT - SCALE_MIN_FT)
-    return CHART_BOTTOM - frac * (CHART_BOTTOM - CHART_TOP)
+    return left + frac * (right - left)
+
+
+def height_to_y(
+    value: float,
+    top: float = CHART_TOP,
+    bottom: float = CHART_BOTTOM,
+    scale_min: float = SCALE_MIN_FT,
+    scale_max: float = SCALE_MAX_FT,
+) -> float:
+    frac = (value - scale_min) / (scale_max - scale_min)
+    return bottom - frac * (bottom - top)
+
+
+def next_chart_change(
+    now: datetime, window_start: datetime, window_end: datetime, extremes: list[Extreme]
+) -> datetime:
+    """The next ``NOW_LINE_STEP_PX`` step of the now-line, tide extreme (the
+    now-line reaching a marker) or midnight (the header date)."""
+    step = (window_end - window_start) * NOW_LINE_STEP_PX / (CHART_RIGHT - CHART_LEFT)
+    changes = [
+        window_start + step * ((now - window_start) // step + 1),
+        datetime.combine(now.date() + timedelta(days=1), time()),
+    ]
+    changes.extend(ex.time for ex in extremes if ex.time > now)
+    return min(changes)
 
 
 def format_compact_time(t: datetime) -> str:
     return f"{t.strftime('%-I:%M')}{t.strftime('%p').lower()[0]}"
 
 
+@lru_cache(maxsize=8)
+def _nights(
+    first: date, last: date, lat: float, lon: float
+) -> tuple[tuple[datetime, datetime], ...]:
+    """Unclipped local (sunset, next sunrise) pairs from ``first`` to ``last``.
+
+    Cached per date range, so windows that move within the same days (every
+    re-anchor, and the dashboard's window) share one computation.
+    """
+    events = sun_times_range(first, last, lat, lon)
+    return tuple(
+        (sunset.astimezone().replace(tzinfo=None), sunrise_next.astimezone().replace(tzinfo=None))
+        for (_, sunset), (sunrise_next, _) in zip(events, events[1:])
+        if sunset is not None and sunrise_next is not None
+    )
+
+
+def night_spans(
+    window_start: datetime, window_end: datetime, lat: float, lon: float
+) -> tuple[tuple[datetime, datetime], ...]:
+    """Dark (sunset->sunrise) intervals overlapping the visible window.
+
+    Sun times are computed in UTC, then converted to the device's local
+    time so they line up with the device-clock "now" line and the
+    station-local tide curve.
+    """
+    first = (window_start - timedelta(days=1)).date()
+    last = window_end.date() + timedelta(days=1)
+    spans = []
+    for start, end in _nights(first, last, lat, lon):
+        # clip to the visible window
+        start = max(start, window_start)
+        end = min(end, window_end)
+        if start < end:
+            spans.append((start, end))
+    return tuple(spans)
+
+
 class TidePage(BasePage):
     refresh_rate = REFRESH_RATE
 
     def __init__(self):
-        # Last good data, plus the "now" at the moment it was fetched. The chart
-        # window is anchored to ``_anchor`` so a failed refresh leaves the curve,
-        # markers, and night shading pixel-stable while the now-line advances.
+        # Last good data, plus the "now" it was fetched at (floored to
+        # ANCHOR_STEP). The chart window is anchored to ``_anchor`` so a
+        # failed refresh leaves the curve, markers, and night shading
+        # pixel-stable while the now-line advances.
         self._extremes: list[Extreme] | None = None
         self._anchor: datetime | None = None
         self._loaded = False
+        # Harmonic constants for local prediction; None until they've loaded.
+        self._model: HarmonicModel | None = None
+        self._store = shared_store(STORE_PATH)
+        # Cached static layer (see _base_layer) and the data it was drawn from.
+        self._base: Image.Image | None = None
+        self._base_key: tuple[datetime, list[Extreme]] | None = None
 
     def load_page(self):
         self.page_active = True
         self._ensure_loaded()
 
+    def status(self) -> dict:
+        anchor = self._anchor
+        return {
+            "source": "harmonics" if self._model is not None else "datagetter",
+            "data_anchor": anchor.isoformat() if anchor else None,
+            "data_age_seconds": round((datetime.now() - anchor).total_seconds()) if anchor else None,
+        }
+
+    def next_change(self, now: datetime) -> datetime | None:
+        anchor, extremes = self._anchor, self._extremes
+        if anchor is None or extremes is None:
+            return None
+        return next_chart_change(
+            now, anchor - timedelta(hours=PAST_HOURS), anchor + timedelta(hours=FUTURE_HOURS), extremes
+        )
+
     def make_image(self, now: datetime | None = None) -> Image.Image:
         now = now or datetime.now()
         self._ensure_loaded()
@@ -103,17 +197,15 @@ class TidePage(BasePage):
         return self._render(now, self._anchor, self._extremes)
 
     def _refresh(self, now: datetime) -> None:
-        """Fetch fresh extremes; on any failure keep the last good state.
+        """Predict fresh extremes; on any failure keep the last good state.
 
-        A successful, non-empty fetch re-anchors the window to ``now`` and
-        persists the new state. A failure (network/JSON/error payload/empty)
-        is logged and leaves ``_extremes``/``_anchor`` untouched so the prior
-        graph stays frozen.
+        A successful, non-empty prediction re-anchors the window to ``now``
+        floored to ``ANCHOR_STEP`` and persists the new state. A failure
+        (network/JSON/error payload/empty) is logged and leaves
+        ``_extremes``/``_anchor`` untouched so the prior graph stays frozen.
         """
         try:
-            begin = (now - timedelta(days=2)).strftime("%Y%m%d")
-            end = (now + timedelta(days=2)).strftime("%Y%m%d")
-            extremes = fetch_tide_extremes(STATION_ID, begin, end)
+            extremes = self._predict(now)
         except Exception as e:
             print(f"Tide fetch failed: {e}")
             return
@@ -121,16 +213,60 @@ class TidePage(BasePage):
             print("Tide fetch returned no predictions")
             return
         self._extremes = extremes
-        self._anchor = now
+        self._anchor = now - (now - datetime.min) % ANCHOR_STEP
         self._save_cache()
 
+    def _predict(self, now: datetime) -> list[Extreme]:
+        """Extremes for the days ``now`` ± 2, computed locally when possible.
+
+        The station's harmonic constants are downloaded once (and cached on
+        disk); after that predictions need no network. Until they load, the
+        NOAA datagetter's hi/lo predictions are used instead, fetching only
+        the days the tide store doesn't already hold.
+        """
+        begin = now - timedelta(days=2)
+        end = now + timedelta(days=2)
+        if self._model is None:
+            try:
+                self._model = load_harmonic_model(STATION_ID)
+            except Exception as e:
+                print(f"Tide harmonics unavailable, using NOAA predictions: {e}")
+        if self._model is not None:
+            return self._model.extremes(
+                datetime.combine(begin.date(), time()),
+                datetime.combine(end.date(), time.max),
+            )
+        return self._store.extremes(STATION_ID, begin.date(), end.date(), fetch=fetch_tide_extremes)
+
     def _render(self, now: datetime, anchor: datetime, extremes: list[Extreme]) -> Image.Image:
-        image = Image.new("RGBA", [WIDTH, HEIGHT], WHITE)
+        # Window is anchored to the last successful fetch, not the live clock,
+        # so the graph holds still during an outage and only the now-line moves.
+        window_start = anchor - timedelta(hours=PAST_HOURS)
+        window_end = anchor + timedelta(hours=FUTURE_HOURS)
+
+        image = self._base_layer(anchor, extremes).copy()
         d = ImageDraw.Draw(image)
         self._draw_header(d, now)
 
-        # Window is anchored to the last successful fetch, not the live clock,
-        # so the graph holds still during an outage and only the now-line moves.
+        # "Now" line — advances to the live clock; pinned to the chart edges
+        # once it drifts past the frozen window during an outage.
+        self._draw_now_line(d, now, window_start, window_end)
+        return image
+
+    def _base_layer(self, anchor: datetime, extremes: list[Extreme]) -> Image.Image:
+        """Night shading, curve and H/L markers for the anchored window.
+
+        None of it depends on the live clock, so it is drawn once per
+        ``(anchor, extremes)`` and reused: re-renders within the anchor's
+        hour (or through an outage) only copy it and draw the header and
+        now-line.
+        """
+        key = (anchor, extremes)
+        if self._base is not None and self._base_key == key:
+            return self._base
+
+        image = Image.new("RGBA", [WIDTH, HEIGHT], WHITE)
+        d = ImageDraw.Draw(image)
         window_start = anchor - timedelta(hours=PAST_HOURS)
         window_end = anchor + timedelta(hours=FUTURE_HOURS)
 
@@ -143,23 +279,21 @@ class TidePage(BasePage):
         if len(pts) >= 2:
             d.line(pts, fill=BLUE, width=CURVE_WIDTH, joint="curve")
 
-        # "Now" line — advances to the live clock; pinned to the chart edges
-        # once it drifts past the frozen window during an outage.
-        self._draw_now_line(d, now, window_start, window_end)
-
         # H/L markers + labels (only those inside the visible window)
-        label_fnt = ImageFont.truetype(_FONT_PATH, LABEL_FONT_SIZE)
+        label_fnt = get_font(LABEL_FONT_SIZE)
         for ex in extremes:
             if not (window_start <= ex.time <= window_end):
                 continue
             self._draw_marker(d, ex, window_start, window_end, label_fnt)
 
+        self._base_key = (anchor, list(extremes))
+        self._base = image
         return image
 
     def _draw_now_line(self, d, now: datetime, window_start, window_end) -> None:
         x_now = max(CHART_LEFT, min(time_to_x(now, window_start, window_end), CHART_RIGHT))
         self._dashed_vline(d, x_now, CHART_TOP, CHART_BOTTOM, RED)
-        now_fnt = ImageFont.truetype(_FONT_PATH, NOW_LABEL_FONT_SIZE)
+        now_fnt = get_font(NOW_LABEL_FONT_SIZE)
         label_w = d.textlength("now", font=now_fnt)
         # Label sits to the right of the line, flipping left near the edge so it
         # never clips once the now-line is pinned to CHART_RIGHT.
@@ -207,41 +341,15 @@ class TidePage(BasePage):
             d.line((x, y, x, min(y + NOW_DASH, y1)), fill=color, width=2)
             y += NOW_DASH + NOW_GAP
 
-    def _night_spans(self, window_start, window_end):
-        """Dark (sunset->sunrise) intervals overlapping the visible window.
-
-        Sun times are computed in UTC, then converted to the device's local
-        time so they line up with the device-clock "now" line and the
-        station-local tide curve.
-        """
-        spans = []
-        day = (window_start - timedelta(days=1)).date()
-        last = window_end.date()
-        while day <= last:
-            _, sunset = sun_times(day, STATION_LAT, STATION_LON)
-            sunrise_next, _ = sun_times(day + timedelta(days=1), STATION_LAT, STATION_LON)
-            if sunset is None or sunrise_next is None:
-                day += timedelta(days=1)
-                continue
-            start = sunset.astimezone().replace(tzinfo=None)
-            end = sunrise_next.astimezone().replace(tzinfo=None)
-            # clip to the visible window
-            start = max(start, window_start)
-            end = min(end, window_end)
-            if start < end:
-                spans.append((start, end))
-            day += timedelta(days=1)
-        return spans
-
     def _draw_night_shading(self, d, window_start, window_end) -> None:
-        for start, end in self._night_spans(window_start, window_end):
+        for start, end in night_spans(window_start, window_end, STATION_LAT, STATION_LON):
             x0 = time_to_x(start, window_start, window_end)
             x1 = time_to_x(end, window_start, window_end)
             d.rectangle([x0, NIGHT_TOP, x1, NIGHT_BOTTOM], fill=NIGHT_FILL)
 
     def _draw_header(self, d: ImageDraw.ImageDraw, now: datetime) -> None:
-        title_fnt = ImageFont.truetype(_FONT_PATH, TITLE_FONT_SIZE)
-        date_fnt = ImageFont.truetype(_FONT_PATH, DATE_FONT_SIZE)
+        title_fnt = get_font(TITLE_FONT_SIZE)
+        date_fnt = get_font(DATE_FONT_SIZE)
         d.text((MARGIN_X, 12), STATION_NAME, font=title_fnt, fill=BLACK)
         date_str = now.strftime("%a %b %-d")
         w = d.textlength(date_str, font=date_fnt)
@@ -281,7 +389,7 @@ class TidePage(BasePage):
         image = Image.new("RGBA", [WIDTH, HEIGHT], WHITE)
         d = ImageDraw.Draw(image)
         self._draw_header(d, datetime.now())
-        fnt = ImageFont.truetype(_FONT_PATH, FALLBACK_FONT_SIZE)
+        fnt = get_font(FALLBACK_FONT_SIZE)
         w = d.textlength(message, font=fnt)
         d.text(((WIDTH - w) / 2, HEIGHT / 2 - FALLBACK_FONT_SIZE), message, font=fnt, fill=BLACK)
         return image
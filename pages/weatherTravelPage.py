@@ -1,13 +1,34 @@
 import os
+import time
 from datetime import datetime
 from pages.basePage import BasePage
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import datasource
+from fonts import get_font
 from image import get_color_from_gradient
-from ferries import get_kingston_edmonds_sailing_times, get_kingston_wait_time
-from weather import get_weather
-from temperature_sensor import get_inside_temperature
-import colorcet as cc
-
+from ferries import EDMONDS, KINGSTON, FerryClient, format_sailing, next_sailings
+from weather import cached_icon, get_weather
+from temperature_sensor import SAMPLE_INTERVAL, get_inside_temperature, get_sensor
+
+TEXT_FONT_SIZE = 40
+TIME_FONT_SIZE = 20
+
+# Longest a render waits on data sources that have no usable value. Sources
+# still in flight after this fall back to their last good value (and keep
+# running in the background).
+FETCH_DEADLINE = 20
+
+# (departing, arriving) WSDOT terminal IDs shown on the page, in order.
+FERRY_ROUTES = [(KINGSTON, EDMONDS)]
+
+UNKNOWN_WEATHER = {
+    "temp": "??",
+    "weather": "??",
+    "temp_max": "??",
+    "temp_min": "??",
+    "feels_like": "??",
+    "icon": None,
+}
 
 round_if_float = lambda x: round(x) if isinstance(x, float) else x
 
@@ -16,32 +37,140 @@ def to_celcius(temp):
         return temp
     return round_if_float((temp - 32) * 5.0/9.0)
 
+
+_ferry_client = FerryClient(FERRY_ROUTES)
+
+
+def _fetch_ferry_info():
+    # One refresh covers every route; the rest is answered from its cache.
+    # Today's whole schedule is kept (not just the next sailings) so a cached
+    # copy still renders the right upcoming sailings later in the day.
+    _ferry_client.refresh()
+    return [
+        {
+            "route": _ferry_client.route_name(route),
+            "departures": [t.isoformat() for t in _ferry_client.departures_today(route)],
+            "guidance": _ferry_client.wait_guidance(route),
+        }
+        for route in FERRY_ROUTES
+    ]
+
+
+def format_ferry_info(routes: list[dict], now: datetime) -> str:
+    blocks = []
+    for route in routes:
+        departures = [datetime.fromisoformat(t) for t in route["departures"]]
+        sailings = ", ".join(format_sailing(t) for t in next_sailings(departures, now))
+        blocks.append(
+            f"Ferry ({route['route']}):\n"
+            f"Next sailings: {sailings or 'No more sailings today'}\n"
+            f"Guidance: {route['guidance']}"
+        )
+    return "\n".join(blocks)
+
+
+def _fetch_weather():
+    weather = get_weather(os.getenv("OPEN_WEATHER_API_KEY"), os.getenv("WEATHER_ZIP"))
+    if weather["temp"] == "??":
+        raise ValueError("weather unavailable")
+    return weather
+
+
+def _fetch_inside_temperature():
+    temp = get_inside_temperature()
+    if temp is None:
+        raise ValueError("sensor unavailable")
+    return temp
+
+
+# Shared feeds (see datasource.py). Ferry wait guidance changes every few
+# minutes and the forecast less often; both persist so a restart renders the
+# last good copy. The sensor samples on its own thread, so reading it is free.
+FERRY = datasource.register(
+    "ferry", _fetch_ferry_info, ttl=300, stale_while_revalidate=3600, persist=True
+)
+WEATHER = datasource.register(
+    "weather", _fetch_weather, ttl=600, stale_while_revalidate=3600, persist=True
+)
+INSIDE_TEMP = datasource.register(
+    "inside_temp", _fetch_inside_temperature, ttl=SAMPLE_INTERVAL, stale_if_error=600
+)
+
+
 class WeatherTravelPage(BasePage):
-    refresh_rate = 360
+    # Re-rendered as each listed sailing departs (see next_change); otherwise
+    # as often as the forecast source refreshes.
+    refresh_rate = 600
+
+    # Data sources read on every render, by name.
+    SOURCES = {
+        "ferry": FERRY,
+        "weather": WEATHER,
+        "inside_temp": INSIDE_TEMP,
+    }
 
     def load_page(self):
         self.page_active = True
+        get_sensor()  # start sampling now so the first render has a reading
+        for source in self.SOURCES.values():
+            source.poll()
+
+    def next_change(self, now: datetime) -> datetime | None:
+        """The next ferry departure, when the "Next sailings" line moves on."""
+        routes = self.SOURCES["ferry"].peek() or []
+        departures = [
+            t
+            for route in routes
+            for t in next_sailings([datetime.fromisoformat(s) for s in route["departures"]], now, 1)
+        ]
+        return min(departures, default=None)
+
+    def _fetch_all(self) -> tuple[dict[str, object], dict[str, Exception]]:
+        """Read every source, waiting at most ``FETCH_DEADLINE`` in total.
+
+        Stale sources are refetched concurrently, so render time is bounded by
+        the slowest source that has no usable value, not the sum. Returns
+        ``(values, errors)``: errors holds the failure for sources with no
+        value to show.
+        """
+        for source in self.SOURCES.values():
+            source.poll()
+        deadline = time.monotonic() + FETCH_DEADLINE
+        values: dict[str, object] = {}
+        errors: dict[str, Exception] = {}
+        for name, source in self.SOURCES.items():
+            try:
+                values[name] = source.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                errors[name] = e
+        return values, errors
+
+    def status(self) -> dict:
+        return {
+            "data_age_seconds": {
+                name: round(age) if (age := source.age()) is not None else None
+                for name, source in self.SOURCES.items()
+            }
+        }
+
+    def make_image(self, now: datetime | None = None):
+        values, errors = self._fetch_all()
+        now = now or datetime.now()
+
+        # Ferry sailing times and wait time guidance
+        if "ferry" in errors:
+            ferry_info = f"Ferry info unavailable: {str(errors['ferry'])}"
+        else:
+            ferry_info = format_ferry_info(values["ferry"], now)
 
-    def make_image(self):
-        # Get ferry sailing times and wait time guidance
-        try:
-            api_key = os.getenv("WSDOT_API_ACCESS_CODE")
-            ferry_times = get_kingston_edmonds_sailing_times(api_key)
-            wait_guidance = get_kingston_wait_time(api_key)
-            ferry_info = f"Ferry (Kingston → Edmonds):\nNext sailings: {ferry_times}\nGuidance: {wait_guidance}"
-        except Exception as e:
-            ferry_info = f"Ferry info unavailable: {str(e)}"
-
-        # Get inside temperature from sensor
-        inside_temp = get_inside_temperature()
+        # Inside temperature from the sensor
+        inside_temp = values.get("inside_temp")
         if inside_temp is not None:
             inside_temp_str = f"Inside Temp: {round_if_float(inside_temp)}°F"
         else:
             inside_temp_str = "Inside Temp: Unavailable"
 
-        api_key = os.getenv("OPEN_WEATHER_API_KEY")
-        zip = os.getenv("WEATHER_ZIP")
-        weather = get_weather(api_key, zip)
+        weather = dict(values.get("weather", UNKNOWN_WEATHER))
 
         weatherDescription = str(weather['weather'])
         for i in range(len(weatherDescription)):
@@ -61,11 +190,11 @@ class WeatherTravelPage(BasePage):
         if weather["temp"] == "??":
             weather['temp'] = 0
 
-        bg_color = get_color_from_gradient(int(weather["temp"]), 0, 115, cc.m_coolwarm)
+        bg_color = get_color_from_gradient(int(weather["temp"]), 0, 115)
         image = Image.new("RGBA", [600, 448], bg_color)
 
         # get a font
-        fnt = ImageFont.truetype("JosefinSans-Bold.ttf", 40)
+        fnt = get_font(TEXT_FONT_SIZE)
         # get a drawing context
         d = ImageDraw.Draw(image)
 
@@ -75,13 +204,15 @@ class WeatherTravelPage(BasePage):
         # draw a line
         d.line((0, 160, image.size[0], 160), fill=text_color, width=7)
 
-        weather_img = Image.open('weather_image.png', 'r')
-        image.paste(weather_img, (505, 320), mask=weather_img)
+        # Only an icon the weather fetch already downloaded: the render never
+        # waits on the network for one.
+        weather_img = cached_icon(weather["icon"]) if weather["icon"] is not None else None
+        if weather_img is not None:
+            image.paste(weather_img, (505, 320), mask=weather_img)
 
         # Add refresh time
-        now = datetime.now()
         timeStr = now.strftime("%-I:%M %p")
-        fnt = ImageFont.truetype("JosefinSans-Bold.ttf", 20)
+        fnt = get_font(TIME_FONT_SIZE)
         d.text((515, 418), timeStr, font=fnt, fill=text_color)
 
         return image
@@ -0,0 +1,139 @@
+"""Quantize frames to the Inky Impression's 7-colour palette ahead of time.
+
+Inky's ``set_image`` converts any non-'P' image to the panel palette with
+Floyd-Steinberg dithering on every frame, which is slow on a Pi Zero. A
+'P'-mode image whose indices are already panel colours is taken as-is, so
+:func:`quantize` does that work once, off the display path (the
+prerenderer calls it), through a cached RGB -> palette-index lookup table.
+The output is deterministic, so equal frames hash equal.
+
+Without NumPy it falls back to PIL's ``quantize`` against the same palette.
+"""
+from functools import lru_cache
+
+from PIL import Image
+
+from numpy_compat import np
+
+# inky.inky_uc8159: black, white, green, blue, red, yellow, orange. The driver
+# blends the two per colour by ``saturation`` (0.5 by default).
+DESATURATED_PALETTE = [
+    (0, 0, 0),
+    (255, 255, 255),
+    (0, 255, 0),
+    (0, 0, 255),
+    (255, 0, 0),
+    (255, 255, 0),
+    (255, 140, 0),
+]
+SATURATED_PALETTE = [
+    (57, 48, 57),
+    (255, 255, 255),
+    (58, 91, 70),
+    (61, 59, 94),
+    (156, 72, 75),
+    (208, 190, 71),
+    (177, 106, 73),
+]
+CLEAN = (255, 255, 255)  # index 7, the panel's "clear" colour; never chosen
+SATURATION = 0.5
+
+LUT_BITS = 5  # per channel: 32x32x32 tables
+# Weight on how far apart a dither pair's two colours are: prefers mixing
+# neighbours (orange + white for a warm tone) over distant colours, while
+# staying small enough that a flat gray still becomes black + white.
+PAIR_PENALTY = 0.01
+_BAYER_4 = [
+    [0, 8, 2, 10],
+    [12, 4, 14, 6],
+    [3, 11, 1, 9],
+    [15, 7, 13, 5],
+]
+
+
+@lru_cache(maxsize=4)
+def colors(saturation: float = SATURATION) -> tuple[tuple[int, int, int], ...]:
+    """The 7 panel colours as the driver blends them for ``saturation``."""
+    return tuple(
+        tuple(int(s * saturation + d * (1.0 - saturation)) for s, d in zip(sat, desat))
+        for sat, desat in zip(SATURATED_PALETTE, DESATURATED_PALETTE)
+    )
+
+
+def _flat_palette(saturation: float) -> list[int]:
+    flat = [c for rgb in colors(saturation) for c in rgb] + list(CLEAN)
+    return flat + [0, 0, 0] * (256 - len(flat) // 3)
+
+
+def _cells():
+    step = 1 << (8 - LUT_BITS)
+    levels = np.arange(0, 256, step, dtype=np.float32) + step / 2
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    return np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+
+
+@lru_cache(maxsize=4)
+def _nearest_lut(saturation: float):
+    """Nearest panel colour for every 5-bit-per-channel RGB cell."""
+    pal = np.array(colors(saturation), dtype=np.float32)
+    dist = ((_cells()[:, None, :] - pal[None, :, :]) ** 2).sum(axis=2)
+    return dist.argmin(axis=1).astype(np.uint8)
+
+
+@lru_cache(maxsize=4)
+def _dither_lut(saturation: float):
+    """Per cell, the panel-colour pair ``(a, b)`` whose mix best matches it.
+
+    Also returns the mix as a threshold in 1/16ths: a pixel takes ``b`` where
+    the Bayer matrix is below it, else ``a``. Mixing two colours rather than
+    offsetting RGB keeps the error along a line between panel colours, so a
+    gray becomes black and white and never picks up an orange cast.
+    """
+    cells = _cells()
+    pal = np.array(colors(saturation), dtype=np.float32)
+    n = len(pal)
+    pairs = np.array([(i, j) for i in range(n) for j in range(i, n)])
+    a, b = pal[pairs[:, 0]], pal[pairs[:, 1]]
+    ab = b - a
+    span = (ab ** 2).sum(axis=1)
+    t = ((cells[:, None, :] - a[None]) * ab[None]).sum(axis=2) / np.maximum(span, 1)[None]
+    t = np.round(np.clip(t, 0, 1) * 16) / 16
+    mix = a[None] + t[..., None] * ab[None]
+    err = ((cells[:, None, :] - mix) ** 2).sum(axis=2) + PAIR_PENALTY * span[None] * (t > 0) * (t < 1)
+    best = err.argmin(axis=1)
+    rows = np.arange(len(cells))
+    return (
+        pairs[best, 0].astype(np.uint8),
+        pairs[best, 1].astype(np.uint8),
+        (t[rows, best] * 16).astype(np.uint8),
+    )
+
+
+def quantize(image: Image.Image, dither: bool = False, saturation: float = SATURATION) -> Image.Image:
+    """``image`` as a 'P'-mode frame indexed by panel colour (0-6).
+
+    ``dither`` applies a 4x4 ordered (Bayer) dither between the two panel
+    colours that best mix to each pixel. An already-'P' image is returned
+    unchanged.
+    """
+    if image.mode == "P":
+        return image
+    rgb = image.convert("RGB")
+    if np is None:
+        pal_image = Image.new("P", (1, 1))
+        pal_image.putpalette(_flat_palette(saturation))
+        method = Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE
+        return rgb.quantize(palette=pal_image, dither=method)
+
+    q = np.asarray(rgb, dtype=np.int32) >> (8 - LUT_BITS)
+    cell = (q[..., 0] << (2 * LUT_BITS)) | (q[..., 1] << LUT_BITS) | q[..., 2]
+    if dither:
+        lut_a, lut_b, lut_t = _dither_lut(saturation)
+        h, w = cell.shape
+        bayer = np.tile(np.array(_BAYER_4, dtype=np.uint8), (h // 4 + 1, w // 4 + 1))[:h, :w]
+        indices = np.where(bayer < lut_t[cell], lut_b[cell], lut_a[cell])
+    else:
+        indices = _nearest_lut(saturation)[cell]
+    out = Image.fromarray(indices.astype(np.uint8), mode="P")
+    out.putpalette(_flat_palette(saturation))
+    return out
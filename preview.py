@@ -5,24 +5,230 @@ Usage:
     python preview.py pages.tidePage:TidePage
 Writes <ClassName>_preview.png in the current directory.
 
+Batch / time-lapse mode renders each page across a range of simulated
+``now`` values (pages whose ``make_image`` takes ``now``):
+    python preview.py --hours 48 --step 15 --gif --sheet
+    python preview.py pages.tidePage:TidePage --start 2026-06-10T00:00 --offline
+Frames go to ``--out-dir`` (default ``preview_frames/``) as
+<ClassName>_<YYYYmmdd-HHMM>.png, plus an optional animated GIF and contact
+sheet per page. Work is split into contiguous runs of timestamps across a
+process pool; each run builds its page once, so fetched data, harmonic
+constants and fonts are reused from frame to frame. Page caches are kept in
+a temporary directory, never the device's own files. ``--offline`` renders
+against the fakes in ``offline.py`` instead of live data.
+
 This harness deliberately does NOT import `inky` or `main.py`, so it runs on a
 laptop without the Raspberry Pi hardware packages.
 """
+import argparse
 import importlib
+import inspect
+import math
+import os
+import pkgutil
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from functools import partial
 
+from PIL import Image, ImageDraw
 
-def main(spec: str) -> None:
+from fonts import get_font
+from offline import isolated_caches, offline_pages
+from pages.basePage import BasePage
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+DEFAULT_OUT_DIR = "preview_frames"
+GIF_FRAME_MS = 200
+SHEET_SCALE = 4  # contact-sheet thumbnails are 1/SHEET_SCALE of the frame
+SHEET_LABEL_FONT_SIZE = 14
+
+
+def load_page_class(spec: str) -> type[BasePage]:
+    """The page class named by a ``module:ClassName`` spec."""
     module_name, class_name = spec.split(":")
     module = importlib.import_module(module_name)
-    page_cls = getattr(module, class_name)
+    return getattr(module, class_name)
+
+
+def _takes_no_arguments(cls: type) -> bool:
+    params = list(inspect.signature(cls).parameters.values())
+    return all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params)
+
+
+def discover_pages() -> list[type[BasePage]]:
+    """Every concrete BasePage subclass in the ``pages`` package.
+
+    Only pages that can be built without arguments are returned (not, e.g.,
+    ``RemotePage``, which needs a server to pull from).
+    """
+    found = []
+    for info in pkgutil.iter_modules([PAGES_DIR]):
+        module = importlib.import_module(f"pages.{info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(cls, BasePage)
+                and not inspect.isabstract(cls)
+                and cls.__module__ == module.__name__
+                and _takes_no_arguments(cls)
+            ):
+                found.append(cls)
+    return found
+
+
+def render_at(page: BasePage, now: datetime) -> Image.Image:
+    """``page.make_image`` at a simulated ``now``, for pages that accept one."""
+    if "now" in inspect.signature(page.make_image).parameters:
+        return page.make_image(now=now)
+    return page.make_image()
+
+
+def main(spec: str) -> None:
+    page_cls = load_page_class(spec)
     page = page_cls()
     image = page.make_image()
-    out = f"{class_name}_preview.png"
+    out = f"{page_cls.__name__}_preview.png"
     image.convert("RGB").save(out)
     print(f"Wrote {out} ({image.size[0]}x{image.size[1]})")
 
 
+def _page_context(stack: ExitStack, cache_dir: str, offline: bool) -> None:
+    """Keep the page's cache files in ``cache_dir`` (and fake its data if ``offline``).
+
+    Simulated ``now`` values must never reach the device's own caches.
+    """
+    if offline:
+        stack.enter_context(offline_pages(cache_dir))
+    else:
+        stack.enter_context(isolated_caches(cache_dir))
+
+
+def _frame_path(out_dir: str, page_cls: type, now: datetime) -> str:
+    return os.path.join(out_dir, f"{page_cls.__name__}_{now:%Y%m%d-%H%M}.png")
+
+
+def _render_run(spec: str, offline: bool, seed_dir: str, out_dir: str, times: list[datetime]) -> list[str]:
+    """Render one contiguous run in a worker, with one page and its own caches.
+
+    The caches start as a copy of ``seed_dir`` (what the first frame
+    fetched), so workers never write the same file.
+    """
+    paths = []
+    with ExitStack() as stack:
+        cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        shutil.copytree(seed_dir, cache_dir, dirs_exist_ok=True)
+        _page_context(stack, cache_dir, offline)
+        page = load_page_class(spec)()
+        for now in times:
+            path = _frame_path(out_dir, type(page), now)
+            render_at(page, now).convert("RGB").save(path)
+            paths.append(path)
+    return paths
+
+
+def _chunks(items: list, n: int) -> list[list]:
+    """Split ``items`` into at most ``n`` contiguous, near-equal runs."""
+    size = math.ceil(len(items) / n) if items else 1
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_batch(
+    spec: str,
+    times: list[datetime],
+    out_dir: str = DEFAULT_OUT_DIR,
+    workers: int | None = None,
+    offline: bool = False,
+) -> list[str]:
+    """Render ``spec`` at every time in ``times``; returns frame paths in order.
+
+    The first frame is rendered in this process, which also fills the page's
+    caches (e.g. harmonic constants) before the workers start and copy them.
+    The rest are split into contiguous runs, one per worker. Every cache
+    lives in a temporary directory for the batch, never next to the code.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    with ExitStack() as stack:
+        seed_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        with ExitStack() as page_stack:
+            _page_context(page_stack, seed_dir, offline)
+            page = load_page_class(spec)()
+            first = _frame_path(out_dir, type(page), times[0])
+            render_at(page, times[0]).convert("RGB").save(first)
+        paths = [first]
+        rest = times[1:]
+        if rest:
+            runs = _chunks(rest, workers)
+            with ProcessPoolExecutor(max_workers=min(workers, len(rest))) as pool:
+                for run in pool.map(partial(_render_run, spec, offline, seed_dir, out_dir), runs):
+                    paths.extend(run)
+    return paths
+
+
+def write_gif(paths: list[str], out: str, frame_ms: int = GIF_FRAME_MS) -> None:
+    with ExitStack() as stack:
+        frames = [stack.enter_context(Image.open(p)) for p in paths]
+        frames[0].save(out, save_all=True, append_images=frames[1:], duration=frame_ms, loop=0)
+
+
+def write_contact_sheet(paths: list[str], times: list[datetime], out: str, columns: int = 8) -> None:
+    """Grid of 1/SHEET_SCALE thumbnails, each labelled with its simulated time."""
+    thumbs = []
+    for p in paths:
+        with Image.open(p) as img:
+            thumbs.append(img.resize((img.width // SHEET_SCALE, img.height // SHEET_SCALE)))
+    tw, th = thumbs[0].size
+    label_h = SHEET_LABEL_FONT_SIZE + 4
+    columns = min(columns, len(thumbs))
+    rows = math.ceil(len(thumbs) / columns)
+    sheet = Image.new("RGB", (columns * tw, rows * (th + label_h)), "white")
+    d = ImageDraw.Draw(sheet)
+    fnt = get_font(SHEET_LABEL_FONT_SIZE)
+    for i, (thumb, now) in enumerate(zip(thumbs, times)):
+        x, y = (i % columns) * tw, (i // columns) * (th + label_h)
+        sheet.paste(thumb, (x, y))
+        d.text((x + 2, y + th + 1), now.strftime("%a %-I:%M %p"), font=fnt, fill="black")
+    sheet.save(out)
+
+
+def batch_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(description="Render pages across a range of simulated times.")
+    parser.add_argument("pages", nargs="*", help="module:ClassName specs (default: every page)")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="first simulated now (default: now)")
+    parser.add_argument("--hours", type=float, default=48)
+    parser.add_argument("--step", type=float, default=15, help="minutes between frames")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--gif", action="store_true", help="also write <ClassName>.gif")
+    parser.add_argument("--sheet", action="store_true", help="also write <ClassName>_sheet.png")
+    parser.add_argument("--columns", type=int, default=8, help="contact-sheet columns")
+    parser.add_argument("--offline", action="store_true", help="render against offline.py data")
+    args = parser.parse_args(argv)
+
+    start = args.start or datetime.now().replace(second=0, microsecond=0)
+    count = int(args.hours * 60 // args.step) + 1
+    times = [start + timedelta(minutes=args.step * i) for i in range(count)]
+    specs = args.pages or [f"{cls.__module__}:{cls.__name__}" for cls in discover_pages()]
+    for spec in specs:
+        name = spec.split(":")[1]
+        paths = render_batch(spec, times, args.out_dir, args.workers, args.offline)
+        print(f"Wrote {len(paths)} {name} frames to {args.out_dir}/")
+        if args.gif:
+            out = os.path.join(args.out_dir, f"{name}.gif")
+            write_gif(paths, out)
+            print(f"Wrote {out}")
+        if args.sheet:
+            out = os.path.join(args.out_dir, f"{name}_sheet.png")
+            write_contact_sheet(paths, times, out, args.columns)
+            print(f"Wrote {out}")
+
+
 if __name__ == "__main__":
-    spec = sys.argv[1] if len(sys.argv) > 1 else "pages.tidePage:TidePage"
-    main(spec)
+    argv = sys.argv[1:]
+    if len(argv) <= 1 and not any(a.startswith("-") for a in argv):
+        main(argv[0] if argv else "pages.tidePage:TidePage")
+    else:
+        batch_main(argv)
@@ -0,0 +1,182 @@
+"""Headless render server: renders pages once and serves them to many displays.
+
+Usage:
+    python render_server.py                          # every page, port 8080
+    python render_server.py --port 9000 pages.tidePage:TidePage
+
+    GET /pages               JSON: served page names and refresh rates
+    GET /pages/<Name>.png    newest frame; honours If-None-Match (304)
+    GET /status              JSON: per-page render stats
+
+Pages are loaded with the ``preview.py`` loader and kept fresh by the same
+:class:`~page_controller.Prerenderer` the display uses, so each page is
+rendered (and its upstream APIs called) once per ``refresh_rate`` however
+many displays poll. Each frame is PNG-encoded once when it is rendered; a
+poll is answered from those bytes, and an unchanged frame costs a 304.
+
+Displays pull frames with :class:`pages.remotePage.RemotePage` (``main.py``
+switches to it when ``INKY_RENDER_SERVER`` is set). Like ``preview.py``,
+this never imports the hardware packages.
+"""
+import argparse
+import functools
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Callable, Dict, Optional
+
+from PIL.Image import Image
+
+import palette
+from page_controller import Prerenderer
+from pages.basePage import BasePage
+from preview import discover_pages, load_page_class
+
+DEFAULT_PORT = 8080
+
+
+def encode_frame(image: Image) -> tuple[str, bytes]:
+    """``(etag, png)`` for a frame; the ETag is a hash of the PNG bytes."""
+    buf = BytesIO()
+    # 'P' frames (pre-quantized, see --quantize) keep their palette indices.
+    (image if image.mode in ("RGB", "P") else image.convert("RGB")).save(buf, format="PNG")
+    png = buf.getvalue()
+    return f'"{hashlib.blake2b(png, digest_size=16).hexdigest()}"', png
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+class RenderServer:
+    def __init__(
+        self,
+        pages: Dict[str, BasePage],
+        port: int = DEFAULT_PORT,
+        host: str = "",
+        postprocess: Optional[Callable[[Image], Image]] = None,
+    ):
+        self.pages = pages
+        self._encoded: Dict[str, tuple[str, bytes]] = {}  # name -> (etag, png)
+        self._encode_lock = threading.Lock()
+        self.prerenderer = Prerenderer(pages, on_frame=self._on_frame, postprocess=postprocess)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """Start the prerender worker and serve on a daemon thread."""
+        for page in self.pages.values():
+            page.load_page()
+        self.prerenderer.start()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.1},
+                name="render-server",
+                daemon=True,
+            )
+            self._thread.start()
+        print(f"Render server serving {', '.join(self.pages)} on port {self.port}")
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread = None
+
+    def _on_frame(self, name: str, image: Image) -> None:
+        encoded = encode_frame(image)
+        with self._encode_lock:
+            self._encoded[name] = encoded
+
+    def frame(self, name: str) -> tuple[str, bytes]:
+        """``(etag, png)`` for ``name``, rendering inline if nothing is cached yet."""
+        with self._encode_lock:
+            encoded = self._encoded.get(name)
+        if encoded is None:
+            encoded = encode_frame(self.prerenderer.frame(name))
+            with self._encode_lock:
+                encoded = self._encoded.setdefault(name, encoded)
+        return encoded
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/pages":
+                    body = {
+                        name: {"page": type(page).__name__, "refresh_rate": page.refresh_rate}
+                        for name, page in server.pages.items()
+                    }
+                    self._send(200, "application/json", json.dumps(body).encode())
+                elif path == "/status":
+                    body = json.dumps(server.prerenderer.stats(), default=str).encode()
+                    self._send(200, "application/json", body)
+                elif path.startswith("/pages/") and path.endswith(".png"):
+                    name = path[len("/pages/"):-len(".png")]
+                    if name not in server.pages:
+                        self.send_error(404, f"Unknown page {name}")
+                        return
+                    try:
+                        etag, png = server.frame(name)
+                    except Exception as e:
+                        print(f"Render of page {name} failed: {e}")
+                        self.send_error(503, "Page not rendered yet")
+                        return
+                    if etag_matches(self.headers.get("If-None-Match"), etag):
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    self._send(200, "image/png", png, etag=etag)
+                else:
+                    self.send_error(404)
+
+            def _send(self, code: int, content_type: str, body: bytes, etag: Optional[str] = None) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")  # always revalidate
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # one line per display poll would flood the journal
+
+        return Handler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve rendered pages to thin-client displays.")
+    parser.add_argument("pages", nargs="*", help="module:ClassName specs (default: every page)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="")
+    parser.add_argument(
+        "--quantize", action="store_true", help="serve frames pre-quantized to the Inky palette"
+    )
+    args = parser.parse_args(argv)
+
+    page_classes = [load_page_class(s) for s in args.pages] or discover_pages()
+    # Pages are published under their class name: /pages/TidePage.png
+    postprocess = functools.partial(palette.quantize, dither=True) if args.quantize else None
+    server = RenderServer(
+        {cls.__name__: cls() for cls in page_classes}, args.port, args.host, postprocess
+    )
+    server.start()
+    threading.Event().wait()  # serve until killed
+
+
+if __name__ == "__main__":
+    main()
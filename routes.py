@@ -1,7 +1,10 @@
-import requests
 import os
 
+import http_client
+from tracing import traced
 
+
+@traced()
 def get_time_to_destination(origin: str, destination: str) -> str:
 
     return "Not available"
@@ -35,7 +38,7 @@ def get_time_to_destination(origin: str, destination: str) -> str:
         'X-Goog-FieldMask': 'routes.distanceMeters,routes.duration,routes.localizedValues'
     }
     try:
-        response = requests.post(routesApiURL, json=body, headers=headers)
+        response = http_client.post(routesApiURL, json=body, headers=headers)
         resJson = response.json()
         print(resJson)
         duration = resJson['routes'][0]['localizedValues']['duration']['text']
@@ -0,0 +1,106 @@
+"""Tiny read-only HTTP endpoint for watching a running display.
+
+    GET /frame.png   the frame currently on the panel
+    GET /status      JSON: current page, refresh counts, per-page render
+                     timings, cache hits and data staleness, shared data
+                     source ages and errors, span histograms and per-host
+                     fetch latency
+
+It runs on its own daemon thread and only reads what the controller has
+already published (``shown_image``, counters, stats snapshots), so a poll
+never waits on, or slows down, the render loop. ``main.py`` starts it when
+``INKY_STATUS_PORT`` is set.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Optional
+
+import datasource
+import http_client
+import tracing
+from page_controller import PageController
+
+
+class StatusServer:
+    def __init__(self, controller: PageController, port: int, host: str = ""):
+        self.controller = controller
+        self._png: tuple[Optional[object], bytes] = (None, b"")  # (image, encoded)
+        self._png_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """Serve on a daemon thread (idempotent)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.1},  # keeps stop() quick
+            name="status-server",
+            daemon=True,
+        )
+        self._thread.start()
+        print(f"Status server listening on port {self.port}")
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread = None
+
+    def frame_png(self) -> Optional[bytes]:
+        """The shown frame as PNG, encoded once per frame rather than per poll."""
+        image = self.controller.shown_image
+        if image is None:
+            return None
+        with self._png_lock:
+            cached, data = self._png
+            if cached is not image:
+                buf = BytesIO()
+                image.convert("RGB").save(buf, format="PNG")
+                data = buf.getvalue()
+                self._png = (image, data)
+            return data
+
+    def status(self) -> dict:
+        return {
+            **self.controller.status(),
+            "sources": datasource.status(),
+            "spans": tracing.snapshot(),
+            "hosts": http_client.latency_stats(),
+        }
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/frame.png":
+                    body = server.frame_png()
+                    if body is None:
+                        self.send_error(503, "No frame shown yet")
+                        return
+                    self._send(200, "image/png", body)
+                elif self.path in ("/", "/status"):
+                    body = json.dumps(server.status(), default=str).encode()
+                    self._send(200, "application/json", body)
+                else:
+                    self.send_error(404)
+
+            def _send(self, code: int, content_type: str, body: bytes) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # polls would flood the journal
+
+        return Handler
@@ -1,18 +1,161 @@
-import board
-import busio
-import adafruit_pct2075
+"""Indoor temperature from the PCT2075, sampled in the background.
+
+The I2C bus and sensor are opened once and read on a daemon thread every
+``SAMPLE_INTERVAL`` seconds into a ring buffer. Readers (page renders) are
+served from memory and never block on I2C.
+
+The Blinka/Adafruit imports happen when the bus is first opened, so this
+module imports fine off-device.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+SAMPLE_INTERVAL = 30  # seconds between reads
+HISTORY_SIZE = 2880  # readings kept: 24 hours at the default interval
+SMOOTHING_SAMPLES = 10  # moving-average window for get_inside_temperature
+# With no reading for this many intervals the sensor counts as unavailable.
+STALE_AFTER_SAMPLES = 3
+
+
+@dataclass
+class Reading:
+    time: float  # time.time() of the read
+    fahrenheit: float
+
+
+def _open_pct2075() -> tuple[Callable[[], float], Callable[[], None]]:
+    """Open the bus once; returns ``(read_celsius, close)``."""
+    import adafruit_pct2075
+    import board
+    import busio
+
+    i2c = busio.I2C(board.SCL, board.SDA)
+    pct = adafruit_pct2075.PCT2075(i2c)
+    return (lambda: pct.temperature), i2c.deinit
+
+
+class TemperatureSensor:
+    """Background sampler with a ring buffer of recent readings.
+
+    ``opener`` returns ``(read_celsius, close)``; it defaults to the PCT2075
+    on the Pi's I2C bus and is swapped for a fake in tests. A failed read
+    closes the bus, and the next sample reopens it.
+    """
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        history: int = HISTORY_SIZE,
+        opener: Callable[[], tuple[Callable[[], float], Callable[[], None]]] = _open_pct2075,
+    ):
+        self.interval = interval
+        self._opener = opener
+        self._read: Optional[Callable[[], float]] = None
+        self._close: Optional[Callable[[], None]] = None
+        self._readings: deque[Reading] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling (idempotent); the first read happens immediately."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="temperature", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and release the I2C bus."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close_bus()
+
+    def _loop(self) -> None:
+        while True:
+            self.sample_once()
+            if self._stop.wait(self.interval):
+                return
+
+    def sample_once(self) -> Optional[Reading]:
+        """Read the sensor into the buffer; ``None`` (and logged) on failure."""
+        try:
+            if self._read is None:
+                self._read, self._close = self._opener()
+            celsius = self._read()
+        except Exception as e:
+            print(f"Error reading temperature sensor: {e}")
+            self._close_bus()
+            return None
+        reading = Reading(time.time(), round((celsius * 1.8) + 32, 2))
+        with self._lock:
+            self._readings.append(reading)
+        return reading
+
+    def _close_bus(self) -> None:
+        close, self._read, self._close = self._close, None, None
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing temperature sensor bus: {e}")
+
+    def history(self, seconds: Optional[float] = None) -> list[Reading]:
+        """Buffered readings, oldest first; only the last ``seconds`` if given."""
+        with self._lock:
+            readings = list(self._readings)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            readings = [r for r in readings if r.time >= cutoff]
+        return readings
+
+    def latest(self) -> Optional[float]:
+        with self._lock:
+            return self._readings[-1].fahrenheit if self._readings else None
+
+    def min_max(self, seconds: Optional[float] = None) -> Optional[tuple[float, float]]:
+        values = [r.fahrenheit for r in self.history(seconds)]
+        return (min(values), max(values)) if values else None
+
+    def moving_average(self, n: int = SMOOTHING_SAMPLES) -> Optional[float]:
+        """Mean of the readings from the last ``n`` intervals (at most ``n``).
+
+        ``None`` when there are none, or when the newest is more than
+        ``STALE_AFTER_SAMPLES`` intervals old (the sensor has stopped
+        answering), so a dead bus doesn't keep serving its last readings.
+        """
+        now = time.time()
+        with self._lock:
+            recent = list(self._readings)[-n:]
+        if not recent or now - recent[-1].time > self.interval * STALE_AFTER_SAMPLES:
+            return None
+        recent = [r for r in recent if now - r.time <= self.interval * n]
+        return round(sum(r.fahrenheit for r in recent) / len(recent), 2)
+
+
+_sensor: Optional[TemperatureSensor] = None
+_sensor_lock = threading.Lock()
+
+
+def get_sensor() -> TemperatureSensor:
+    """The process-wide sensor service, started on first use."""
+    global _sensor
+    with _sensor_lock:
+        if _sensor is None:
+            _sensor = TemperatureSensor()
+            _sensor.start()
+        return _sensor
+
 
 def get_inside_temperature():
     """
-    Get temperature reading from the PCT2075 temperature sensor.
-    Returns temperature in Fahrenheit.
+    Get the smoothed temperature from the PCT2075 temperature sensor.
+    Returns temperature in Fahrenheit, or None until the first successful read
+    and again once the sensor has stopped answering.
     """
-    try:
-        i2c = busio.I2C(board.SCL, board.SDA)
-        pct = adafruit_pct2075.PCT2075(i2c)
-        celsius = pct.temperature
-        fahrenheit = round((celsius * 1.8) + 32, 2)
-        return fahrenheit
-    except Exception as e:
-        print(f"Error reading temperature sensor: {e}")
-        return None
+    return get_sensor().moving_average()
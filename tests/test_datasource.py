@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+import datasource
+from datasource import DataSource
+
+
+class Feed:
+    """Fetch function returning 1, 2, 3...; can fail or block on demand."""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.gate = None  # threading.Event the fetch waits on, if set
+
+    def __call__(self):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(datasource.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    path = tmp_path / "datasource_cache.json"
+    monkeypatch.setattr(datasource, "STORE_PATH", str(path))
+    monkeypatch.setattr(datasource, "_stored", None)
+    return path
+
+
+def test_fresh_value_is_served_without_refetching(clock):
+    feed = Feed()
+    source = DataSource("feed", feed, ttl=60)
+    assert source.get(timeout=1) == 1
+    clock[0] += 30
+    assert source.get(timeout=1) == 1
+    assert feed.calls == 1
+
+
+def test_stale_value_is_served_while_refetching_in_background(clock):
+    feed = Feed()
+    source = DataSource("feed", feed, ttl=60, stale_while_revalidate=600)
+    source.get(timeout=1)
+    clock[0] += 120
+    feed.gate = threading.Event()
+    assert source.get(timeout=0) == 1  # no wait on the slow fetch
+    feed.gate.set()
+    source.poll().result(timeout=1)
+    assert source.get(timeout=0) == 2
+
+
+def test_concurrent_polls_share_one_fetch(clock):
+    feed = Feed()
+    feed.gate = threading.Event()
+    source = DataSource("feed", feed, ttl=60)
+    first = source.poll()
+    assert source.poll() is first
+    feed.gate.set()
+    first.result(timeout=1)
+    assert feed.calls == 1
+
+
+def test_expired_value_waits_for_refetch(clock):
+    feed = Feed()
+    source = DataSource("feed", feed, ttl=60, stale_while_revalidate=60)
+    source.get(timeout=1)
+    clock[0] += 300
+    assert source.get(timeout=1) == 2
+
+
+def test_failed_refetch_falls_back_within_stale_if_error(clock):
+    feed = Feed()
+    source = DataSource("feed", feed, ttl=60, stale_if_error=600)
+    source.get(timeout=1)
+    feed.error = ValueError("down")
+    clock[0] += 120
+    assert source.get(timeout=1) == 1
+    assert source.status()["last_error"] == "down"
+
+    clock[0] += 1000  # past stale_if_error -> nothing to show
+    with pytest.raises(ValueError, match="down"):
+        source.get(timeout=1)
+
+
+def test_no_value_and_failed_fetch_raises(clock):
+    feed = Feed()
+    feed.error = ValueError("down")
+    with pytest.raises(ValueError):
+        DataSource("feed", feed, ttl=60).get(timeout=1)
+
+
+def test_persisted_value_survives_restart(clock, store):
+    feed = Feed()
+    DataSource("feed", feed, ttl=60, persist=True).get(timeout=1)
+    assert store.exists()
+
+    datasource._stored = None  # a new process
+    feed.error = ValueError("offline")
+    restarted = DataSource("feed", feed, ttl=60, persist=True)
+    clock[0] += 30
+    assert restarted.get(timeout=1) == 1
+    assert restarted.age() == 30
+    assert feed.calls == 1
+
+
+def test_register_shares_sources_by_name(monkeypatch):
+    monkeypatch.setattr(datasource, "_registry", {})
+    first = datasource.register("feed", Feed(), ttl=60)
+    assert datasource.register("feed", Feed(), ttl=5) is first
+    assert datasource.get_source("feed") is first
+    assert set(datasource.status()) == {"feed"}
@@ -0,0 +1,145 @@
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ferries
+from ferries import FerryClient
+
+NAMES = {12: "Kingston", 8: "Edmonds", 3: "Bainbridge Island", 7: "Seattle"}
+
+
+def _wsdot(t):
+    return f"/Date({int(t.timestamp() * 1000)}-0700)/"
+
+
+def _day(now):
+    return [now.replace(hour=h, minute=m, second=0, microsecond=0) for h, m in [(6, 20), (7, 35), (8, 50), (10, 5), (11, 30)]]
+
+
+@pytest.fixture
+def wsdot():
+    """Local stub of the WSDOT Schedule and Terminals REST endpoints."""
+    state = {"calls": [], "flush": "/Date(1)/"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            state["calls"].append(path)
+            if path.endswith("/cacheflushdate"):
+                payload = state["flush"]
+            elif path.endswith("/terminalwaittimes"):
+                payload = [
+                    {"TerminalID": 12, "WaitTimes": [
+                        {"RouteName": "Edmonds / Kingston", "WaitTimeNotes": "Arrive 20 minutes early."},
+                    ]},
+                    {"TerminalID": 3, "WaitTimes": [
+                        {"RouteName": "Seattle / Bainbridge", "WaitTimeLastUpdated": "/Date(1)/"},
+                    ]},
+                ]
+            else:  # /schedule/scheduletoday/{dep}/{arr}/false
+                dep, arr = (int(x) for x in path.split("/")[-3:-1])
+                times = _day(datetime.now())
+                payload = {"TerminalCombos": [{
+                    "DepartingTerminalName": NAMES[dep],
+                    "ArrivingTerminalName": NAMES[arr],
+                    # duplicated and unsorted on purpose
+                    "Times": [{"DepartingTime": _wsdot(t)} for t in times[::-1] + times],
+                }]}
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    state["base"] = base
+    yield state
+    httpd.shutdown()
+
+
+def _client(wsdot, routes):
+    return FerryClient(
+        routes,
+        api_access_code="key",
+        schedule_base_url=f"{wsdot['base']}/schedule",
+        terminals_base_url=f"{wsdot['base']}/terminals",
+    )
+
+
+def _schedule_calls(wsdot):
+    return [c for c in wsdot["calls"] if "/scheduletoday/" in c]
+
+
+def test_parse_wsdot_date():
+    t = datetime(2026, 6, 10, 7, 35)
+    assert ferries.parse_wsdot_date(_wsdot(t)) == t
+    assert ferries.parse_wsdot_date("garbage") is None
+
+
+def test_next_sailings_bisects_after_now():
+    day = _day(datetime(2026, 6, 10))
+    assert ferries.next_sailings(day, day[1], 3) == day[2:5]
+    assert ferries.next_sailings(day, day[-1], 3) == []
+
+
+def test_schedule_fetched_once_per_day(wsdot):
+    client = _client(wsdot, [(12, 8)])
+    now = datetime.now().replace(hour=7, minute=0)
+    first = client.departures_today((12, 8), now)
+    assert first == sorted(set(first)) and len(first) == 5
+    assert client.next_sailings((12, 8), now + timedelta(minutes=30)) == first[1:4]
+    assert _schedule_calls(wsdot) == ["/schedule/scheduletoday/12/8/false"]
+
+
+def test_schedule_refetched_at_date_rollover(wsdot):
+    client = _client(wsdot, [(12, 8)])
+    now = datetime.now()
+    client.departures_today((12, 8), now)
+    client.departures_today((12, 8), now + timedelta(days=1))
+    assert len(_schedule_calls(wsdot)) == 2
+
+
+def test_schedule_refetched_when_wsdot_flushes(wsdot, monkeypatch):
+    client = _client(wsdot, [(12, 8)])
+    client.refresh()
+    monkeypatch.setattr(ferries, "CACHE_FLUSH_CHECK_SECONDS", 0)
+    client.refresh()  # unchanged marker
+    assert len(_schedule_calls(wsdot)) == 1
+    wsdot["flush"] = "/Date(2)/"
+    client.refresh()
+    assert len(_schedule_calls(wsdot)) == 2
+
+
+def test_routes_share_one_refresh(wsdot):
+    routes = [(12, 8), (3, 7)]
+    client = _client(wsdot, routes)
+    client.refresh()
+    assert sorted(_schedule_calls(wsdot)) == [
+        "/schedule/scheduletoday/12/8/false",
+        "/schedule/scheduletoday/3/7/false",
+    ]
+    assert wsdot["calls"].count("/terminals/terminalwaittimes") == 1
+    assert wsdot["calls"].count("/schedule/cacheflushdate") == 1
+    assert client.route_name((3, 7)) == "Bainbridge Island → Seattle"
+    # Everything after the refresh is answered from the cache
+    n = len(wsdot["calls"])
+    assert client.wait_guidance((12, 8)) == "Arrive 20 min early recommended"
+    assert client.wait_guidance((3, 7)) == "General wait guidance available"
+    client.next_sailings((3, 7))
+    assert len(wsdot["calls"]) == n
+
+
+def test_missing_access_code_raises(monkeypatch):
+    monkeypatch.delenv("WSDOT_API_ACCESS_CODE", raising=False)
+    monkeypatch.setattr(ferries, "_clients", {})
+    with pytest.raises(ValueError, match="API access code is required"):
+        ferries.get_kingston_edmonds_sailing_times()
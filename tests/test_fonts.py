@@ -0,0 +1,22 @@
+import types
+
+import fonts
+import pages.tidePage as tidePage
+
+
+def test_get_font_returns_shared_face():
+    assert fonts.get_font(22) is fonts.get_font(22)
+    assert fonts.get_font(22) is not fonts.get_font(23)
+
+
+def test_font_sizes_collects_font_size_constants():
+    module = types.SimpleNamespace(TITLE_FONT_SIZE=34, DATE_FONT_SIZE=20, WIDTH=600)
+    assert fonts.font_sizes(module) == {34, 20}
+
+
+def test_prewarm_means_renders_never_load_a_face():
+    fonts.prewarm(tidePage)
+    misses = fonts._load.cache_info().misses
+    for size in fonts.font_sizes(tidePage):
+        fonts.get_font(size)
+    assert fonts._load.cache_info().misses == misses
@@ -0,0 +1,76 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Local HTTP stub: /flaky fails with 503 once, then succeeds."""
+    monkeypatch.setattr(http_client, "BACKOFF_FACTOR", 0)
+    monkeypatch.setattr(http_client, "_sessions", {})
+    monkeypatch.setattr(http_client, "_stats", {})
+    hits = {"flaky": 0, "ports": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+        def do_GET(self):
+            hits["ports"].add(self.client_address[1])
+            status = 200
+            if self.path == "/flaky":
+                hits["flaky"] += 1
+                status = 503 if hits["flaky"] == 1 else 200
+            body = b"ok"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+
+
+def test_reuses_one_connection_per_host(server):
+    base, hits = server
+    for _ in range(3):
+        assert http_client.get(f"{base}/ok").text == "ok"
+    assert len(hits["ports"]) == 1
+    assert http_client.session_for(base.split("//")[1]) is http_client.session_for(base.split("//")[1])
+
+
+def test_retries_transient_status(server):
+    base, hits = server
+    response = http_client.get(f"{base}/flaky")
+    assert response.status_code == 200
+    assert hits["flaky"] == 2
+
+
+def test_records_per_host_latency(server):
+    base, _ = server
+    http_client.get(f"{base}/ok")
+    http_client.get(f"{base}/ok")
+    stats = http_client.latency_stats()[base.split("//")[1]]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 0
+    assert 0 < stats["max_seconds"] <= stats["total_seconds"]
+
+
+def test_applies_default_timeout(monkeypatch):
+    seen = {}
+
+    class FakeSession:
+        def request(self, method, url, **kwargs):
+            seen.update(kwargs)
+            raise RuntimeError("stop")
+    monkeypatch.setattr(http_client, "session_for", lambda host: FakeSession())
+    with pytest.raises(RuntimeError):
+        http_client.get("http://example.invalid/x")
+    assert seen["timeout"] == http_client.DEFAULT_TIMEOUT
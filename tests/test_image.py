@@ -0,0 +1,17 @@
+from colormaps import COOLWARM
+from image import get_color_from_gradient
+
+
+def test_gradient_endpoints_and_midpoint():
+    assert get_color_from_gradient(0, 0, 115) == COOLWARM[0]
+    assert get_color_from_gradient(115, 0, 115) == COOLWARM[-1]
+    assert get_color_from_gradient(50, 0, 100) == COOLWARM[127]
+
+
+def test_gradient_clamps_out_of_range_values():
+    assert get_color_from_gradient(-20, 0, 115) == COOLWARM[0]
+    assert get_color_from_gradient(130, 0, 115) == COOLWARM[-1]
+
+
+def test_gradient_accepts_other_colormaps():
+    assert get_color_from_gradient(1, 0, 1, ["#000000", "#ffffff"]) == "#ffffff"
@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import types
+
+import main
+from pages.basePage import BasePage
+from pages.lazyPage import LazyPage
+
+IMPORTS = []
+
+
+class SpecPage(BasePage):
+    refresh_rate = 7
+
+    def __init__(self):
+        IMPORTS.append(self)
+        self.loaded = 0
+
+    def load_page(self):
+        self.loaded += 1
+
+    def make_image(self, now=None):
+        return ("image", now)
+
+    def status(self):
+        return {"ok": True}
+
+    def next_change(self, now):
+        return now
+
+
+SPEC = f"{__name__}:SpecPage"
+
+
+def test_page_is_not_built_until_first_use():
+    IMPORTS.clear()
+    page = LazyPage(SPEC)
+    assert IMPORTS == []
+    assert page.status() == {"loaded": False}
+    assert page.refresh_rate == BasePage.refresh_rate
+    assert page.next_change(1) is None
+
+    assert page.make_image(now=3) == ("image", 3)
+    assert len(IMPORTS) == 1
+    assert page.refresh_rate == 7
+    assert page.status() == {"ok": True}
+    assert page.next_change(1) == 1
+
+
+def test_load_and_unload_delegate_once_built():
+    IMPORTS.clear()
+    page = LazyPage(SPEC)
+    page.unload_page()  # nothing built yet -> nothing to unload
+    assert IMPORTS == []
+    page.load_page()
+    page.load_page()
+    assert page.page_active
+    assert page.page.loaded == 2
+    assert len(IMPORTS) == 1
+
+
+def test_main_defers_page_and_heavy_imports():
+    # A fresh interpreter: this one has already imported the pages via other tests.
+    code = (
+        "import sys, main; main.build_pages(); "
+        "print(','.join(m for m in ('pages.tidePage', 'pages.weatherTravelPage', 'requests', 'gpiod', 'inky') "
+        "if m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+class FakeDriver:
+    def __init__(self, resolution=None, colour=None):
+        self.resolution = resolution
+        self.colour = colour
+
+
+def test_page_modules_defer_requests():
+    # Importing a page must not pull in requests; http_client imports it on the first fetch.
+    code = "import sys, pages.weatherTravelPage, pages.tideDashboardPage; print('requests' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_detect_display_uses_cached_driver(tmp_path, monkeypatch):
+    fake_module = types.ModuleType("fake_inky_driver")
+    fake_module.FakeDriver = FakeDriver
+    monkeypatch.setitem(sys.modules, "fake_inky_driver", fake_module)
+    cache = tmp_path / "display_cache.json"
+    cache.write_text(
+        json.dumps({"module": "fake_inky_driver", "class": "FakeDriver", "kwargs": {"resolution": [600, 448]}})
+    )
+    monkeypatch.setattr(main, "DISPLAY_CACHE_PATH", str(cache))
+
+    display = main.detect_display()
+    assert isinstance(display, FakeDriver)
+    assert display.resolution == (600, 448)  # JSON list back to the tuple the driver expects
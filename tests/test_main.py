@@ -0,0 +1,15 @@
+import time
+
+import main
+import tracing
+
+
+def test_span_dumper_prints_off_the_signalling_thread(capsys):
+    tracing.record("dump.test", 3.0)
+    main._start_span_dumper().set()  # all the SIGUSR1 handler does
+    for _ in range(100):
+        if "dump.test" in capsys.readouterr().out:
+            break
+        time.sleep(0.01)
+    else:
+        raise AssertionError("span dump never printed")
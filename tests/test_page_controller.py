@@ -1,6 +1,12 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
 import pytest
+from PIL import Image
 
-from page_controller import PageController
+import page_controller
+from page_controller import CHANGE_SLACK, PageController, Prerenderer, refresh_delay
 from pages.basePage import BasePage
 
 
@@ -103,3 +109,221 @@ def test_render_once_draws_active_page_to_display():
     assert display.shows == 1
     assert len(display.images) == 1
     assert pages["A"].rendered == 1
+
+
+def test_render_once_reuses_prerendered_frame():
+    ctrl, pages = make_controller()
+    ctrl._prerenderer.render_due()  # worker pass: renders every page once
+    assert pages["A"].rendered == 1
+    assert pages["B"].rendered == 1
+    display = FakeDisplay()
+    ctrl.request("B")
+    ctrl._apply_request()
+    ctrl.render_once(display)
+    assert pages["B"].rendered == 1  # handed the cached frame, no new render
+    assert display.shows == 1
+
+
+def test_prerender_skips_pages_that_are_not_due():
+    ctrl, pages = make_controller()
+    ctrl._prerenderer.render_due()
+    delay = ctrl._prerenderer.render_due()
+    assert pages["A"].rendered == 1
+    assert 0 < delay <= FakePage.refresh_rate
+
+
+def test_prerender_wakes_loop_only_for_active_page():
+    ctrl, pages = make_controller()
+    ctrl._on_frame("B", object())
+    assert not ctrl._wake.is_set()
+    ctrl._on_frame("A", object())
+    assert ctrl._wake.is_set()
+
+
+def test_request_same_page_drops_prerendered_frame():
+    ctrl, pages = make_controller()
+    ctrl._prerenderer.render_due()
+    ctrl.request("A")
+    ctrl._apply_request()
+    ctrl.render_once(FakeDisplay())
+    assert pages["A"].rendered == 2  # forced refresh renders fresh data
+
+
+def test_invalidate_wakes_prerender_worker():
+    page = FakePage("A")
+    page.refresh_rate = 900  # the worker would otherwise sleep for 15 minutes
+    prerenderer = Prerenderer({"A": page})
+    prerenderer.start()
+    deadline = time.monotonic() + 2
+    while "A" not in prerenderer._frames and time.monotonic() < deadline:
+        time.sleep(0.01)
+    prerenderer.invalidate("A")
+    while page.rendered < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert page.rendered == 2
+
+
+class ChangingPage(FakePage):
+    refresh_rate = 900
+    min_refresh_rate = 60
+
+    def __init__(self, change):
+        super().__init__("changing")
+        self.change = change
+
+    def next_change(self, now):
+        if isinstance(self.change, Exception):
+            raise self.change
+        return None if self.change is None else now + timedelta(seconds=self.change)
+
+
+def test_refresh_delay_follows_next_change_within_bounds():
+    now = datetime(2026, 6, 10, 12, 0)
+    assert refresh_delay(ChangingPage(300), now) == 300 + CHANGE_SLACK
+    assert refresh_delay(ChangingPage(5), now) == 60  # min_refresh_rate
+    assert refresh_delay(ChangingPage(5000), now) == 900  # refresh_rate
+    assert refresh_delay(ChangingPage(None), now) == 900
+    assert refresh_delay(ChangingPage(RuntimeError("bad")), now) == 900
+
+
+def test_prerender_schedules_next_render_at_page_change():
+    page = ChangingPage(300)
+    prerenderer = Prerenderer({"A": page})
+    delay = prerenderer.render_due()
+    assert 299 < delay <= 300 + CHANGE_SLACK
+
+
+def test_prerender_failure_keeps_other_pages_rendering():
+    ctrl, pages = make_controller()
+
+    def boom():
+        raise RuntimeError("network down")
+    pages["A"].make_image = boom
+    ctrl._prerenderer.render_due()
+    assert pages["B"].rendered == 1
+
+
+class ImagePage(FakePage):
+    """Renders a real image whose colour is settable, so frames can repeat."""
+
+    def __init__(self, name, color=(255, 255, 255)):
+        super().__init__(name)
+        self.color = color
+
+    def make_image(self):
+        self.rendered += 1
+        return Image.new("RGB", (8, 8), self.color)
+
+
+class BufferDisplay(FakeDisplay):
+    """Mimics Inky: set_image quantizes into ``buf`` (here: to black/white)."""
+
+    def set_image(self, image):
+        super().set_image(image)
+        self.buf = image.convert("1")
+
+
+def _image_controller():
+    pages = {"A": ImagePage("A"), "B": ImagePage("B")}
+    return PageController(pages, start_key="A"), pages
+
+
+def test_identical_frame_skips_show():
+    ctrl, pages = _image_controller()
+    display = FakeDisplay()
+    ctrl.render_once(display)
+    ctrl.request("A")  # forced re-render of an unchanged page
+    ctrl._apply_request()
+    ctrl.render_once(display)
+    assert pages["A"].rendered == 2
+    assert display.shows == 1
+    assert ctrl.refreshes == 1
+    assert ctrl.skipped_refreshes == 1
+
+
+def test_changed_frame_is_shown():
+    ctrl, pages = _image_controller()
+    display = FakeDisplay()
+    ctrl.render_once(display)
+    pages["A"].color = (0, 0, 0)
+    ctrl.request("A")
+    ctrl._apply_request()
+    ctrl.render_once(display)
+    assert display.shows == 2
+    assert ctrl.skipped_refreshes == 0
+
+
+def test_frames_equal_after_quantization_skip_show():
+    ctrl, pages = _image_controller()
+    display = BufferDisplay()
+    ctrl.render_once(display)
+    pages["A"].color = (250, 250, 250)  # different RGB, same quantized buffer
+    ctrl.request("A")
+    ctrl._apply_request()
+    ctrl.render_once(display)
+    assert display.shows == 1
+    assert ctrl.skipped_refreshes == 1
+
+
+def test_burst_of_presses_settles_into_one_request(monkeypatch):
+    monkeypatch.setattr(page_controller, "SETTLE_SECONDS", 0.02)
+    pages = {k: FakePage(k) for k in "ABC"}
+    ctrl = PageController(pages, start_key="A")
+    ctrl.cycle()  # first tap wakes the loop...
+
+    def more_taps():
+        for _ in range(2):
+            time.sleep(0.005)
+            ctrl.cycle()
+
+    tapper = threading.Thread(target=more_taps)
+    tapper.start()
+    ctrl._settle()  # ...which waits out the rest of the burst
+    tapper.join()
+    ctrl._apply_request()
+    display = FakeDisplay()
+    ctrl.render_once(display)
+    assert ctrl.current_key == "A"  # A -> B -> C -> A
+    assert display.shows == 1
+    assert pages["B"].rendered == 0 and pages["C"].rendered == 0
+
+
+def test_request_during_render_skips_show():
+    ctrl, pages = make_controller()
+
+    class NavigatingDisplay(FakeDisplay):
+        def set_image(self, image):
+            super().set_image(image)
+            ctrl.request("B")  # pressed while the frame was being prepared
+
+    display = NavigatingDisplay()
+    ctrl.render_once(display)
+    assert display.shows == 0
+    assert ctrl.preempted == 1
+    assert ctrl._wake.is_set()  # the loop goes straight on to page B
+
+
+def test_request_preempts_slow_cache_miss_render():
+    ctrl, pages = make_controller()
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_render():
+        started.set()
+        release.wait(5)
+        pages["A"].rendered += 1
+        return object()
+
+    pages["A"].make_image = slow_render
+    display = FakeDisplay()
+    renderer = threading.Thread(target=ctrl.render_once, args=(display,))
+    renderer.start()
+    assert started.wait(5)
+    ctrl.request("B")
+    renderer.join(5)
+    assert not renderer.is_alive()  # gave up without waiting for the render
+    assert display.shows == 0 and ctrl.preempted == 1
+
+    release.set()  # the abandoned render still completes and is cached
+    ctrl._prerenderer.frame_async("A").result(timeout=5)
+    assert pages["A"].rendered == 1
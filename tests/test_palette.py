@@ -0,0 +1,79 @@
+import pytest
+from PIL import Image
+
+import palette
+from page_controller import PageController
+from pages.basePage import BasePage
+
+np = pytest.importorskip("numpy")
+
+
+def _indices(image):
+    return np.asarray(image)
+
+
+def test_panel_colours_map_to_their_own_index():
+    strip = Image.new("RGB", (7, 1))
+    strip.putdata(list(palette.colors()))
+    out = palette.quantize(strip)
+    assert out.mode == "P"
+    assert list(_indices(out)[0]) == list(range(7))
+
+
+def test_pure_colours_snap_to_nearest_panel_colour():
+    strip = Image.new("RGB", (4, 1))
+    strip.putdata([(0, 0, 0), (255, 255, 255), (0, 0, 255), (255, 0, 0)])
+    assert list(_indices(palette.quantize(strip))[0]) == [0, 1, 3, 4]
+
+
+def test_dithered_gray_is_a_black_white_mix():
+    out = _indices(palette.quantize(Image.new("RGB", (16, 16), (200, 200, 200)), dither=True))
+    values, counts = np.unique(out, return_counts=True)
+    assert set(values) == {0, 1}  # no colour cast
+    black = counts[list(values).index(0)] / out.size
+    assert 0.15 < black < 0.35  # ~(255 - 200) / (255 - 28)
+
+
+def test_flat_panel_colour_is_not_dithered():
+    out = _indices(palette.quantize(Image.new("RGB", (16, 16), (0, 0, 255)), dither=True))
+    assert set(np.unique(out)) == {3}
+
+
+def test_quantize_is_deterministic_and_keeps_p_frames():
+    image = Image.new("RGBA", (32, 32), (120, 140, 200, 255))
+    first = palette.quantize(image, dither=True)
+    assert first.tobytes() == palette.quantize(image, dither=True).tobytes()
+    assert palette.quantize(first) is first
+
+
+def test_palette_matches_driver_blend():
+    # inky_uc8159._palette_blend(0.5), e.g. red: int(156 * .5 + 255 * .5)
+    assert palette.colors()[4] == (205, 36, 37)
+    flat = palette._flat_palette(palette.SATURATION)
+    assert flat[21:24] == [255, 255, 255] and len(flat) == 768
+
+
+def test_fallback_without_numpy(monkeypatch):
+    monkeypatch.setattr(palette, "np", None)
+    out = palette.quantize(Image.new("RGB", (4, 4), (0, 0, 250)))
+    assert out.mode == "P"
+    assert set(out.tobytes()) == {3}
+
+
+class ColorPage(BasePage):
+    refresh_rate = 60
+
+    def load_page(self):
+        self.page_active = True
+
+    def make_image(self):
+        return Image.new("RGBA", (8, 8), (200, 200, 200, 255))
+
+
+def test_controller_caches_quantized_frames():
+    ctrl = PageController(
+        {"A": ColorPage()}, start_key="A", postprocess=lambda im: palette.quantize(im, dither=True)
+    )
+    frame = ctrl._prerenderer.frame("A")
+    assert frame.mode == "P"
+    assert ctrl._prerenderer.frame("A") is frame
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from offline import offline_pages
+from pages.tidePage import TidePage
+from pages.weatherTravelPage import WeatherTravelPage
+from preview import (
+    discover_pages,
+    load_page_class,
+    render_batch,
+    write_contact_sheet,
+    write_gif,
+)
+
+
+def test_load_page_class():
+    assert load_page_class("pages.tidePage:TidePage") is TidePage
+
+
+def test_discover_pages_finds_every_page():
+    found = discover_pages()
+    assert TidePage in found and WeatherTravelPage in found
+    assert all(cls.__name__ != "BasePage" for cls in found)
+
+
+def test_every_page_renders_offline(tmp_path):
+    with offline_pages(str(tmp_path)):
+        for page_cls in discover_pages():
+            image = page_cls().make_image(now=datetime(2026, 6, 10, 12, 0))
+            assert image.size == (600, 448)
+
+
+def test_batch_renders_every_time_in_order(tmp_path):
+    times = [datetime(2026, 6, 10, 0, 0) + timedelta(minutes=30 * i) for i in range(5)]
+    paths = render_batch("pages.tidePage:TidePage", times, str(tmp_path), workers=2, offline=True)
+    assert [p.rsplit("_", 1)[1] for p in paths] == [f"{t:%Y%m%d-%H%M}.png" for t in times]
+
+    write_gif(paths, str(tmp_path / "tide.gif"))
+    assert Image.open(tmp_path / "tide.gif").n_frames == len(times)
+    write_contact_sheet(paths, times, str(tmp_path / "sheet.png"), columns=3)
+    assert Image.open(tmp_path / "sheet.png").width == 3 * 600 // 4
+
+
+def test_live_batch_keeps_page_caches_out_of_the_tree(tmp_path, monkeypatch):
+    import pages.tidePage as tp
+    from offline import FAKE_MODEL
+
+    device_cache = tmp_path / "tide_cache.json"
+    monkeypatch.setattr(tp, "CACHE_PATH", str(device_cache))
+    monkeypatch.setattr(tp, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+    times = [datetime(2026, 6, 10, 0, 0) + timedelta(hours=i) for i in range(3)]
+    paths = render_batch("pages.tidePage:TidePage", times, str(tmp_path / "frames"), workers=2)
+    assert len(paths) == 3
+    assert not device_cache.exists()
+    assert tp.CACHE_PATH == str(device_cache)
@@ -0,0 +1,125 @@
+import urllib.error
+import urllib.request
+
+import pytest
+from PIL import Image
+
+import http_client
+from pages.basePage import BasePage
+from page_controller import PageController
+from pages.remotePage import RemotePage
+from render_server import RenderServer, encode_frame, etag_matches
+
+
+class ColorPage(BasePage):
+    refresh_rate = 3600
+
+    def __init__(self, color):
+        self.color = color
+        self.rendered = 0
+
+    def load_page(self):
+        self.page_active = True
+
+    def make_image(self):
+        self.rendered += 1
+        return Image.new("RGB", (8, 8), self.color)
+
+
+class FakeDisplay:
+    def __init__(self):
+        self.images = []
+
+    def set_image(self, image):
+        self.images.append(image)
+
+    def show(self):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = RenderServer({"Red": ColorPage("red"), "Blue": ColorPage("blue")}, port=0, host="127.0.0.1")
+    srv.start()
+    yield srv
+    srv.stop()
+
+
+def _url(srv, path):
+    return f"http://127.0.0.1:{srv.port}{path}"
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+
+
+def test_serves_png_with_etag_and_304(server):
+    with urllib.request.urlopen(_url(server, "/pages/Red.png"), timeout=5) as resp:
+        etag = resp.headers["ETag"]
+        assert resp.headers["Content-Type"] == "image/png"
+        assert resp.read() == encode_frame(Image.new("RGB", (8, 8), "red"))[1]
+    req = urllib.request.Request(_url(server, "/pages/Red.png"), headers={"If-None-Match": etag})
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(req, timeout=5)
+    assert e.value.code == 304
+
+
+def test_unknown_page_is_404(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(_url(server, "/pages/Green.png"), timeout=5)
+    assert e.value.code == 404
+
+
+def test_many_clients_share_one_render(server):
+    clients = [RemotePage(_url(server, ""), "Red") for _ in range(5)]
+    images = [c.make_image() for c in clients]
+    assert all(img.getpixel((0, 0)) == (255, 0, 0) for img in images)
+    assert server.pages["Red"].rendered == 1
+
+
+def test_remote_page_reuses_frame_on_304(server):
+    client = RemotePage(_url(server, ""), "Blue")
+    first = client.make_image()
+    assert client.make_image() is first  # unchanged -> same object, show() skipped
+
+
+def test_remote_page_picks_up_new_frame(server):
+    client = RemotePage(_url(server, ""), "Blue")
+    first = client.make_image()
+    server.pages["Blue"].color = "red"
+    server.prerenderer.invalidate("Blue")
+    server._on_frame("Blue", server.prerenderer.frame("Blue"))
+    second = client.make_image()
+    assert second is not first and second.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_remote_page_keeps_last_frame_when_server_unreachable(server, monkeypatch):
+    client = RemotePage(_url(server, ""), "Red")
+    first = client.make_image()
+
+    def down(*a, **k):
+        raise ConnectionError("server down")
+    monkeypatch.setattr(http_client, "get", down)
+    assert client.make_image() is first
+
+
+def test_remote_page_boots_while_server_is_down(server, monkeypatch):
+    real_get = http_client.get
+
+    def down(*a, **k):
+        raise ConnectionError("server down")
+    monkeypatch.setattr(http_client, "get", down)
+    client = RemotePage(_url(server, ""), "Red")
+    controller = PageController({"A": client}, start_key="A")
+    display = FakeDisplay()
+    controller.render_once(display)  # a notice, not an exception
+    notice = display.images[-1]
+    assert notice.size == (600, 448)
+
+    monkeypatch.setattr(http_client, "get", real_get)  # server comes up
+    frame = client.make_image()
+    assert frame.size == (8, 8) and frame.convert("RGB").getpixel((0, 0)) == (255, 0, 0)
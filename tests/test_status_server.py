@@ -0,0 +1,89 @@
+import json
+import urllib.error
+import urllib.request
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from page_controller import PageController
+from pages.basePage import BasePage
+from status_server import StatusServer
+
+
+class ColorPage(BasePage):
+    refresh_rate = 60
+
+    def __init__(self, color):
+        self.color = color
+
+    def load_page(self):
+        self.page_active = True
+
+    def make_image(self):
+        return Image.new("RGB", (8, 8), self.color)
+
+    def status(self):
+        return {"data_age_seconds": 5}
+
+
+class FakeDisplay:
+    def set_image(self, image):
+        pass
+
+    def show(self):
+        pass
+
+
+@pytest.fixture
+def server():
+    controller = PageController({"A": ColorPage("red"), "B": ColorPage("blue")}, start_key="A")
+    srv = StatusServer(controller, port=0, host="127.0.0.1")
+    srv.start()
+    yield srv
+    srv.stop()
+
+
+def _get(srv, path):
+    return urllib.request.urlopen(f"http://127.0.0.1:{srv.port}{path}", timeout=5)
+
+
+def test_frame_unavailable_before_first_show(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(server, "/frame.png")
+    assert e.value.code == 503
+
+
+def test_serves_shown_frame_as_png(server):
+    server.controller.render_once(FakeDisplay())
+    with _get(server, "/frame.png") as resp:
+        assert resp.headers["Content-Type"] == "image/png"
+        image = Image.open(BytesIO(resp.read()))
+    assert image.getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_png_encoded_once_per_frame(server):
+    server.controller.render_once(FakeDisplay())
+    assert server.frame_png() is server.frame_png()
+
+
+def test_status_reports_pages_and_counts(server):
+    ctrl = server.controller
+    ctrl.render_once(FakeDisplay())
+    ctrl.render_once(FakeDisplay())  # same frame -> skipped, served from cache
+    with _get(server, "/status") as resp:
+        status = json.load(resp)
+    assert status["current"] == "A"
+    assert status["refreshes"] == 1 and status["skipped_refreshes"] == 1
+    a = status["pages"]["A"]
+    assert a["page"] == "ColorPage"
+    assert a["renders"] == 1 and a["misses"] == 1 and a["hits"] == 1
+    assert a["data_age_seconds"] == 5
+    assert status["pages"]["B"]["renders"] == 0
+    assert "spans" in status and "hosts" in status and "sources" in status
+
+
+def test_unknown_path_is_404(server):
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(server, "/nope")
+    assert e.value.code == 404
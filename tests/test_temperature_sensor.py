@@ -0,0 +1,100 @@
+import pytest
+
+import temperature_sensor
+from temperature_sensor import STALE_AFTER_SAMPLES, TemperatureSensor
+
+
+class FakeBus:
+    """Stands in for the I2C bus + PCT2075: scripted Celsius readings."""
+
+    def __init__(self, readings):
+        self.readings = list(readings)
+        self.opened = 0
+        self.closed = 0
+
+    def open(self):
+        self.opened += 1
+        return self.read, self.close
+
+    def read(self):
+        value = self.readings.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def close(self):
+        self.closed += 1
+
+
+def test_bus_opened_once_across_samples():
+    bus = FakeBus([20.0, 21.0, 22.0])
+    sensor = TemperatureSensor(opener=bus.open)
+    for _ in range(3):
+        sensor.sample_once()
+    assert bus.opened == 1
+    assert sensor.latest() == pytest.approx(71.6)
+
+
+def test_smoothed_readings():
+    bus = FakeBus([20.0, 22.0, 24.0])
+    sensor = TemperatureSensor(opener=bus.open)
+    for _ in range(3):
+        sensor.sample_once()
+    assert sensor.min_max() == (68.0, 75.2)
+    assert sensor.moving_average(2) == pytest.approx((71.6 + 75.2) / 2)
+    assert [r.fahrenheit for r in sensor.history()] == [68.0, 71.6, 75.2]
+
+
+def test_average_expires_when_sensor_stops_answering(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(temperature_sensor.time, "time", lambda: now[0])
+    bus = FakeBus([20.0, 20.0, 30.0])
+    sensor = TemperatureSensor(interval=30, opener=bus.open)
+    for _ in range(2):
+        sensor.sample_once()
+        now[0] += 30
+    now[0] += 30 * 10  # a gap: the two 68.0 readings fall out of the window
+    sensor.sample_once()
+    assert sensor.moving_average(10) == 86.0
+
+    # The bus dies: once the newest reading is stale there is no average.
+    now[0] += 30 * STALE_AFTER_SAMPLES
+    assert sensor.moving_average(10) == 86.0
+    now[0] += 1
+    assert sensor.moving_average(10) is None
+
+
+def test_ring_buffer_is_bounded():
+    bus = FakeBus([float(c) for c in range(10)])
+    sensor = TemperatureSensor(history=4, opener=bus.open)
+    for _ in range(10):
+        sensor.sample_once()
+    assert len(sensor.history()) == 4
+
+
+def test_failed_read_closes_bus_and_reopens():
+    bus = FakeBus([20.0, OSError("I2C NACK"), 21.0])
+    sensor = TemperatureSensor(opener=bus.open)
+    sensor.sample_once()
+    assert sensor.sample_once() is None
+    assert bus.closed == 1
+    sensor.sample_once()
+    assert bus.opened == 2
+    assert len(sensor.history()) == 2
+
+
+def test_no_readings_yet():
+    sensor = TemperatureSensor(opener=FakeBus([]).open)
+    assert sensor.latest() is None
+    assert sensor.moving_average() is None
+    assert sensor.min_max() is None
+
+
+def test_background_thread_samples_and_stop_releases_bus():
+    bus = FakeBus([20.0] * 1000)
+    sensor = TemperatureSensor(interval=0.01, opener=bus.open)
+    sensor.start()
+    while len(sensor.history()) < 3:
+        pass
+    sensor.stop()
+    assert bus.closed == 1
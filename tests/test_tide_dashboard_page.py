@@ -0,0 +1,142 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from offline import FAKE_MODEL, extremes_around
+import pages.tideDashboardPage as dash
+import pages.tidePage as tp
+from pages.tideDashboardPage import STATIONS, TideDashboardPage, panel_bounds
+
+
+@pytest.fixture(autouse=True)
+def _isolate_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(tp, "STORE_PATH", str(tmp_path / "tide_store.json"))
+
+
+NOW = datetime(2026, 6, 10, 12, 0)
+
+
+def test_renders_every_station_concurrently(monkeypatch):
+    arrived = threading.Barrier(len(STATIONS), timeout=5)
+
+    def load(station_id):
+        arrived.wait()  # only passes if every station loads at once
+        return FAKE_MODEL
+
+    monkeypatch.setattr(dash, "load_harmonic_model", load)
+    page = TideDashboardPage()
+    img = page.make_image(now=NOW)
+    assert img.size == (tp.WIDTH, tp.HEIGHT)
+    assert set(page._extremes) == {station_id for station_id, _ in STATIONS}
+    assert page.status()["stations"]["9447130"]["source"] == "harmonics"
+
+
+def test_failed_station_keeps_last_good_and_others_render(monkeypatch):
+    monkeypatch.setattr(dash, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+    page = TideDashboardPage()
+    page.make_image(now=NOW)
+    before = page._extremes["9447130"]
+
+    def flaky(station_id, now):
+        if station_id == "9447130":
+            raise RuntimeError("network down")
+        return extremes_around(now)
+
+    monkeypatch.setattr(page, "_predict", flaky)
+    page.make_image(now=NOW + timedelta(hours=1))
+    assert page._extremes["9447130"] is before
+    assert page._extremes["9444900"] == extremes_around(NOW + timedelta(hours=1))
+
+
+def test_falls_back_to_shared_tide_store(monkeypatch):
+    def unavailable(station_id):
+        raise RuntimeError("no harmonics offline")
+
+    fetched = []
+
+    def fetch(station_id, begin, end):
+        fetched.append(station_id)
+        return extremes_around(NOW)
+
+    monkeypatch.setattr(dash, "load_harmonic_model", unavailable)
+    monkeypatch.setattr(dash, "fetch_tide_extremes", fetch)
+    page = TideDashboardPage()
+    page.make_image(now=NOW)
+    page.make_image(now=NOW + timedelta(minutes=15))  # same days: served from the store
+    assert sorted(fetched) == sorted(station_id for station_id, _ in STATIONS)
+    assert page._store is tp.shared_store(tp.STORE_PATH)
+
+
+def test_next_change_is_next_now_line_step(monkeypatch):
+    monkeypatch.setattr(dash, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+    page = TideDashboardPage()
+    assert page.next_change(NOW) is None
+    page.make_image(now=NOW)
+    assert NOW < page.next_change(NOW) <= NOW + timedelta(minutes=15)
+
+
+def test_window_is_anchored_to_the_hour_like_tide_page(monkeypatch):
+    monkeypatch.setattr(dash, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+    page = TideDashboardPage()
+    page.make_image(now=NOW + timedelta(minutes=5))
+    page.make_image(now=NOW + timedelta(minutes=50))  # refreshes fine, same hour
+    assert page._anchor == NOW
+
+
+def test_panels_stack_without_overlap():
+    bounds = [panel_bounds(i) for i in range(len(STATIONS))]
+    assert all(top < bottom for top, bottom in bounds)
+    assert all(a[1] < b[0] for a, b in zip(bounds, bounds[1:]))
+    assert bounds[-1][1] <= tp.HEIGHT
+
+
+def _blue_rows(img, y0, y1):
+    px = img.load()
+    return {
+        y for y in range(int(y0), int(y1)) for x in range(tp.CHART_LEFT, tp.CHART_RIGHT) if px[x, y][:3] == (0, 0, 255)
+    }
+
+
+def test_high_station_stays_inside_its_panel(monkeypatch):
+    def tall(station_id, now):
+        base = now - timedelta(days=2)
+        return [
+            tp.Extreme(base + timedelta(hours=6 * i), 12.4 if i % 2 == 0 else -2.5, "H" if i % 2 == 0 else "L")
+            for i in range(20)
+        ]
+
+    page = TideDashboardPage()
+    monkeypatch.setattr(page, "_predict", tall)
+    img = page.make_image(now=NOW)
+    assert max(ex.value for ex in page._extremes["9447130"]) > tp.SCALE_MAX_FT
+    for index in range(len(STATIONS)):
+        top, bottom = panel_bounds(index)
+        assert not _blue_rows(img, top - dash.PANEL_LABEL_H, top)  # label row is clear
+        rows = _blue_rows(img, top, bottom + 2)
+        assert min(rows) <= top + 6 and max(rows) >= bottom - 6  # the range fills the panel
+
+
+def test_panel_scale_pads_station_range():
+    curve = [(NOW, 1.0), (NOW + timedelta(hours=1), 12.0)]
+    assert dash.panel_scale(curve) == (1.0 - dash.SCALE_PAD_FT, 12.0 + dash.SCALE_PAD_FT)
+    assert dash.panel_scale([]) == (tp.SCALE_MIN_FT, tp.SCALE_MAX_FT)
+
+
+def test_outage_keeps_the_last_good_window(monkeypatch):
+    monkeypatch.setattr(dash, "load_harmonic_model", lambda station_id: FAKE_MODEL)
+    page = TideDashboardPage()
+    page.make_image(now=NOW)
+
+    def down(station_id, now):
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(page, "_predict", down)
+    later = NOW + timedelta(hours=3)
+    page.make_image(now=later)
+    assert page._anchor == NOW
+    # Stepping continues from the frozen window rather than re-anchoring at `later`.
+    assert page.next_change(later) == tp.next_chart_change(
+        later, NOW - timedelta(hours=tp.PAST_HOURS), NOW + timedelta(hours=tp.FUTURE_HOURS),
+        [ex for station in page._extremes.values() for ex in station],
+    )
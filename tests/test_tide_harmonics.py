@@ -0,0 +1,140 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import tide_harmonics as th
+from tide_harmonics import Constituent, HarmonicModel, SubordinateOffsets
+from tides import Extreme
+
+# NOAA's published speeds (deg/hour) for a sample of its 37 constituents.
+NOAA_SPEEDS = {
+    "M2": 28.9841042, "S2": 30.0, "N2": 28.4397295, "K1": 15.0410686,
+    "O1": 13.9430356, "P1": 14.9589314, "K2": 30.0821373, "Q1": 13.3986609,
+    "M4": 57.9682084, "MK3": 44.0251729, "2MK3": 42.9271398, "L2": 29.5284789,
+    "MF": 1.0980331, "SA": 0.0410686,
+}
+
+
+def _utc(t):
+    return t.astimezone(timezone.utc)
+
+
+@pytest.mark.parametrize("name", sorted(NOAA_SPEEDS))
+def test_v_coefficients_match_noaa_speeds(name):
+    assert th.coefficient_speed(name) == pytest.approx(NOAA_SPEEDS[name], abs=2e-6)
+
+
+def test_s2_alone_peaks_at_midnight_and_noon_utc():
+    model = HarmonicModel([Constituent("S2", 1.0, 0.0, 30.0)], datum_offset=5.0)
+    start = datetime(2026, 6, 10, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    highs = [e for e in model.extremes(start, start + timedelta(hours=23)) if e.kind == "H"]
+    assert [_utc(e.time).hour for e in highs] == [0, 12]
+    assert all(e.value == pytest.approx(6.0) for e in highs)
+
+
+def test_m2_extremes_alternate_half_a_period_apart():
+    model = HarmonicModel([Constituent("M2", 3.0, 120.0, 28.9841042)], datum_offset=4.0)
+    start = datetime(2026, 6, 10)
+    ex = model.extremes(start, start + timedelta(days=2))
+    kinds = [e.kind for e in ex]
+    assert all(a != b for a, b in zip(kinds, kinds[1:]))
+    gaps = [(b.time - a.time).total_seconds() / 3600 for a, b in zip(ex, ex[1:])]
+    assert all(abs(g - 6.21) < 0.05 for g in gaps)
+    # M2's node factor stays within a few percent of 1
+    assert all(abs(abs(e.value - 4.0) - 3.0) < 0.15 for e in ex)
+
+
+def test_heights_match_between_numpy_and_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    model = HarmonicModel(
+        [Constituent("M2", 3.0, 120.0, 28.9841042), Constituent("K1", 2.0, 40.0, 15.0410686)],
+        datum_offset=4.0,
+    )
+    times = [datetime(2026, 6, 10) + timedelta(minutes=37 * i) for i in range(100)]
+    fast = model.heights(times)
+    monkeypatch.setattr(th, "np", None)
+    assert fast == pytest.approx(model.heights(times))
+
+
+def test_subordinate_offsets_shift_highs_and_lows():
+    offsets = SubordinateOffsets("9444900", 13, 27, 0.9, 1.1, ratio=True)
+    t = datetime(2026, 6, 10, 6, 0)
+    assert offsets.apply(Extreme(t, 8.0, "H")) == Extreme(t + timedelta(minutes=13), 7.2, "H")
+    assert offsets.apply(Extreme(t, -1.0, "L")).time == t + timedelta(minutes=27)
+    additive = SubordinateOffsets("9444900", 0, 0, 0.5, -0.2, ratio=False)
+    assert additive.apply(Extreme(t, 8.0, "H")).value == pytest.approx(8.5)
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+def _fake_mdapi(monkeypatch):
+    payloads = {
+        "9444971/harcon.json": {"HarmonicConstituents": []},
+        "9444971/tidepredoffsets.json": {
+            "refStationId": "9444900", "heightAdjustedType": "R",
+            "timeOffsetHighTide": 13, "timeOffsetLowTide": 27,
+            "heightOffsetHighTide": 0.98, "heightOffsetLowTide": 1.0,
+        },
+        "9444900/harcon.json": {"HarmonicConstituents": [
+            {"name": "M2", "amplitude": 2.9, "phase_GMT": 120.0, "speed": 28.9841042},
+        ]},
+        "9444900/datums.json": {"datums": [
+            {"name": "MLLW", "value": 1.0}, {"name": "MSL", "value": 5.1},
+        ]},
+    }
+    calls = []
+
+    def fake_get(url, params=None, timeout=0):
+        key = url.split("/stations/")[1]
+        calls.append(key)
+        return _FakeResponse(payloads[key])
+    monkeypatch.setattr(th.http_client, "get", fake_get)
+    return calls
+
+
+def test_fetch_subordinate_station_uses_reference_constants(monkeypatch):
+    _fake_mdapi(monkeypatch)
+    model = th.fetch_harmonic_model("9444971")
+    assert [c.name for c in model.constituents] == ["M2"]
+    assert model.datum_offset == pytest.approx(4.1)
+    assert model.offsets.reference_id == "9444900"
+    assert model.offsets.ratio
+
+
+def test_load_caches_model_on_disk(monkeypatch, tmp_path):
+    calls = _fake_mdapi(monkeypatch)
+    path = str(tmp_path / "harmonics.json")
+    first = th.load_harmonic_model("9444971", path)
+    n = len(calls)
+    second = th.load_harmonic_model("9444971", path)
+    assert len(calls) == n  # served from the cache file, no network
+    assert second.to_dict() == first.to_dict()
+    assert "9444971" in json.load(open(path))
+
+
+def test_concurrent_loads_keep_every_station_in_the_cache(monkeypatch, tmp_path):
+    model = HarmonicModel([Constituent("M2", 1.0, 0.0, 28.9841042)], 0.0)
+    arrived = threading.Barrier(3, timeout=5)
+
+    def fetch(station_id):
+        arrived.wait()  # all three downloads in flight at once
+        return model
+
+    monkeypatch.setattr(th, "fetch_harmonic_model", fetch)
+    path = str(tmp_path / "harmonics.json")
+    stations = ["9444900", "9447130", "9444971"]
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(lambda s: th.load_harmonic_model(s, path), stations))
+    assert sorted(json.load(open(path))) == sorted(stations)
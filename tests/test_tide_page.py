@@ -36,7 +36,7 @@ def test_format_compact_time():
 from datetime import datetime as _dt, timedelta as _td
 from pages.tidePage import TidePage, WIDTH, HEIGHT
 import pages.tidePage as tp
-import tides
+from offline import extremes_around as _extremes_around
 
 
 @pytest.fixture(autouse=True)
@@ -44,18 +44,16 @@ def _isolate_cache(tmp_path, monkeypatch):
     # Each test gets its own cache file so the disk-backed last-good state never
     # leaks between tests (or into the repo).
     monkeypatch.setattr(tp, "CACHE_PATH", str(tmp_path / "tide_cache.json"))
+    monkeypatch.setattr(tp, "STORE_PATH", str(tmp_path / "tide_store.json"))
 
 
-def _extremes_around(anchor):
-    # 10 days of synthetic extremes bracketing any 48h window around ``anchor``
-    base = anchor - _td(days=2)
-    vals = [8.5, 1.0, 9.0, 0.5]
-    out = []
-    t = base
-    for i in range(40):
-        out.append(tides.Extreme(t, vals[i % 4], "H" if i % 2 == 0 else "L"))
-        t += _td(hours=6)
-    return out
+@pytest.fixture(autouse=True)
+def _no_harmonics(monkeypatch):
+    # Exercise the datagetter path (faked per test) rather than downloading
+    # harmonic constants; the harmonic path has its own test below.
+    def unavailable(station_id):
+        raise RuntimeError("no harmonics offline")
+    monkeypatch.setattr(tp, "load_harmonic_model", unavailable)
 
 
 def _fake_window_extremes():
@@ -153,3 +151,110 @@ def test_make_image_uses_red_now_line_and_blue_curve(monkeypatch):
     assert (255, 0, 0) in colors      # red "now" accent is drawn
     assert (0, 0, 255) in colors      # blue tide curve is drawn
     assert (0, 160, 0) not in colors  # old green now-line is gone
+
+
+def test_frozen_rerender_reuses_static_layer(monkeypatch):
+    page = TidePage()
+    t0 = _dt(2026, 6, 10, 12, 0)
+    monkeypatch.setattr(tp, "fetch_tide_extremes", lambda *a, **k: _extremes_around(t0))
+    calls = []
+    real_sample = tp.sample_curve
+    monkeypatch.setattr(tp, "sample_curve", lambda *a: calls.append(1) or real_sample(*a))
+    page.make_image(now=t0)
+
+    def boom(*a, **k):
+        raise RuntimeError("network down")
+    monkeypatch.setattr(tp, "fetch_tide_extremes", boom)
+    first = page.make_image(now=t0 + _td(days=1))
+    second = page.make_image(now=t0 + _td(days=1, hours=6))
+    assert len(calls) == 1                # curve drawn once, then reused
+    assert first is not page._base        # renders draw on a copy...
+    assert _max_red_x(second) > _max_red_x(first)  # ...so the now-line moves
+
+
+def test_renders_within_the_hour_reuse_static_layer(monkeypatch):
+    page = TidePage()
+    t0 = _dt(2026, 6, 10, 12, 5)
+    monkeypatch.setattr(tp, "fetch_tide_extremes", lambda *a, **k: _extremes_around(t0))
+    first = page.make_image(now=t0)
+    base = page._base
+    second = page.make_image(now=t0 + _td(minutes=45))  # fresh fetch, same hour
+    assert page._anchor == _dt(2026, 6, 10, 12, 0)
+    assert page._base is base
+    assert _max_red_x(second) > _max_red_x(first)
+
+
+def test_new_data_rebuilds_static_layer(monkeypatch):
+    page = TidePage()
+    t0 = _dt(2026, 6, 10, 12, 0)
+    monkeypatch.setattr(tp, "fetch_tide_extremes", lambda *a, **k: _extremes_around(t0))
+    page.make_image(now=t0)
+    base = page._base
+    page.make_image(now=t0 + _td(hours=1))  # successful fetch re-anchors
+    assert page._base is not base
+
+
+def test_harmonic_model_replaces_datagetter(monkeypatch):
+    t0 = _dt(2026, 6, 10, 12, 0)
+
+    class FakeModel:
+        def extremes(self, start, end):
+            assert start <= t0 - _td(days=2) and end >= t0 + _td(days=2)
+            return _extremes_around(t0)
+
+    def boom(*a, **k):
+        raise AssertionError("datagetter should not be called")
+    monkeypatch.setattr(tp, "load_harmonic_model", lambda station_id: FakeModel())
+    monkeypatch.setattr(tp, "fetch_tide_extremes", boom)
+    img = TidePage().make_image(now=t0)
+    colors = {color for _, color in img.convert("RGB").getcolors(WIDTH * HEIGHT)}
+    assert (0, 0, 255) in colors
+
+
+def test_refresh_only_fetches_days_not_already_stored(monkeypatch):
+    t0 = _dt(2026, 6, 10, 12, 0)
+    ranges = []
+
+    def fetch(station, begin, end):
+        ranges.append((begin, end))
+        return _extremes_around(t0)
+    monkeypatch.setattr(tp, "fetch_tide_extremes", fetch)
+    page = TidePage()
+    page.make_image(now=t0)
+    page.make_image(now=t0 + _td(minutes=15))  # same days -> no fetch
+    page.make_image(now=t0 + _td(days=1))      # one new day at the far end
+    assert ranges == [("20260608", "20260612"), ("20260613", "20260613")]
+
+
+def test_night_spans_are_cached_per_day():
+    start = _dt(2026, 6, 10)
+    end = start + _td(hours=48)
+    spans = tp.night_spans(start, end, tp.STATION_LAT, tp.STATION_LON)
+    assert len(spans) == 2  # two June nights in a 48h window
+    assert all(start <= a < b <= end for a, b in spans)
+
+    # A window moved within the same days reuses the sun times, re-clipped.
+    hits = tp._nights.cache_info().hits
+    later = tp.night_spans(start + _td(hours=3), end + _td(hours=3), tp.STATION_LAT, tp.STATION_LON)
+    assert tp._nights.cache_info().hits == hits + 1
+    assert all(start + _td(hours=3) <= a < b <= end + _td(hours=3) for a, b in later)
+
+
+def test_next_change_is_next_now_line_step(monkeypatch):
+    t0 = _dt(2026, 6, 10, 12, 0)
+    monkeypatch.setattr(tp, "fetch_tide_extremes", lambda *a, **k: _extremes_around(t0))
+    page = TidePage()
+    assert page.next_change(t0) is None  # nothing drawn yet
+    page.make_image(now=t0)
+    assert page.next_change(t0) == t0 + _td(minutes=15)
+    assert page.next_change(t0 + _td(minutes=20)) == t0 + _td(minutes=30)
+
+
+def test_next_change_stops_at_extremes_and_midnight(monkeypatch):
+    t0 = _dt(2026, 6, 10, 12, 0)
+    extremes = _extremes_around(t0) + [tp.Extreme(t0 + _td(minutes=7), 5.0, "H")]
+    monkeypatch.setattr(tp, "fetch_tide_extremes", lambda *a, **k: sorted(extremes, key=lambda e: e.time))
+    page = TidePage()
+    page.make_image(now=t0)
+    assert page.next_change(t0) == t0 + _td(minutes=7)
+    assert page.next_change(_dt(2026, 6, 10, 23, 50)) == _dt(2026, 6, 11)
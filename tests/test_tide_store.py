@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from tide_store import TideStore, shared_store
+from tides import Extreme
+
+
+def _fake_noaa(calls):
+    """Four extremes a day for any requested day range, recording each call."""
+    def fetch(station_id, begin, end):
+        calls.append((station_id, begin, end))
+        d = datetime.strptime(begin, "%Y%m%d")
+        last = datetime.strptime(end, "%Y%m%d")
+        out = []
+        while d <= last:
+            for i, kind in enumerate("HLHL"):
+                out.append(Extreme(d + timedelta(hours=1 + 6 * i), 8.0 if kind == "H" else 1.0, kind))
+            d += timedelta(days=1)
+        return out
+    return fetch
+
+
+def test_fetches_only_missing_days(tmp_path):
+    calls = []
+    store = TideStore(str(tmp_path / "store.json"))
+    fetch = _fake_noaa(calls)
+    first = store.extremes("9444971", date(2026, 6, 8), date(2026, 6, 12), fetch)
+    second = store.extremes("9444971", date(2026, 6, 9), date(2026, 6, 13), fetch)
+    assert calls == [
+        ("9444971", "20260608", "20260612"),
+        ("9444971", "20260613", "20260613"),
+    ]
+    assert len(first) == 20 and len(second) == 20
+    assert [e.time for e in second] == sorted({e.time for e in second})
+
+
+def test_evicts_days_before_window(tmp_path):
+    store = TideStore(str(tmp_path / "store.json"))
+    fetch = _fake_noaa([])
+    store.extremes("9444971", date(2026, 6, 8), date(2026, 6, 12), fetch)
+    store.extremes("9444971", date(2026, 6, 10), date(2026, 6, 12), fetch)
+    assert min(store._days["9444971"]) == date(2026, 6, 10)
+    assert min(store._extremes["9444971"]).date() == date(2026, 6, 10)
+
+
+def test_stations_are_kept_apart(tmp_path):
+    calls = []
+    store = TideStore(str(tmp_path / "store.json"))
+    fetch = _fake_noaa(calls)
+    store.extremes("9444971", date(2026, 6, 8), date(2026, 6, 9), fetch)
+    store.extremes("9447130", date(2026, 6, 8), date(2026, 6, 9), fetch)
+    assert [c[0] for c in calls] == ["9444971", "9447130"]
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "store.json")
+    TideStore(path).extremes("9444971", date(2026, 6, 8), date(2026, 6, 12), _fake_noaa([]))
+    calls = []
+    result = TideStore(path).extremes("9444971", date(2026, 6, 8), date(2026, 6, 12), _fake_noaa(calls))
+    assert calls == []
+    assert len(result) == 20
+
+
+def test_failed_fetch_raises_and_leaves_store_unchanged(tmp_path):
+    store = TideStore(str(tmp_path / "store.json"))
+    store.extremes("9444971", date(2026, 6, 8), date(2026, 6, 9), _fake_noaa([]))
+
+    def boom(*a):
+        raise RuntimeError("network down")
+    with pytest.raises(RuntimeError):
+        store.extremes("9444971", date(2026, 6, 9), date(2026, 6, 10), boom)
+    assert store._days["9444971"] == {date(2026, 6, 8), date(2026, 6, 9)}
+
+
+def test_shared_store_is_one_instance_per_path(tmp_path):
+    a = shared_store(str(tmp_path / "a.json"))
+    assert shared_store(str(tmp_path / "a.json")) is a
+    assert shared_store(str(tmp_path / "b.json")) is not a
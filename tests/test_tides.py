@@ -60,7 +60,7 @@ class _FakeResponse:
 
 def test_fetch_tide_extremes_parses_ok(monkeypatch):
     payload = {"predictions": [{"t": "2026-06-08 10:34", "v": "4.638", "type": "H"}]}
-    monkeypatch.setattr(tides_mod.requests, "get", lambda url, timeout=0: _FakeResponse(payload))
+    monkeypatch.setattr(tides_mod.http_client, "get", lambda url, timeout=0: _FakeResponse(payload))
     result = fetch_tide_extremes("9444971", "20260606", "20260610")
     assert len(result) == 1
     assert result[0].kind == "H"
@@ -68,7 +68,7 @@ def test_fetch_tide_extremes_parses_ok(monkeypatch):
 
 def test_fetch_tide_extremes_raises_on_error_payload(monkeypatch):
     payload = {"error": {"message": "No Predictions data was found."}}
-    monkeypatch.setattr(tides_mod.requests, "get", lambda url, timeout=0: _FakeResponse(payload))
+    monkeypatch.setattr(tides_mod.http_client, "get", lambda url, timeout=0: _FakeResponse(payload))
     with pytest.raises(ValueError):
         fetch_tide_extremes("9444971", "20260606", "20260610")
 
@@ -158,3 +158,66 @@ def test_sun_times_returns_utc_and_sunrise_before_sunset():
 def test_sun_times_polar_night_returns_none():
     # Above the Arctic Circle in midwinter the sun never rises.
     assert sun_times(date(2026, 12, 21), 78.0, 15.0) == (None, None)
+
+
+def _long_extremes(days=14):
+    base = datetime(2026, 6, 1, 0, 0)
+    vals = [8.5, 1.0, 9.0, -0.5]
+    return [
+        Extreme(base + timedelta(hours=6.2 * i), vals[i % 4], "H" if i % 2 == 0 else "L")
+        for i in range(int(days * 24 / 6.2))
+    ]
+
+
+def test_sample_curve_matches_pointwise_interpolation():
+    ex = _long_extremes()
+    start = ex[0].time - timedelta(hours=3)
+    end = ex[-1].time + timedelta(hours=3)
+    pts = sample_curve(ex, start, end, 997)
+    assert len(pts) > 900
+    for t, h in pts:
+        assert h == pytest.approx(interpolate_height(ex, t))
+
+
+def test_sample_curve_single_extreme():
+    ex = [Extreme(datetime(2026, 6, 8, 0, 0), 4.0, "H")]
+    assert sample_curve(ex, ex[0].time, ex[0].time + timedelta(hours=1), 4) == [(ex[0].time, 4.0)]
+
+
+def test_sample_curve_vectorized_matches_pure_python():
+    pytest.importorskip("numpy")
+    ex = _long_extremes()
+    start = ex[0].time - timedelta(hours=3)
+    end = ex[-1].time + timedelta(hours=3)
+    pure = sample_curve(ex, start, end, 997)
+    fast = sample_curve(ex, start, end, 997, vectorized=True)
+    assert [t for t, _ in fast] == [t for t, _ in pure]
+    assert [h for _, h in fast] == pytest.approx([h for _, h in pure])
+
+
+from tides import sun_times_range
+
+
+def test_sun_times_is_memoized():
+    sun_times.cache_clear()
+    sun_times(date(2026, 6, 20), _LAT, _LON)
+    sun_times(date(2026, 6, 20), _LAT, _LON)
+    assert sun_times.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("days", [3, 90])
+def test_sun_times_range_matches_per_day(days):
+    first = date(2026, 1, 1)
+    last = first + timedelta(days=days - 1)
+    batch = sun_times_range(first, last, _LAT, _LON)
+    assert len(batch) == days
+    for i, (sunrise, sunset) in enumerate(batch):
+        exp_rise, exp_set = sun_times(first + timedelta(days=i), _LAT, _LON)
+        assert abs((sunrise - exp_rise).total_seconds()) < 1
+        assert abs((sunset - exp_set).total_seconds()) < 1
+
+
+def test_sun_times_range_polar_night():
+    batch = sun_times_range(date(2026, 10, 1), date(2026, 12, 31), 78.0, 15.0)
+    assert (None, None) in batch
+    assert batch[0] != (None, None)  # early October still has a sunrise there
@@ -0,0 +1,67 @@
+import pytest
+
+import tracing
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    tracing.reset()
+    yield
+    tracing.reset()
+
+
+def test_span_logs_structured_line_with_parent(capsys):
+    with tracing.span("outer"):
+        with tracing.span("inner", page="Tide Page") as sp:
+            sp["n"] = 3
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("span name=inner ms=")
+    assert "parent=outer" in lines[0]
+    assert 'page="Tide Page"' in lines[0] and "n=3" in lines[0]
+    assert lines[1].startswith("span name=outer ")
+    assert "parent=" not in lines[1]
+
+
+def test_span_records_errors_and_reraises(capsys):
+    with pytest.raises(ValueError):
+        with tracing.span("fetch"):
+            raise ValueError("down")
+    assert "error=ValueError" in capsys.readouterr().out
+    stats = tracing.snapshot()["fetch"]
+    assert stats["count"] == 1 and stats["errors"] == 1
+
+
+def test_traced_names_span_after_function():
+    @tracing.traced()
+    def fetch():
+        return 42
+
+    assert fetch() == 42
+    assert f"{__name__}.test_traced_names_span_after_function.<locals>.fetch" in tracing.snapshot()
+
+
+def test_snapshot_percentiles_and_buckets():
+    for ms in range(1, 101):
+        tracing.record("render", float(ms))
+    s = tracing.snapshot()["render"]
+    assert s["count"] == 100
+    assert s["p50_ms"] == pytest.approx(50, abs=1)
+    assert s["p95_ms"] == pytest.approx(95, abs=1)
+    assert s["max_ms"] == 100
+    assert sum(s["buckets"]) == 100
+
+
+def test_window_is_rolling():
+    for ms in range(tracing.WINDOW + 10):
+        tracing.record("show", float(ms))
+    s = tracing.snapshot()["show"]
+    assert s["count"] == tracing.WINDOW + 10  # lifetime count
+    assert sum(s["buckets"]) == tracing.WINDOW  # only the window is kept
+
+
+def test_dump_lists_every_span():
+    tracing.record("render_once", 30000.0)
+    tracing.record("make_image", 12.0)
+    out = tracing.dump().splitlines()
+    assert out[1].startswith("render_once")  # slowest p95 first
+    assert out[2].startswith("make_image")
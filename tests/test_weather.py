@@ -0,0 +1,93 @@
+import io
+
+import pytest
+from PIL import Image
+
+import weather
+
+
+class _FakeResponse:
+    def __init__(self, payload=None, content=b"", status=200):
+        self._payload = payload
+        self.content = content
+        self.status_code = status
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+def _png_bytes():
+    buf = io.BytesIO()
+    Image.new("RGBA", (4, 4), (255, 0, 0, 255)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+ONECALL = {
+    "current": {"temp": 61.2, "feels_like": 60.0, "weather": [{"icon": "10d"}]},
+    "daily": [{"summary": "Rain", "temp": {"max": 64.0, "min": 50.0}}],
+}
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(weather, "GEOCODE_CACHE_PATH", str(tmp_path / "geocode.json"))
+    monkeypatch.setattr(weather, "_geocodes", None)
+    monkeypatch.setattr(weather, "_icons", {})
+    monkeypatch.setattr(weather, "_icon_failed_at", {})
+    seen = []
+
+    def fake_get(url, **kwargs):
+        seen.append(url)
+        if "/geo/" in url:
+            return _FakeResponse({"lat": 47.8, "lon": -122.5})
+        if "/img/" in url:
+            return _FakeResponse(content=_png_bytes())
+        return _FakeResponse(ONECALL)
+    monkeypatch.setattr(weather.http_client, "get", fake_get)
+    return seen
+
+
+def test_steady_state_is_one_request(calls):
+    first = weather.get_weather("key", "98346")
+    assert first["temp"] == 61.2 and first["icon"] == "10d"
+    assert len(calls) == 3  # geocode + onecall + icon
+    weather.get_weather("key", "98346")
+    assert len(calls) == 4  # only onecall again
+
+
+def test_geocode_persists_across_restarts(calls, monkeypatch):
+    weather.geocode_zip("key", "98346")
+    monkeypatch.setattr(weather, "_geocodes", None)  # simulate a restart
+    assert weather.geocode_zip("key", "98346") == (47.8, -122.5)
+    assert sum("/geo/" in url for url in calls) == 1
+
+
+def test_icon_is_decoded_once_and_shared(calls):
+    icon = weather.get_icon("10d")
+    assert isinstance(icon, Image.Image) and icon.size == (4, 4)
+    assert weather.get_icon("10d") is icon
+
+
+def test_failed_icon_download_backs_off(calls, monkeypatch):
+    def down(url, **kwargs):
+        calls.append(url)
+        raise RuntimeError("network down")
+    monkeypatch.setattr(weather.http_client, "get", down)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            weather.get_icon("10d")
+    assert len(calls) == 1  # later calls inside the back-off don't retry
+    assert weather.cached_icon("10d") is None
+
+
+def test_failure_returns_unknown_values(calls, monkeypatch):
+    def boom(url, **kwargs):
+        raise RuntimeError("network down")
+    monkeypatch.setattr(weather.http_client, "get", boom)
+    result = weather.get_weather("key", "98346")
+    assert result["temp"] == "??"
+    assert result["icon"] is None
@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from datasource import DataSource
+from offline import offline_pages
+from pages import weatherTravelPage
+from pages.weatherTravelPage import WeatherTravelPage, format_ferry_info
+
+
+def _routes(*times):
+    return [{"route": "Kingston → Edmonds", "departures": [t.isoformat() for t in times], "guidance": "None"}]
+
+
+def test_format_ferry_info_lists_sailings_after_now():
+    day = datetime(2026, 6, 10)
+    routes = _routes(day.replace(hour=9), day.replace(hour=10), day.replace(hour=11))
+    text = format_ferry_info(routes, day.replace(hour=9, minute=30))
+    assert "Next sailings: 10:00 AM, 11:00 AM" in text
+    assert "No more sailings today" in format_ferry_info(routes, day.replace(hour=12))
+
+
+def test_next_change_is_next_departure(tmp_path):
+    now = datetime.now().replace(hour=12, minute=3, second=0, microsecond=0)
+    with offline_pages(str(tmp_path)):
+        page = WeatherTravelPage()
+        assert page.next_change(now) is None  # no ferry data yet
+        page.make_image(now=now)
+        change = page.next_change(now)
+    assert change == now.replace(minute=30)  # fake sailings every 50 min from 5:00
+
+
+@pytest.fixture
+def gate():
+    """Event slow fake sources block on; released when the test ends."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def _failing(message):
+    def fetch():
+        raise RuntimeError(message)
+    return fetch
+
+
+def _primed(name, value, fetch):
+    """A source already holding ``value`` whose next fetch is ``fetch``."""
+    source = DataSource(name, lambda: value, ttl=0)
+    source.get(timeout=1)
+    source.fetch = fetch
+    return source
+
+
+def test_fetch_all_waits_one_shared_deadline(monkeypatch, gate):
+    monkeypatch.setattr(weatherTravelPage, "FETCH_DEADLINE", 0.3)
+    slow = lambda: gate.wait(5)
+    monkeypatch.setattr(
+        WeatherTravelPage, "SOURCES", {name: DataSource(name, slow, ttl=0) for name in ("a", "b", "c")}
+    )
+    start = time.monotonic()
+    values, errors = WeatherTravelPage()._fetch_all()
+    assert time.monotonic() - start < 0.6  # one deadline for all, not 0.3s each
+    assert values == {}
+    assert all(isinstance(e, TimeoutError) for e in errors.values()) and len(errors) == 3
+
+
+def test_fetch_all_falls_back_to_last_good_values(monkeypatch, gate):
+    monkeypatch.setattr(weatherTravelPage, "FETCH_DEADLINE", 0.2)
+    monkeypatch.setattr(
+        WeatherTravelPage,
+        "SOURCES",
+        {
+            "failing": _primed("failing", "old", _failing("api down")),
+            "slow": _primed("slow", "cached", lambda: gate.wait(5)),
+        },
+    )
+    values, errors = WeatherTravelPage()._fetch_all()
+    assert values == {"failing": "old", "slow": "cached"}
+    assert errors == {}
+
+
+def test_fetch_all_reports_sources_with_nothing_to_show(monkeypatch):
+    monkeypatch.setattr(
+        WeatherTravelPage,
+        "SOURCES",
+        {
+            "ok": DataSource("ok", lambda: 42, ttl=60),
+            "broken": DataSource("broken", _failing("api down"), ttl=60),
+        },
+    )
+    values, errors = WeatherTravelPage()._fetch_all()
+    assert values == {"ok": 42}
+    assert list(errors) == ["broken"] and str(errors["broken"]) == "api down"
+
+
+def test_render_never_downloads_the_icon(tmp_path, monkeypatch):
+    import weather
+    from offline import FAKE_WEATHER
+
+    downloads = []
+    monkeypatch.setattr(weather.http_client, "get", lambda url, **kw: downloads.append(url))
+    monkeypatch.setattr(weather, "_icons", {})
+    with offline_pages(str(tmp_path)):
+        fetch = lambda: dict(FAKE_WEATHER, icon="10d")  # e.g. restored from the store
+        monkeypatch.setitem(WeatherTravelPage.SOURCES, "weather", DataSource("weather", fetch, ttl=0))
+        page = WeatherTravelPage()
+        for _ in range(3):
+            page.make_image(now=datetime(2026, 6, 10, 12, 3))
+    assert downloads == []
@@ -0,0 +1,347 @@
+"""Offline tide prediction from a station's harmonic constituents.
+
+NOAA's hi/lo predictions are themselves a deterministic sum of cosines, so the
+station's harmonic constants are downloaded once, cached on disk, and every
+height or hi/lo extreme afterwards is computed locally for any time range.
+
+Subordinate stations (e.g. Mystery Bay) have no constants of their own; NOAA
+predicts them from a reference station's highs and lows shifted by published
+time and height offsets, and so does this module.
+"""
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+import http_client
+from numpy_compat import np
+from tides import Extreme
+from tracing import traced
+
+_MDAPI = "https://api.tidesandcurrents.noaa.gov/mdapi/prod/webapi/stations"
+_J2000 = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+
+# Harmonic constants by station ID. They never change for a station, so each
+# is downloaded once.
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "tide_harmonics.json")
+
+# Serializes the cache file's read-modify-write, so stations loaded
+# concurrently (see pages/tideDashboardPage.py) don't drop each other's entry.
+_cache_lock = threading.Lock()
+
+# Sampling step used to bracket each extreme before a parabolic refinement.
+STEP_MINUTES = 6
+
+# Equilibrium argument V of each NOAA constituent (Schureman) as multiples of
+# the astronomical arguments (T, s, h, p, p1) plus a constant phase in degrees.
+_V_COEFFS = {
+    "M2": (2, -2, 2, 0, 0, 0),
+    "S2": (2, 0, 0, 0, 0, 0),
+    "N2": (2, -3, 2, 1, 0, 0),
+    "K1": (1, 0, 1, 0, 0, -90),
+    "M4": (4, -4, 4, 0, 0, 0),
+    "O1": (1, -2, 1, 0, 0, 90),
+    "M6": (6, -6, 6, 0, 0, 0),
+    "MK3": (3, -2, 3, 0, 0, -90),
+    "S4": (4, 0, 0, 0, 0, 0),
+    "MN4": (4, -5, 4, 1, 0, 0),
+    "NU2": (2, -3, 4, -1, 0, 0),
+    "S6": (6, 0, 0, 0, 0, 0),
+    "MU2": (2, -4, 4, 0, 0, 0),
+    "2N2": (2, -4, 2, 2, 0, 0),
+    "OO1": (1, 2, 1, 0, 0, -90),
+    "LAM2": (2, -1, 0, 1, 0, 180),
+    "S1": (1, 0, 0, 0, 0, 0),
+    "M1": (1, -1, 1, 1, 0, -90),
+    "J1": (1, 1, 1, -1, 0, -90),
+    "MM": (0, 1, 0, -1, 0, 0),
+    "SSA": (0, 0, 2, 0, 0, 0),
+    "SA": (0, 0, 1, 0, 0, 0),
+    "MSF": (0, 2, -2, 0, 0, 0),
+    "MF": (0, 2, 0, 0, 0, 0),
+    "RHO": (1, -3, 3, -1, 0, 90),
+    "Q1": (1, -3, 1, 1, 0, 90),
+    "T2": (2, 0, -1, 0, 1, 0),
+    "R2": (2, 0, 1, 0, -1, 180),
+    "2Q1": (1, -4, 1, 2, 0, 90),
+    "P1": (1, 0, -1, 0, 0, 90),
+    "2SM2": (2, 2, -2, 0, 0, 0),
+    "M3": (3, -3, 3, 0, 0, 0),
+    "L2": (2, -1, 2, -1, 0, 180),
+    "2MK3": (3, -4, 3, 0, 0, 90),
+    "K2": (2, 0, 2, 0, 0, 0),
+    "M8": (8, -8, 8, 0, 0, 0),
+    "MS4": (4, -2, 2, 0, 0, 0),
+}
+
+# Rates of (T, s, h, p, p1) in degrees per hour.
+_ARG_SPEEDS = (15.0, 0.5490165, 0.0410686, 0.0046418, 0.0000020)
+
+
+@dataclass
+class Constituent:
+    name: str
+    amplitude: float  # feet
+    phase: float  # Greenwich epoch (NOAA "phase_GMT"), degrees
+    speed: float  # degrees per hour
+
+
+@dataclass
+class SubordinateOffsets:
+    """NOAA's hi/lo corrections from a reference station to a subordinate one."""
+
+    reference_id: str
+    high_minutes: float
+    low_minutes: float
+    high_height: float
+    low_height: float
+    ratio: bool  # heights multiply ("R") rather than add feet ("F")
+
+    def apply(self, ex: Extreme) -> Extreme:
+        if ex.kind == "H":
+            minutes, height = self.high_minutes, self.high_height
+        else:
+            minutes, height = self.low_minutes, self.low_height
+        value = ex.value * height if self.ratio else ex.value + height
+        return Extreme(ex.time + timedelta(minutes=minutes), round(value, 3), ex.kind)
+
+
+def _astronomical_args(t: datetime) -> tuple[float, float, float, float, float, float]:
+    """(T, s, h, p, p1, N) in degrees at UTC-aware ``t``."""
+    hours = (t - _J2000).total_seconds() / 3600.0
+    days = hours / 24.0
+    T = 15.0 * hours  # hour angle of the mean sun: 0 at noon UT
+    s = 218.3164591 + 13.17639648 * days  # moon's mean longitude
+    h = 280.46645 + 0.98564736 * days  # sun's mean longitude
+    p = 83.3532430 + 0.11140353 * days  # lunar perigee
+    p1 = 282.9384 + 0.0000470684 * days  # solar perigee
+    N = 125.0445550 - 0.05295377 * days  # moon's ascending node
+    return T, s, h, p, p1, N
+
+
+def _node_factors(N_deg: float) -> dict[str, tuple[float, float]]:
+    """Nodal ``(f, u)`` per constituent for node longitude ``N`` (u in degrees).
+
+    Series after Pugh, *Tides, Surges and Mean Sea-Level*; compound tides take
+    the product of their parents' ``f`` and the sum of their ``u``.
+    """
+    N = math.radians(N_deg)
+    c1, c2, c3 = math.cos(N), math.cos(2 * N), math.cos(3 * N)
+    s1, s2, s3 = math.sin(N), math.sin(2 * N), math.sin(3 * N)
+    m2 = (1.0004 - 0.0373 * c1 + 0.0002 * c2, -2.14 * s1)
+    k1 = (1.0060 + 0.1150 * c1 - 0.0088 * c2 + 0.0006 * c3, -8.86 * s1 + 0.68 * s2 - 0.07 * s3)
+    o1 = (1.0089 + 0.1871 * c1 - 0.0147 * c2 + 0.0014 * c3, 10.80 * s1 - 1.34 * s2 + 0.19 * s3)
+    k2 = (1.0241 + 0.2863 * c1 + 0.0083 * c2 - 0.0015 * c3, -17.74 * s1 + 0.68 * s2 - 0.04 * s3)
+    j1 = (1.0129 + 0.1676 * c1 - 0.0170 * c2 + 0.0016 * c3, -12.94 * s1 + 1.34 * s2 - 0.19 * s3)
+    oo1 = (1.1027 + 0.6504 * c1 + 0.0317 * c2 - 0.0014 * c3, -36.68 * s1 + 4.02 * s2 - 0.57 * s3)
+    mf = (1.043 + 0.414 * c1, -23.7 * s1 + 2.7 * s2 - 0.4 * s3)
+    mm = (1.000 - 0.130 * c1, 0.0)
+    one = (1.0, 0.0)
+
+    def power(fu, k):
+        return fu[0] ** k, fu[1] * k
+
+    factors = dict.fromkeys(["S2", "S4", "S6", "S1", "P1", "T2", "R2", "SA", "SSA"], one)
+    factors.update(dict.fromkeys(["M2", "N2", "2N2", "MU2", "NU2", "LAM2", "L2", "MS4"], m2))
+    factors.update(dict.fromkeys(["O1", "Q1", "2Q1", "RHO", "M1"], o1))
+    factors.update({
+        "K1": k1,
+        "K2": k2,
+        "J1": j1,
+        "OO1": oo1,
+        "MF": mf,
+        "MM": mm,
+        "MSF": (m2[0], -m2[1]),
+        "2SM2": (m2[0], -m2[1]),
+        "M3": power(m2, 1.5),
+        "M4": power(m2, 2),
+        "MN4": power(m2, 2),
+        "M6": power(m2, 3),
+        "M8": power(m2, 4),
+        "MK3": (m2[0] * k1[0], m2[1] + k1[1]),
+        "2MK3": (m2[0] ** 2 * k1[0], 2 * m2[1] - k1[1]),
+    })
+    return factors
+
+
+def coefficient_speed(name: str) -> float:
+    """Angular speed (deg/hour) implied by a constituent's V coefficients."""
+    return sum(c * w for c, w in zip(_V_COEFFS[name], _ARG_SPEEDS))
+
+
+class HarmonicModel:
+    """Tide heights above MLLW from harmonic constituents.
+
+    ``heights`` evaluates the harmonic (reference) station itself; for a
+    subordinate station ``extremes`` additionally applies the hi/lo offsets.
+    Times in and out are naive device-local datetimes, like NOAA's
+    ``lst_ldt`` predictions (the Pi runs on station time; see the README).
+    """
+
+    def __init__(
+        self,
+        constituents: list[Constituent],
+        datum_offset: float,
+        offsets: SubordinateOffsets | None = None,
+    ):
+        # Unknown constituents (no V coefficients) are dropped rather than
+        # guessed; NOAA's standard 37 are all covered.
+        self.constituents = [c for c in constituents if c.name in _V_COEFFS and c.amplitude]
+        self.datum_offset = datum_offset  # MSL above MLLW, feet
+        self.offsets = offsets
+
+    def _terms(self, t0: datetime, mid: datetime) -> list[tuple[float, float, float]]:
+        """``(amplitude, speed, phase)`` per constituent, with V at ``t0``.
+
+        Nodal factors are evaluated once at ``mid``: they drift over the 18.6
+        year nodal cycle, so one value per prediction range is plenty.
+        """
+        T, s, h, p, p1, _ = _astronomical_args(t0)
+        factors = _node_factors(_astronomical_args(mid)[5])
+        terms = []
+        for c in self.constituents:
+            kT, ks, kh, kp, kp1, offset = _V_COEFFS[c.name]
+            v0 = kT * T + ks * s + kh * h + kp * p + kp1 * p1 + offset
+            f, u = factors[c.name]
+            terms.append((f * c.amplitude, c.speed, math.radians((v0 + u - c.phase) % 360.0)))
+        return terms
+
+    def heights(self, times: list[datetime]) -> list[float]:
+        """Predicted height (feet above MLLW) at each of ``times``."""
+        if not times:
+            return []
+        utc = [t.astimezone(timezone.utc) for t in times]
+        t0 = utc[0]
+        terms = self._terms(t0, t0 + (utc[-1] - t0) / 2)
+        hours = [(t - t0).total_seconds() / 3600.0 for t in utc]
+        if not terms:
+            return [self.datum_offset] * len(times)
+        if np is not None:
+            amp, speed, phase = (np.array(col) for col in zip(*terms))
+            arg = np.radians(np.outer(hours, speed)) + phase
+            return (self.datum_offset + np.cos(arg) @ amp).tolist()
+        return [
+            self.datum_offset
+            + sum(a * math.cos(math.radians(w * dt) + ph) for a, w, ph in terms)
+            for dt in hours
+        ]
+
+    def extremes(self, start: datetime, end: datetime) -> list[Extreme]:
+        """Hi/lo extremes with ``start <= time <= end``, sorted by time."""
+        pad = timedelta(hours=3)  # room for subordinate time offsets
+        step = timedelta(minutes=STEP_MINUTES)
+        # Sample in UTC so DST transitions don't repeat or skip an hour.
+        first = start.astimezone(timezone.utc) - pad
+        count = int((end - start + 2 * pad) / step) + 1
+        times = [first + i * step for i in range(count)]
+        heights = self.heights(times)
+        out = []
+        for i in range(1, count - 1):
+            y0, y1, y2 = heights[i - 1], heights[i], heights[i + 1]
+            if y1 > y0 and y1 >= y2:
+                kind = "H"
+            elif y1 < y0 and y1 <= y2:
+                kind = "L"
+            else:
+                continue
+            # Vertex of the parabola through the three samples.
+            curvature = y0 - 2 * y1 + y2
+            shift = 0.5 * (y0 - y2) / curvature if curvature else 0.0
+            value = y1 - 0.125 * (y0 - y2) ** 2 / curvature if curvature else y1
+            t = times[i] + shift * step + timedelta(seconds=30)  # round to the minute
+            local = t.astimezone().replace(tzinfo=None, second=0, microsecond=0)
+            ex = Extreme(local, round(value, 3), kind)
+            if self.offsets is not None:
+                ex = self.offsets.apply(ex)
+            if start <= ex.time <= end:
+                out.append(ex)
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "constituents": [asdict(c) for c in self.constituents],
+            "datum_offset": self.datum_offset,
+            "offsets": asdict(self.offsets) if self.offsets else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HarmonicModel":
+        offsets = data.get("offsets")
+        return cls(
+            [Constituent(**c) for c in data["constituents"]],
+            float(data["datum_offset"]),
+            SubordinateOffsets(**offsets) if offsets else None,
+        )
+
+
+def _get_json(url: str) -> dict:
+    response = http_client.get(url, params={"units": "english"}, timeout=15)
+    response.raise_for_status()
+    return response.json()
+
+
+def _fetch_constituents(station_id: str) -> list[Constituent]:
+    data = _get_json(f"{_MDAPI}/{station_id}/harcon.json")
+    return [
+        Constituent(c["name"], float(c["amplitude"]), float(c["phase_GMT"]), float(c["speed"]))
+        for c in data.get("HarmonicConstituents") or []
+    ]
+
+
+def _fetch_datum_offset(station_id: str) -> float:
+    data = _get_json(f"{_MDAPI}/{station_id}/datums.json")
+    values = {d["name"]: float(d["value"]) for d in data.get("datums") or []}
+    return values["MSL"] - values["MLLW"]
+
+
+@traced()
+def fetch_harmonic_model(station_id: str) -> HarmonicModel:
+    """Download a station's constants (or its reference's, plus offsets)."""
+    constituents = _fetch_constituents(station_id)
+    if constituents:
+        return HarmonicModel(constituents, _fetch_datum_offset(station_id))
+    data = _get_json(f"{_MDAPI}/{station_id}/tidepredoffsets.json")
+    offsets = SubordinateOffsets(
+        reference_id=str(data["refStationId"]),
+        high_minutes=float(data["timeOffsetHighTide"]),
+        low_minutes=float(data["timeOffsetLowTide"]),
+        high_height=float(data["heightOffsetHighTide"]),
+        low_height=float(data["heightOffsetLowTide"]),
+        ratio=data.get("heightAdjustedType", "R") == "R",
+    )
+    reference = _fetch_constituents(offsets.reference_id)
+    if not reference:
+        raise ValueError(f"No harmonic constituents for station {station_id}")
+    return HarmonicModel(reference, _fetch_datum_offset(offsets.reference_id), offsets)
+
+
+def load_harmonic_model(station_id: str, path: str | None = None) -> HarmonicModel:
+    """Cached model for ``station_id``; downloaded and saved on first use."""
+    path = path or CACHE_PATH
+    with _cache_lock:
+        entry = _read_cache(path).get(station_id)
+    if entry is not None:
+        try:
+            return HarmonicModel.from_dict(entry)
+        except (KeyError, TypeError, ValueError):
+            pass  # unreadable entry — refetch below
+    model = fetch_harmonic_model(station_id)  # outside the lock: stations download in parallel
+    with _cache_lock:
+        cache = _read_cache(path)
+        cache[station_id] = model.to_dict()
+        try:
+            with open(path, "w") as f:
+                json.dump(cache, f)
+        except OSError as e:
+            print(f"Tide harmonics cache write failed: {e}")
+    return model
+
+
+def _read_cache(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
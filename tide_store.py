@@ -0,0 +1,152 @@
+"""Persistent per-station store of NOAA hi/lo extremes, filled a day at a time.
+
+Predictions for a given day never change, so once a day has been fetched it is
+kept. A request for a date range only fetches the days the store doesn't
+already hold, merges them in, and evicts days that have slid out of the
+look-back window, instead of refetching (and rewriting) the whole window.
+"""
+import json
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+from tides import Extreme, fetch_tide_extremes
+
+_DATE_FMT = "%Y%m%d"
+
+Fetch = Callable[[str, str, str], list[Extreme]]
+
+
+def _day_ranges(days: list[date]) -> list[tuple[date, date]]:
+    """Collapse sorted days into inclusive ``(first, last)`` runs."""
+    ranges: list[tuple[date, date]] = []
+    for d in days:
+        if ranges and d == ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], d)
+        else:
+            ranges.append((d, d))
+    return ranges
+
+
+class TideStore:
+    """Extremes per station plus the set of days each station fully covers.
+
+    Safe to share between threads: the network fetch happens outside the lock,
+    so different stations can be filled concurrently.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._days: dict[str, set[date]] = {}
+        self._extremes: dict[str, dict[datetime, Extreme]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def extremes(
+        self,
+        station_id: str,
+        begin: date,
+        end: date,
+        fetch: Fetch = fetch_tide_extremes,
+    ) -> list[Extreme]:
+        """Extremes dated ``begin``..``end`` (inclusive), fetching missing days.
+
+        Days before ``begin`` are evicted. A failed or empty fetch raises, and
+        leaves the store as it was.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            held = self._days.setdefault(station_id, set())
+            wanted = [begin + timedelta(days=i) for i in range((end - begin).days + 1)]
+            missing = _day_ranges([d for d in wanted if d not in held])
+
+        fetched = []
+        for first, last in missing:
+            new = fetch(station_id, first.strftime(_DATE_FMT), last.strftime(_DATE_FMT))
+            if not new:
+                raise ValueError(f"No predictions for {station_id} {first}..{last}")
+            fetched.append((first, last, new))
+
+        with self._lock:
+            held = self._days.setdefault(station_id, set())
+            by_time = self._extremes.setdefault(station_id, {})
+            for first, last, new in fetched:
+                for ex in new:
+                    if first <= ex.time.date() <= last:
+                        by_time[ex.time] = ex  # de-duplicates on timestamp
+                held.update(d for d in wanted if first <= d <= last)
+            stale = [d for d in held if d < begin]
+            held.difference_update(stale)
+            for t in [t for t in by_time if t.date() < begin]:
+                del by_time[t]
+            if fetched or stale:
+                self._save()
+            return sorted(
+                (ex for ex in by_time.values() if begin <= ex.time.date() <= end),
+                key=lambda ex: ex.time,
+            )
+
+    def _ensure_loaded(self) -> None:
+        # Caller holds _lock.
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            for station_id, entry in data["stations"].items():
+                days = set()
+                for first, last in entry["ranges"]:
+                    d = date.fromisoformat(first)
+                    while d <= date.fromisoformat(last):
+                        days.add(d)
+                        d += timedelta(days=1)
+                extremes = [
+                    Extreme(datetime.fromisoformat(e["t"]), float(e["v"]), e["kind"])
+                    for e in entry["extremes"]
+                ]
+                self._days[station_id] = days
+                self._extremes[station_id] = {e.time: e for e in extremes}
+        except (OSError, ValueError, KeyError, TypeError):
+            self._days.clear()  # no store, or unreadable — start empty
+            self._extremes.clear()
+
+    def _save(self) -> None:
+        # Caller holds _lock.
+        data = {
+            "stations": {
+                station_id: {
+                    "ranges": [
+                        [first.isoformat(), last.isoformat()]
+                        for first, last in _day_ranges(sorted(days))
+                    ],
+                    "extremes": [
+                        {"t": e.time.isoformat(), "v": e.value, "kind": e.kind}
+                        for e in sorted(self._extremes.get(station_id, {}).values(), key=lambda e: e.time)
+                    ],
+                }
+                for station_id, days in self._days.items()
+            }
+        }
+        try:
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Tide store write failed: {e}")
+
+
+_stores: dict[str, TideStore] = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(path: str) -> TideStore:
+    """The process-wide store backed by ``path``.
+
+    Every page reading the same file shares one instance, so they share its
+    fetched days and never overwrite each other's stations on save.
+    """
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = TideStore(path)
+        return store
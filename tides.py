@@ -1,11 +1,19 @@
+import bisect
 import math
-import requests
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date as _date, datetime, timedelta, timezone
 from urllib.parse import urlencode
 
+import http_client
+from numpy_compat import np
+from tracing import traced
+
 _TIME_FMT = "%Y-%m-%d %H:%M"
 _DATAGETTER = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+# Ranges at least this long go through the vectorized sun_times_range path;
+# shorter ones are cheaper via the memoized per-day sun_times.
+_SUN_BATCH_MIN_DAYS = 32
 
 
 @dataclass
@@ -37,9 +45,10 @@ def build_datagetter_url(station_id: str, begin_date: str, end_date: str) -> str
     return f"{_DATAGETTER}?{urlencode(params)}"
 
 
+@traced()
 def fetch_tide_extremes(station_id: str, begin_date: str, end_date: str) -> list[Extreme]:
     url = build_datagetter_url(station_id, begin_date, end_date)
-    response = requests.get(url, timeout=15)
+    response = http_client.get(url, timeout=15)
     response.raise_for_status()
     data = response.json()
     if "error" in data:
@@ -47,19 +56,24 @@ def fetch_tide_extremes(station_id: str, begin_date: str, end_date: str) -> list
     return parse_predictions(data)
 
 
+def _segment_height(a: Extreme, b: Extreme, t: datetime) -> float:
+    """Half-cosine between consecutive extremes ``a`` and ``b``."""
+    span = (b.time - a.time).total_seconds()
+    if span == 0:
+        return a.value
+    frac = (t - a.time).total_seconds() / span
+    mid = (a.value + b.value) / 2.0
+    amp = (a.value - b.value) / 2.0
+    return mid + amp * math.cos(math.pi * frac)
+
+
 def interpolate_height(extremes: list[Extreme], t: datetime) -> float | None:
     if not extremes or t < extremes[0].time or t > extremes[-1].time:
         return None
-    for a, b in zip(extremes, extremes[1:]):
-        if a.time <= t <= b.time:
-            span = (b.time - a.time).total_seconds()
-            if span == 0:
-                return a.value
-            frac = (t - a.time).total_seconds() / span
-            mid = (a.value + b.value) / 2.0
-            amp = (a.value - b.value) / 2.0
-            return mid + amp * math.cos(math.pi * frac)
-    return extremes[-1].value  # exactly the last extreme's time
+    i = bisect.bisect_right(extremes, t, key=lambda e: e.time)
+    if i == len(extremes):
+        return extremes[-1].value  # exactly the last extreme's time
+    return _segment_height(extremes[i - 1], extremes[i], t)
 
 
 def _julian_day_number(d: _date) -> int:
@@ -84,6 +98,7 @@ def _julian_to_utc(jd: float) -> datetime:
     return datetime.fromtimestamp(unix_seconds, tz=timezone.utc)
 
 
+@lru_cache(maxsize=1024)
 def sun_times(
     d: _date, lat: float, lon: float
 ) -> tuple[datetime | None, datetime | None]:
@@ -91,7 +106,7 @@ def sun_times(
 
     Uses the NOAA sunrise equation (longitude east-positive). Returns
     ``(None, None)`` on polar day/night where the sun does not cross the
-    horizon.
+    horizon. Memoized: a (date, lat, lon) always has the same answer.
     """
     n = _julian_day_number(d) - 2451545 + 0.0008
     j_star = n - lon / 360.0  # mean solar noon (lon east-positive)
@@ -128,14 +143,94 @@ def sun_times(
     )
 
 
+def sun_times_range(
+    first: _date, last: _date, lat: float, lon: float
+) -> list[tuple[datetime | None, datetime | None]]:
+    """:func:`sun_times` for every date ``first``..``last`` (inclusive).
+
+    Long ranges (for multi-week charts) are solved in one vectorized NumPy
+    pass; short ones, or any range without NumPy, use the memoized per-day
+    call.
+    """
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    if np is None or len(days) < _SUN_BATCH_MIN_DAYS:
+        return [sun_times(d, lat, lon) for d in days]
+
+    n = np.array([_julian_day_number(d) for d in days], dtype=float) - 2451545 + 0.0008
+    j_star = n - lon / 360.0
+    M = (357.5291 + 0.98560028 * j_star) % 360.0
+    M_rad = np.radians(M)
+    C = 1.9148 * np.sin(M_rad) + 0.0200 * np.sin(2 * M_rad) + 0.0003 * np.sin(3 * M_rad)
+    lam_rad = np.radians((M + C + 180.0 + 102.9372) % 360.0)
+    j_transit = 2451545.0 + j_star + 0.0053 * np.sin(M_rad) - 0.0069 * np.sin(2 * lam_rad)
+    decl = np.arcsin(np.sin(lam_rad) * math.sin(math.radians(23.4397)))
+    lat_rad = math.radians(lat)
+    cos_w0 = (math.sin(math.radians(-0.833)) - math.sin(lat_rad) * np.sin(decl)) / (
+        math.cos(lat_rad) * np.cos(decl)
+    )
+    w0 = np.degrees(np.arccos(np.clip(cos_w0, -1.0, 1.0)))
+    polar = (cos_w0 < -1.0) | (cos_w0 > 1.0)
+    return [
+        (None, None)
+        if is_polar
+        else (_julian_to_utc(float(jt - w / 360.0)), _julian_to_utc(float(jt + w / 360.0)))
+        for jt, w, is_polar in zip(j_transit, w0, polar)
+    ]
+
+
 def sample_curve(
-    extremes: list[Extreme], start: datetime, end: datetime, n: int
+    extremes: list[Extreme],
+    start: datetime,
+    end: datetime,
+    n: int,
+    vectorized: bool = False,
 ) -> list[tuple[datetime, float]]:
+    """``n + 1`` evenly spaced ``(time, height)`` samples over ``[start, end]``.
+
+    Samples outside the extremes' coverage are dropped. The sample times are
+    sorted, so a single pass walks the extremes alongside them: O(n + m)
+    rather than a search per sample. ``vectorized=True`` computes every
+    height in one NumPy pass instead (falls back when NumPy is missing).
+    """
+    if vectorized and np is not None and len(extremes) >= 2:
+        return _sample_curve_numpy(extremes, start, end, n)
     span = (end - start).total_seconds()
     points: list[tuple[datetime, float]] = []
+    if not extremes:
+        return points
+    first, last = extremes[0].time, extremes[-1].time
+    i = 0
     for k in range(n + 1):
         t = start + timedelta(seconds=span * k / n)
-        h = interpolate_height(extremes, t)
-        if h is not None:
-            points.append((t, h))
+        if t < first or t > last:
+            continue
+        if len(extremes) == 1:
+            points.append((t, extremes[0].value))
+            continue
+        # Advance to the segment [i, i + 1] containing t.
+        while i + 2 < len(extremes) and extremes[i + 1].time <= t:
+            i += 1
+        points.append((t, _segment_height(extremes[i], extremes[i + 1], t)))
     return points
+
+
+def _sample_curve_numpy(
+    extremes: list[Extreme], start: datetime, end: datetime, n: int
+) -> list[tuple[datetime, float]]:
+    times = np.array([(e.time - start).total_seconds() for e in extremes])
+    values = np.array([e.value for e in extremes])
+    span = (end - start).total_seconds()
+    ts = span * np.arange(n + 1) / n
+    keep = np.nonzero((ts >= times[0]) & (ts <= times[-1]))[0]
+    ts = ts[keep]
+    hi = np.clip(np.searchsorted(times, ts, side="right"), 1, len(times) - 1)
+    lo = hi - 1
+    seg = times[hi] - times[lo]
+    frac = np.divide(ts - times[lo], seg, out=np.zeros_like(ts), where=seg > 0)
+    mid = (values[lo] + values[hi]) / 2.0
+    amp = (values[lo] - values[hi]) / 2.0
+    heights = mid + amp * np.cos(np.pi * frac)
+    return [
+        (start + timedelta(seconds=span * int(k) / n), float(h))
+        for k, h in zip(keep, heights)
+    ]
@@ -0,0 +1,148 @@
+"""Lightweight timing spans for the fetch -> render -> display hot path.
+
+Wrap a block in :func:`span` (or a function in :func:`traced`) and its
+monotonic duration is
+
+* printed as one logfmt line (``span name=... ms=...``), which lands in
+  journald under the systemd unit, and
+* added to an in-memory rolling window per span name, summarized by
+  :func:`snapshot` / :func:`dump` (``main.py`` dumps on SIGUSR1).
+
+Spans nest per thread; a line carries its parent's name so a slow
+``render_once`` can be traced down to the fetch or ``show()`` under it.
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+WINDOW = 256  # most recent durations kept per span name
+# Upper bucket bounds (ms) for the dumped histogram; the last is open-ended.
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 30000)
+# INKY_TRACE_LOG=0 keeps the histograms but stops the per-span log lines.
+LOG_SPANS = os.getenv("INKY_TRACE_LOG", "1") != "0"
+
+_durations: dict[str, deque[float]] = {}
+_counts: dict[str, int] = {}
+_errors: dict[str, int] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    text = str(value)
+    return f'"{text}"' if not text or any(c in text for c in ' ="') else text
+
+
+def record(name: str, ms: float, ok: bool = True) -> None:
+    """Add one duration to ``name``'s rolling window."""
+    with _lock:
+        window = _durations.get(name)
+        if window is None:
+            window = _durations[name] = deque(maxlen=WINDOW)
+        window.append(ms)
+        _counts[name] = _counts.get(name, 0) + 1
+        if not ok:
+            _errors[name] = _errors.get(name, 0) + 1
+
+
+@contextmanager
+def span(name: str, **fields) -> Iterator[dict]:
+    """Time the block as ``name``; ``fields`` are added to the log line.
+
+    Yields the fields dict, so the block can attach results (``sp["n"] =
+    len(rows)``). An exception is recorded as ``error=<type>`` and re-raised.
+    """
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    parent = stack[-1] if stack else None
+    stack.append(name)
+    error: Optional[str] = None
+    start = time.monotonic()
+    try:
+        yield fields
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        ms = (time.monotonic() - start) * 1000
+        stack.pop()
+        record(name, ms, ok=error is None)
+        if LOG_SPANS:
+            parts = {"name": name, "ms": ms, "thread": threading.current_thread().name}
+            if parent is not None:
+                parts["parent"] = parent
+            parts.update(fields)
+            if error is not None:
+                parts["error"] = error
+            print("span " + " ".join(f"{k}={_format_value(v)}" for k, v in parts.items()))
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator form of :func:`span`; defaults to ``module.qualname``."""
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def snapshot() -> dict[str, dict]:
+    """Per span name: lifetime count/errors plus stats over the window (ms)."""
+    with _lock:
+        windows = {name: sorted(d) for name, d in _durations.items()}
+        counts = dict(_counts)
+        errors = dict(_errors)
+    out = {}
+    for name, ordered in windows.items():
+        buckets = [0] * (len(BUCKETS_MS) + 1)
+        for ms in ordered:
+            buckets[next((i for i, b in enumerate(BUCKETS_MS) if ms <= b), len(BUCKETS_MS))] += 1
+        out[name] = {
+            "count": counts[name],
+            "errors": errors.get(name, 0),
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "max_ms": ordered[-1],
+            "buckets": buckets,
+        }
+    return out
+
+
+def dump() -> str:
+    """Human-readable table of :func:`snapshot`, slowest p95 first."""
+    stats = snapshot()
+    labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+    lines = [f"{'span':<40}{'count':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  histogram (ms)"]
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1]["p95_ms"]):
+        hist = " ".join(f"{label}:{n}" for label, n in zip(labels, s["buckets"]) if n)
+        lines.append(
+            f"{name:<40}{s['count']:>7}{s['errors']:>5}{s['p50_ms']:>10.1f}"
+            f"{s['p95_ms']:>10.1f}{s['max_ms']:>10.1f}  {hist}"
+        )
+    return "\n".join(lines)
+
+
+def reset() -> None:
+    """Forget every recorded span (tests)."""
+    with _lock:
+        _durations.clear()
+        _counts.clear()
+        _errors.clear()
@@ -1,16 +1,102 @@
-import requests
-import colorcet as cc
+import json
+import os
+import threading
+import time
+from io import BytesIO
 
+from PIL import Image
 
-def get_weather(api_key, zip) -> dict[str, float | str]:
+import http_client
+from tracing import span, traced
+
+# ZIP -> lat/lon never changes, so lookups persist across restarts.
+GEOCODE_CACHE_PATH = os.path.join(os.path.dirname(__file__), "geocode_cache.json")
+
+_geocodes: dict[str, list[float]] | None = None
+_geocode_lock = threading.Lock()
+# Decoded weather icons by OpenWeather icon code ("10d", "01n", ...).
+_icons: dict[str, Image.Image] = {}
+# A failed icon download isn't retried for this long.
+ICON_RETRY_SECONDS = 300
+_icon_failed_at: dict[str, float] = {}  # code -> time.monotonic() of the failure
+
+
+def _unavailable() -> dict[str, float | str | None]:
+    return {
+        "temp": "??",
+        "weather": "??",
+        "temp_max": "??",
+        "temp_min": "??",
+        "feels_like": "??",
+        "icon": None,
+    }
+
+
+def geocode_zip(api_key, zip) -> tuple[float, float]:
+    """(lat, lon) for a ZIP code, looked up once and then cached on disk."""
+    global _geocodes
+    with _geocode_lock:
+        if _geocodes is None:
+            try:
+                with open(GEOCODE_CACHE_PATH) as f:
+                    _geocodes = json.load(f)
+            except (OSError, ValueError):
+                _geocodes = {}
+        if zip in _geocodes:
+            lat, lon = _geocodes[zip]
+            return lat, lon
     url = f"http://api.openweathermap.org/geo/1.0/zip?zip={zip}&appid={api_key}"
-    # print(url)
+    response = http_client.get(url)
+    res = response.json()
+    print(res)
+    lat, lon = res['lat'], res['lon']
+    with _geocode_lock:
+        _geocodes[zip] = [lat, lon]
+        try:
+            with open(GEOCODE_CACHE_PATH, "w") as f:
+                json.dump(_geocodes, f)
+        except OSError as e:
+            print(f"Geocode cache write failed: {e}")
+    return lat, lon
+
+
+def cached_icon(code: str) -> Image.Image | None:
+    """The icon for ``code`` if it has already been downloaded; never fetches."""
+    return _icons.get(code)
+
+
+def get_icon(code: str) -> Image.Image:
+    """Decoded icon image for an OpenWeather icon code, downloaded once.
+
+    A failed download raises, and so does every call for the next
+    ``ICON_RETRY_SECONDS`` without trying the network again.
+    """
+    icon = _icons.get(code)
+    if icon is not None:
+        return icon
+    failed_at = _icon_failed_at.get(code)
+    if failed_at is not None and time.monotonic() - failed_at < ICON_RETRY_SECONDS:
+        raise RuntimeError(f"icon {code} failed recently; retrying later")
+    try:
+        with span("weather.get_icon", code=code):
+            response = http_client.get(f"http://openweathermap.org/img/wn/{code}@2x.png")
+            response.raise_for_status()
+            icon = Image.open(BytesIO(response.content))
+            icon.load()
+    except Exception:
+        _icon_failed_at[code] = time.monotonic()
+        raise
+    _icon_failed_at.pop(code, None)
+    _icons[code] = icon
+    return icon
+
+
+@traced()
+def get_weather(api_key, zip) -> dict[str, float | str | None]:
     try:
-        response = requests.get(url)
-        res = response.json()
-        print(res)
-        url = f"http://api.openweathermap.org/data/3.0/onecall?lat={res['lat']}&lon={res['lon']}&exclude=hourly&units=imperial&appid={api_key}"
-        response = requests.get(url)
+        lat, lon = geocode_zip(api_key, zip)
+        url = f"http://api.openweathermap.org/data/3.0/onecall?lat={lat}&lon={lon}&exclude=hourly&units=imperial&appid={api_key}"
+        response = http_client.get(url)
         if response.status_code == 200:
             res = response.json()
             current = res['current']
@@ -20,31 +106,21 @@ def get_weather(api_key, zip) -> dict[str, float | str]:
             temp_max = daily['temp']['max']
             temp_min = daily['temp']['min']
             feels_like = current['feels_like']
-
-            img_data = requests.get(f"http://openweathermap.org/img/wn/{current['weather'][0]['icon']}@2x.png").content
-            with open('weather_image.png', 'wb') as handler:
-                handler.write(img_data)
+            icon = current['weather'][0]['icon']
+            try:
+                get_icon(icon)  # warm the cache so the render never downloads it
+            except Exception as e:
+                print(f"Weather icon {icon} unavailable: {e}")
             return {
                 "temp": temp,
                 "weather": weather,
                 "temp_max": temp_max,
                 "temp_min": temp_min,
-                "feels_like": feels_like
+                "feels_like": feels_like,
+                "icon": icon,
             }
         else:
-            return {
-            "temp": "??",
-            "weather": "??",
-            "temp_max": "??",
-            "temp_min": "??",
-            "feels_like": "??"
-        }
+            return _unavailable()
     except Exception as e:
         print(e)
-        return {
-            "temp": "??",
-            "weather": "??",
-            "temp_max": "??",
-            "temp_min": "??",
-            "feels_like": "??"
-        }
+        return _unavailable()